@@ -1,7 +1,6 @@
 import streamlit as st
 import os
 import sys
-from PIL import Image
 
 # Set page config first - must be the first Streamlit command
 st.set_page_config(page_title="Worktime App", page_icon="⏰", layout="wide")
@@ -16,16 +15,13 @@ modules_dir = os.path.join(app_dir, 'modules')
 sys.path.insert(0, modules_dir)
 
 # Import necessary modules
+# Die Seitenmodule (pandas, plotly, Auswertungen) werden erst beim ersten Aufruf der Seite geladen
 try:
-    from modules.login import show_login, show_admin_dashboard, show_change_password
-    from modules.utils import logout, calculate_remaining_vacation
-    from modules.data_loader import load_employees, save_employees, hash_password, check_password
-    from modules.checkin_page import show_checkin_checkout
-    from modules.calendar import show_calendar
-    from modules.home_page import show_home_page
-    from modules.vacation import display_vacation_page
-    from modules.sick_leave import show_sick_leave
+    from modules.login import show_login
+    from modules.data_loader import load_employees, save_employees, hash_password
     from modules.navigation import set_page  # Import the improved navigation function
+    from modules.metrics import rerun as rerun_metrics
+    from modules.pages import PageNotImplemented, get_page, show_page
 except ImportError as e:
     st.error(f"Fehler beim Importieren der Module: {e}")
     # Continue with basic functionality
@@ -44,8 +40,7 @@ def render_branding_header():
     cols = st.columns([1, 4])  # links: logo, rechts: text
     with cols[0]:  # Zugriff auf das erste Element der Liste
         if os.path.exists(logo_path):
-            logo = Image.open(logo_path)
-            st.image(logo, width=80)
+            st.image(logo_path, width=80)
         else:
             st.warning("Logo fehlt: " + logo_path)
     with cols[1]:  # Zugriff auf das zweite Element der Liste
@@ -105,97 +100,96 @@ def sidebar_navigation():
     for page, icon in menu_items.items():
         if st.sidebar.button(f"{icon} {page}"):
             if page == "Logout":
+                from modules.utils import logout
                 logout()
             else:
                 set_page(page)
 
 # ----------------------------------------------------------
-# Streamlit App Starts Here
+# Seitenaufbau: Header, Sidebar und aktuelle Seite
 # ----------------------------------------------------------
+def render_app():
+    render_branding_header()  # <-- Display Branding
+
+    # Sidebar for navigation
+    with st.sidebar:
+        st.title("Worktime App")
+        if st.session_state.user:
+            st.write(f"Logged in as {st.session_state.user['name']} ({st.session_state.user['role']})")
+            # Verwende die neue Sidebar-Navigation mit Icons
+            sidebar_navigation()
+        else:
+            # For non-logged in users, show login/register options
+            if st.button("🔐 Registrieren", key="sidebar_register"):
+                set_page("Register")
+
+    # Main content area
+    if st.session_state.current_page == "Login":
+        show_login()
+        # Add an additional registration button in the main area
+        st.write("Noch kein Konto?")
+        if st.button("🔐 Registrieren", key="main_register"):
+            set_page("Register")
 
-render_branding_header()  # <-- Display Branding
+    elif st.session_state.current_page == "Register":
+        st.title("Worktime App - Registrierung")
 
-# Sidebar for navigation
-with st.sidebar:
-    st.title("Worktime App")
-    if st.session_state.user:
-        st.write(f"Logged in as {st.session_state.user['name']} ({st.session_state.user['role']})")
-        # Verwende die neue Sidebar-Navigation mit Icons
-        sidebar_navigation()
-    else:
-        # For non-logged in users, show login/register options
-        if st.button("🔐 Registrieren", key="sidebar_register"):
-            set_page("Register")
+        name = st.text_input("Vollständiger Name")
+        email = st.text_input("E-Mail-Adresse")
+        password = st.text_input("Passwort", type="password")
+        password_confirm = st.text_input("Passwort bestätigen", type="password")
+        role = st.selectbox("Rolle", ["Mitarbeiter", "Admin"])
+
+        if password == password_confirm and password:
+            if st.button("Registrieren"):
+                register_user(email, password, name, role)
+        else:
+            if password != password_confirm:
+                st.error("Die Passwörter stimmen nicht überein.")
+        # Add a back button
+        if st.button("Zurück zum Login"):
+            set_page("Login")
+
+    elif st.session_state.user:
+        if st.session_state.current_page == "Home":
+            from modules.utils import calculate_remaining_vacation
+            get_page("Home")()
+
+            # Display Vacation Balance
+            user_id = st.session_state.user["id"]
+            # Load employee data so we can retrieve `vacation_days_entitled` in `calculate_remaining_vacation` function
+            employees = load_employees()
+            employee = next((emp for emp in employees if emp["id"] == user_id), None)
+
+            if not employee:
+                st.error(f"Mitarbeiter mit ID {user_id} nicht gefunden.")
+            else:
+                if employee["role"] == "buero":  # Assuming you have "role" field
+                    vacation_days_entitled = 27
+                else:  # Default to "lager" or any other role
+                    vacation_days_entitled = 26
+
+                remaining_days = calculate_remaining_vacation(user_id)  # CALLING A FUNCTION IN UTILS!
+                st.subheader("Urlaubsübersicht")
+                st.write(f"Zustehende Urlaubstage: {vacation_days_entitled}")
+                st.write(f"Verbleibende Urlaubstage: {remaining_days}")
 
-# Main content area
-if st.session_state.current_page == "Login":
-    show_login()
-    # Add an additional registration button in the main area
-    st.write("Noch kein Konto?")
-    if st.button("🔐 Registrieren", key="main_register"):
-        set_page("Register")
-
-elif st.session_state.current_page == "Register":
-    st.title("Worktime App - Registrierung")
-
-    name = st.text_input("Vollständiger Name")
-    email = st.text_input("E-Mail-Adresse")
-    password = st.text_input("Passwort", type="password")
-    password_confirm = st.text_input("Passwort bestätigen", type="password")
-    role = st.selectbox("Rolle", ["Mitarbeiter", "Admin"])
-
-    if password == password_confirm and password:
-        if st.button("Registrieren"):
-            register_user(email, password, name, role)
-    else:
-        if password != password_confirm:
-            st.error("Die Passwörter stimmen nicht überein.")
-    # Add a back button
-    if st.button("Zurück zum Login"):
-        set_page("Login")
-
-elif st.session_state.user:
-    if st.session_state.current_page == "Home":
-        show_home_page()
-
-        # Display Vacation Balance
-        user_id = st.session_state.user["id"]
-        # Load employee data so we can retrieve `vacation_days_entitled` in `calculate_remaining_vacation` function
-        employees = load_employees()
-        employee = next((emp for emp in employees if emp["id"] == user_id), None)
-
-        if not employee:
-            st.error(f"Mitarbeiter mit ID {user_id} nicht gefunden.")
         else:
-            if employee["role"] == "buero":  # Assuming you have "role" field
-                vacation_days_entitled = 27
-            else:  # Default to "lager" or any other role
-                vacation_days_entitled = 26
-
-            remaining_days = calculate_remaining_vacation(user_id)  # CALLING A FUNCTION IN UTILS!
-            st.subheader("Urlaubsübersicht")
-            st.write(f"Zustehende Urlaubstage: {vacation_days_entitled}")
-            st.write(f"Verbleibende Urlaubstage: {remaining_days}")
-
-    elif st.session_state.current_page == "Check-in/Check-out":
-        show_checkin_checkout()
-    elif st.session_state.current_page == "Calendar":
-        show_calendar()
-    elif st.session_state.current_page == "Stats":
-        try:
-            from modules.stats import show_stats
-            show_stats()
-        except ImportError:
-            st.error("Die Seite 'Stats' ist nicht implementiert.")
-    elif st.session_state.current_page == "Vacation":
-        display_vacation_page()
-    elif st.session_state.current_page == "Sick Leave":
-        show_sick_leave()
-    elif st.session_state.current_page == "Admin Dashboard":
-        show_admin_dashboard()
-    elif st.session_state.current_page == "Change Password":
-        show_change_password()
+            # Seitenmodul wird beim ersten Aufruf importiert (siehe modules/pages.py)
+            try:
+                found = show_page(st.session_state.current_page)
+            except PageNotImplemented:
+                st.error(f"Die Seite '{st.session_state.current_page}' ist nicht implementiert.")
+            else:
+                if not found:
+                    st.write("Page not found.")
     else:
-        st.write("Page not found.")
-else:
-    st.write("Please login or register.")
+        st.write("Please login or register.")
+
+# ----------------------------------------------------------
+# Streamlit App Starts Here
+# ----------------------------------------------------------
+
+# Messung des Reruns (nur mit WORKTIME_METRICS=1 aktiv)
+with rerun_metrics(st.session_state.current_page):
+    render_app()
@@ -0,0 +1,91 @@
+# benchmarks/bench_absence_statistics.py
+"""
+Compares the interval-sweep ``utils.calculate_absence_statistics`` with the
+previous nested-loop implementation (kept below as reference).
+
+Aufruf:
+    python -m benchmarks.bench_absence_statistics [--employees 20] [--years 2]
+
+The legacy version is O(E·12·R·D), so keep the sizes moderate; the new one
+is additionally timed at a larger size.
+"""
+
+import time
+import argparse
+from datetime import datetime
+
+import pandas as pd
+
+from benchmarks.generator import generate
+from modules.utils import calculate_absence_statistics
+
+
+def legacy_calculate_absence_statistics(employees, vacation_requests, sick_leaves):
+    """
+    Implementation before the interval sweep (employees × months × requests).
+
+    Sick leaves are read in both spellings (``start_date``/``end_date`` and
+    ``date``/``end`` of the sick leave page), like the sweep does.
+    """
+    data = []
+    for emp in employees:
+        user_id = emp["id"]
+        stats = {"Name": emp["name"]}
+        for month in range(1, 13):
+            urlaubstage = 0
+            kranktage = 0
+            for urlaub in vacation_requests:
+                if urlaub["user_id"] == user_id and urlaub.get("status") == "approved":
+                    start = datetime.strptime(urlaub["start_date"], "%Y-%m-%d").date()
+                    end = datetime.strptime(urlaub["end_date"], "%Y-%m-%d").date()
+                    for d in pd.date_range(start, end):
+                        if d.month == month:
+                            urlaubstage += 1
+            for krank in sick_leaves:
+                if krank["user_id"] == user_id:
+                    start = datetime.strptime(krank.get("start_date", krank.get("date")), "%Y-%m-%d").date()
+                    end = datetime.strptime(krank.get("end_date", krank.get("end")), "%Y-%m-%d").date()
+                    for d in pd.date_range(start, end):
+                        if d.month == month:
+                            kranktage += 1
+            stats[f"{month:02d}_Urlaub"] = urlaubstage
+            stats[f"{month:02d}_Krank"] = kranktage
+        data.append(stats)
+    return pd.DataFrame(data)
+
+
+def absences(employees: int, years: int, seed: int = 42):
+    """Employees, vacation requests and sick leaves of ``benchmarks.generator.generate``."""
+    dataset = generate(employees, years, seed)
+    return dataset["employees"], dataset["vacation_requests"], dataset["sick_leaves"]
+
+
+def _timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark calculate_absence_statistics")
+    parser.add_argument("--employees", type=int, default=20)
+    parser.add_argument("--years", type=int, default=2)
+    parser.add_argument("--large-employees", type=int, default=500)
+    args = parser.parse_args()
+
+    data = absences(args.employees, args.years)
+    legacy, legacy_time = _timed(legacy_calculate_absence_statistics, *data)
+    sweep, sweep_time = _timed(calculate_absence_statistics, *data)
+    pd.testing.assert_frame_equal(legacy, sweep)
+    print(f"{args.employees} Mitarbeiter, {args.years} Jahre, "
+          f"{len(data[1])} Urlaube, {len(data[2])} Krankmeldungen")
+    print(f"  alt:   {legacy_time * 1000:10.1f} ms")
+    print(f"  neu:   {sweep_time * 1000:10.1f} ms  (x{legacy_time / sweep_time:.0f})")
+
+    large = absences(args.large_employees, args.years)
+    _, large_time = _timed(calculate_absence_statistics, *large)
+    print(f"{args.large_employees} Mitarbeiter (nur neu): {large_time * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
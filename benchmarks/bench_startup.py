@@ -0,0 +1,139 @@
+# benchmarks/bench_startup.py
+"""
+Cold-start benchmark of the login page.
+
+Every repetition starts a fresh Python process in a temporary working
+directory with a generated data set (see benchmarks/generator.py) and runs
+app_improved.py once with ``streamlit.testing.v1.AppTest``, i.e. up to the
+first paint of the login page. Measured per run:
+
+    process_seconds  process start until the login page is rendered
+                     (interpreter start, Streamlit import and the script run)
+    script_seconds   the first script run alone (the app's imports included)
+    modules          which heavy modules are loaded after the first paint
+
+Streamlit itself imports plotly.graph_objects and PIL, and NumPy during
+the first script run, so these stay loaded whatever the app does.
+
+Aufruf (vorher/nachher vergleichen wie bei benchmarks/suite.py):
+    python -m benchmarks.bench_startup --repeat 10 --output startup.json
+    python -m benchmarks.bench_startup --app /pfad/zum/alten/app_improved.py
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List
+
+from benchmarks import generator
+from benchmarks.suite import environment
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_APP = os.path.join(ROOT, "app_improved.py")
+DEFAULT_REPEAT = 5
+DEFAULT_SCALE = "50x1"
+HEAVY_MODULES = ["pandas", "numpy", "pyarrow", "plotly.express", "plotly.graph_objects", "bcrypt", "PIL",
+                 "sqlalchemy", "modules.stats", "modules.calendar", "modules.home_page"]
+
+# Läuft im Kindprozess; gibt eine JSON-Zeile aus
+_CHILD = """
+import json, sys, time
+started = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+app_file, heavy = sys.argv[1], sys.argv[2].split(",")
+at = AppTest.from_file(app_file, default_timeout=120)
+script_started = time.perf_counter()
+at.run()
+script_seconds = time.perf_counter() - script_started
+print(json.dumps({
+    "script_seconds": script_seconds,
+    "in_process_seconds": time.perf_counter() - started,
+    "exception": [str(e.value) for e in at.exception],
+    "login_page": any(b.key == "demo_button" for b in at.button),
+    "modules": {name: name in sys.modules for name in heavy},
+}), flush=True)
+"""
+
+
+def run_once(app_file: str, workdir: str) -> Dict:
+    """Starts one process and waits for the first paint of the login page."""
+    # Die Module kommen aus dem Checkout der App (für Vorher-Messungen aus einem älteren Stand)
+    app_root = os.path.dirname(app_file)
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [app_root, os.environ.get("PYTHONPATH")])))
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "-c", _CHILD, app_file, ",".join(HEAVY_MODULES)], cwd=workdir,
+                               env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    line = process.stdout.readline()
+    process_seconds = time.perf_counter() - started
+    process.wait()
+    if not line:
+        raise RuntimeError(f"Startlauf ohne Ergebnis (Exit-Code {process.returncode})")
+    result = json.loads(line)
+    result["process_seconds"] = process_seconds
+    return result
+
+
+def _summary(values: List[float]) -> Dict:
+    return {"min": min(values), "median": statistics.median(values), "max": max(values)}
+
+
+def run(app_file: str, repeat: int, employees: int, years: int, seed: int) -> Dict:
+    workdir = tempfile.mkdtemp(prefix="worktime_startup_")
+    try:
+        generator.write(os.path.join(workdir, "data"), generator.generate(employees, years, seed))
+        # Das Logo liegt neben der App und wird relativ zum Arbeitsverzeichnis gesucht
+        for asset in ("grafik.png",):
+            if os.path.exists(os.path.join(os.path.dirname(app_file), asset)):
+                shutil.copy(os.path.join(os.path.dirname(app_file), asset), workdir)
+        runs = []
+        for i in range(repeat):
+            result = run_once(app_file, workdir)
+            print(f"  Lauf {i + 1}: {result['process_seconds'] * 1000:8.1f} ms "
+                  f"(Skript {result['script_seconds'] * 1000:8.1f} ms)", file=sys.stderr)
+            runs.append(result)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    last = runs[-1]
+    return {
+        "app": app_file,
+        "process_seconds": _summary([r["process_seconds"] for r in runs]),
+        "script_seconds": _summary([r["script_seconds"] for r in runs]),
+        "login_page": all(r["login_page"] for r in runs),
+        "exception": last["exception"],
+        "modules": last["modules"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kaltstart bis zur ersten Anzeige der Login-Seite messen")
+    parser.add_argument("--app", default=DEFAULT_APP, help="App-Datei (z. B. aus einem älteren Checkout)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--scale", default=DEFAULT_SCALE, help="Mitarbeiter x Jahre des Datensatzes")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="JSON-Datei (Standard: stdout)")
+    args = parser.parse_args()
+
+    employees, _, years = args.scale.partition("x")
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "environment": environment(),
+        "config": {"repeat": args.repeat, "scale": args.scale, "seed": args.seed},
+        "startup": run(os.path.abspath(args.app), args.repeat, int(employees), int(years or 1), args.seed),
+    }
+    output = json.dumps(report, indent=4, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+# benchmarks/generator.py
+"""
+Deterministic synthetic data for the benchmarks.
+
+``generate(employees, years, seed)`` builds all collections of a data
+folder in the shapes the pages write them: employees, one time entry per
+employee and working day (about 90 % attendance), vacation requests
+(~6 per employee and year, mixed status), sick leaves (~4 per employee and
+year, stored like the sick leave page does) and notifications. The same
+arguments always produce the same records, including ids and timestamps,
+so results of different commits are comparable.
+
+``write(data_folder, dataset)`` stores a dataset through the repository,
+i.e. in the on-disk layout of the app (monthly partitions for time entries,
+journal for employees).
+
+Aufruf:
+    python -m benchmarks.generator data_bench --employees 500 --years 3
+"""
+
+import argparse
+import random
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Dict, List
+
+from modules.repository import Repository
+
+FIRST_YEAR = 2022
+LOCATIONS = ["Werner Siemens Strasse 107", "Werner Siemens Strasse 39", "Home Office"]
+TEAMS = ["Produktion", "Logistik", "Verwaltung", "Vertrieb", "IT"]
+ATTENDANCE = 0.9
+VACATIONS_PER_YEAR = 6
+SICK_LEAVES_PER_YEAR = 4
+NOTIFICATIONS_PER_YEAR = 10
+# Fester Hash (Passwort "benchmark"), damit das Erzeugen kein bcrypt braucht
+PASSWORD_HASH = "$2b$12$NHQYx//wW3UUiOOQUBaavuZ6a/lFE2H8PAQQ/I4lsWM8jkLNbyO5u"
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _employees(rng: random.Random, count: int) -> List[Dict]:
+    staff = [{
+        "id": "admin-001",
+        "name": "Admin User",
+        "email": "admin@example.com",
+        "password": PASSWORD_HASH,
+        "role": "Admin",
+        "username": "admin",
+    }]
+    for i in range(1, count):
+        staff.append({
+            "id": f"emp-{i:05d}",
+            "name": f"Mitarbeiter {i:05d}",
+            "email": f"mitarbeiter{i:05d}@example.com",
+            "password": PASSWORD_HASH,
+            "role": "Mitarbeiter",
+            "username": f"ma{i:05d}",
+            "team": rng.choice(TEAMS),
+            "location": rng.choice(LOCATIONS),
+        })
+    return staff
+
+
+def _time_entries(rng: random.Random, staff: List[Dict], first_day: date, days: int) -> List[Dict]:
+    entries = []
+    for offset in range(days):
+        day = first_day + timedelta(days=offset)
+        if day.weekday() >= 5:
+            continue
+        for emp in staff:
+            if rng.random() >= ATTENDANCE:
+                continue
+            check_in = datetime(day.year, day.month, day.day, 7) + timedelta(minutes=rng.randrange(180))
+            duration = round(rng.uniform(6.0, 10.5), 2)
+            check_out = check_in + timedelta(hours=duration)
+            entries.append({
+                "id": _uuid(rng),
+                "user_id": emp["id"],
+                "check_in": check_in.strftime("%Y-%m-%d %H:%M:%S"),
+                "check_out": check_out.strftime("%Y-%m-%d %H:%M:%S"),
+                "duration_hours": duration,
+                "location": rng.choice(LOCATIONS),
+                "overtime": duration > 8,
+            })
+    return entries
+
+
+def _vacation_requests(rng: random.Random, staff: List[Dict], first_day: date, days: int,
+                       years: int) -> List[Dict]:
+    requests = []
+    for emp in staff:
+        for _ in range(VACATIONS_PER_YEAR * years):
+            start = first_day + timedelta(days=rng.randrange(days))
+            requests.append({
+                "id": _uuid(rng),
+                "type": "vacation",
+                "user_id": emp["id"],
+                "employee": emp["name"],
+                "start_date": start.isoformat(),
+                "end_date": (start + timedelta(days=rng.randrange(0, 14))).isoformat(),
+                "note": "",
+                "status": rng.choice(["approved", "approved", "approved", "pending", "rejected"]),
+            })
+    return requests
+
+
+def _sick_leaves(rng: random.Random, staff: List[Dict], first_day: date, days: int, years: int) -> List[Dict]:
+    sick_leaves = []
+    for emp in staff:
+        for _ in range(SICK_LEAVES_PER_YEAR * years):
+            start = first_day + timedelta(days=rng.randrange(days))
+            sick_leaves.append({
+                "id": _uuid(rng),
+                "type": "sick_leave",
+                "employee": emp["name"],
+                "user_id": emp["id"],
+                "date": start.isoformat(),
+                "end": (start + timedelta(days=rng.randrange(0, 6))).isoformat(),
+                "note": "",
+            })
+    return sick_leaves
+
+
+def _notifications(rng: random.Random, staff: List[Dict], first_day: date, days: int,
+                   years: int) -> List[Dict]:
+    notifications = []
+    for emp in staff:
+        for _ in range(NOTIFICATIONS_PER_YEAR * years):
+            sent = datetime.combine(first_day, datetime.min.time()) + timedelta(
+                days=rng.randrange(days), seconds=rng.randrange(86400))
+            approved = rng.random() < 0.8
+            status_text = "genehmigt" if approved else "abgelehnt"
+            notifications.append({
+                "id": f"vacation_status_{sent.strftime('%Y%m%d%H%M%S')}_{_uuid(rng)}",
+                "type": "vacation_status",
+                "title": f"Urlaubsantrag {status_text}",
+                "message": f"Dein Urlaubsantrag wurde {status_text}.",
+                "admin_notification": False,
+                "recipient_id": emp["id"],
+                "timestamp": sent.strftime("%Y-%m-%d %H:%M:%S"),
+                "read": rng.random() < 0.7,
+            })
+    return notifications
+
+
+def generate(employees: int, years: int, seed: int = 42, first_year: int = FIRST_YEAR) -> Dict[str, List[Dict]]:
+    """All collections for ``employees`` employees over ``years`` years starting on Jan 1 of ``first_year``."""
+    rng = random.Random(seed)
+    first_day = date(first_year, 1, 1)
+    days = (date(first_year + years, 1, 1) - first_day).days
+    staff = _employees(rng, employees)
+    return {
+        "employees": staff,
+        "time_entries": _time_entries(rng, staff, first_day, days),
+        "vacation_requests": _vacation_requests(rng, staff, first_day, days, years),
+        "sick_leaves": _sick_leaves(rng, staff, first_day, days, years),
+        "notifications": _notifications(rng, staff, first_day, days, years),
+    }
+
+
+def write(data_folder: str, dataset: Dict[str, List[Dict]]) -> Repository:
+    """Writes every collection of ``dataset`` into ``data_folder`` (which should be empty)."""
+    repository = Repository(data_folder)
+    for name, records in dataset.items():
+        repository.save(name, records)
+    return repository
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetische Daten für die Benchmarks erzeugen")
+    parser.add_argument("data_folder")
+    parser.add_argument("--employees", type=int, default=50)
+    parser.add_argument("--years", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--first-year", type=int, default=FIRST_YEAR)
+    args = parser.parse_args()
+
+    dataset = generate(args.employees, args.years, args.seed, args.first_year)
+    write(args.data_folder, dataset)
+    for name, records in dataset.items():
+        print(f"{name}: {len(records)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+# benchmarks/suite.py
+"""
+Benchmark suite for the storage and analytics paths.
+
+For every scale (employees x years) a deterministic data set is generated
+(see benchmarks/generator.py) into a temporary data folder, and each case
+is run ``--repeat`` times. Per case the JSON result holds min, median, mean
+and max in seconds plus the median per call for cases that loop over
+several calls. Metadata (git commit, Python/NumPy/pandas versions, CPU)
+is stored with the results so runs of different commits can be compared:
+
+    python -m benchmarks.suite --scales 50x1,500x3 --output before.json
+    python -m benchmarks.suite --scales 50x1,500x3 --output after.json
+    python -m benchmarks.suite --compare before.json after.json
+
+"cold" cases drop the repository cache and the cached time entry
+partitions first, so the data is read from disk again; since
+``Repository.invalidate`` bumps the versions, every derived cache keyed on
+them misses as well. They measure the first request after a change (disk
+read included), "warm" cases a repeated request. Write cases
+(``save_time_entry``) run last because they change the data set.
+
+Large scales need memory for the generated records: 5000x5 is about six
+million time entries.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from benchmarks import generator
+from modules import columnar, utils
+from modules.calendar import _calendar_html, _calendar_version
+from modules.repository import get_repository
+from modules.stats_engine import get_stats_engine, overtime_by_month
+
+SUITE_FORMAT = 1
+DEFAULT_SCALES = "50x1,500x3"
+DEFAULT_REPEAT = 5
+REMAINING_VACATION_USERS = 100  # Stichprobe für calculate_remaining_vacation
+SAVE_BATCH = 50  # Einträge je Wiederholung von save_time_entry
+
+
+class Case:
+    """One timed operation; ``setup`` runs untimed before every repetition."""
+
+    def __init__(self, name: str, run: Callable, setup: Optional[Callable] = None, calls: int = 1):
+        self.name = name
+        self.run = run
+        self.setup = setup
+        self.calls = calls
+
+
+def _timed(func: Callable) -> float:
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+def _summary(times: List[float], calls: int) -> Dict:
+    result = {
+        "calls": calls,
+        "repeat": len(times),
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.fmean(times),
+        "max": max(times),
+    }
+    if calls > 1:
+        result["per_call_median"] = result["median"] / calls
+    return result
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment() -> Dict:
+    return {
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def _busiest_month(entries: List[Dict]) -> Tuple[int, int]:
+    """Last month of the data set (the calendar usually shows the current one)."""
+    last = max(utils.entry_date(entry) or "" for entry in entries)
+    return int(last[:4]), int(last[5:7])
+
+
+def _reset_columns(data_folder: str):
+    """Removes the persisted column store so the next access converts every partition."""
+    repository = get_repository(data_folder)
+    shutil.rmtree(os.path.join(repository.partition_store("time_entries").directory, columnar.COLUMNAR_DIR),
+                  ignore_errors=True)
+    columnar._stores.pop(os.path.abspath(data_folder), None)
+
+
+def build_cases(data_folder: str, dataset: Dict[str, List[Dict]]) -> List[Case]:
+    repository = get_repository(data_folder)
+    employees = dataset["employees"]
+    year, month = _busiest_month(dataset["time_entries"])
+    month_start = date(year, month, 1)
+    month_end = (month_start + timedelta(days=31)).replace(day=1) - timedelta(days=1)
+    sample_users = [emp["id"] for emp in employees[:REMAINING_VACATION_USERS]]
+    heute = datetime(year, month, 15)
+
+    def cold():
+        repository.invalidate()
+        repository.partition_store("time_entries")._partitions.clear()
+
+    def remaining_vacation():
+        for user_id in sample_users:
+            utils.calculate_remaining_vacation(user_id)
+
+    def absence_statistics():
+        utils.calculate_absence_statistics(utils.load_employees(), utils.load_vacation_requests(),
+                                           utils.load_sick_leaves())
+
+    def stats_tabs():
+        engine = get_stats_engine(data_folder)
+        engine.work_time(month_start, month_end)
+        engine.overtime_table(month_start, month_end)
+        engine.absence_table()
+        engine.overview()
+
+    def calendar_month():
+        version = _calendar_version(repository, year, month)
+        _calendar_html(repository.data_folder, version, year, month, True, True, True, None, heute)
+
+    save_counter = iter(range(10 ** 9))
+
+    def save_time_entries():
+        for _ in range(SAVE_BATCH):
+            n = next(save_counter)
+            check_in = datetime(year, month, month_end.day, 8) + timedelta(seconds=n)
+            utils.save_time_entry({
+                "user_id": employees[n % len(employees)]["id"],
+                "check_in": check_in.strftime("%Y-%m-%d %H:%M:%S"),
+                "check_out": (check_in + timedelta(hours=8)).strftime("%Y-%m-%d %H:%M:%S"),
+                "duration_hours": 8.0,
+                "location": "Home Office",
+                "overtime": False,
+            })
+
+    return [
+        Case("load_time_entries.cold", utils.load_time_entries, setup=cold),
+        Case("load_time_entries.warm", utils.load_time_entries),
+        Case("load_time_entries.month", lambda: utils.load_time_entries(month_start, month_end), setup=cold),
+        Case("columnar.convert", lambda: columnar.load_columns(data_folder=data_folder),
+             setup=lambda: _reset_columns(data_folder)),
+        Case("columnar.warm", lambda: columnar.load_columns(data_folder=data_folder)),
+        Case("calculate_remaining_vacation.cold", remaining_vacation, setup=cold, calls=len(sample_users)),
+        Case("calculate_remaining_vacation.warm", remaining_vacation, calls=len(sample_users)),
+        Case("calculate_absence_statistics", absence_statistics),
+        Case("stats_engine.build", lambda: get_stats_engine(data_folder), setup=cold),
+        Case("stats_engine.tabs", stats_tabs),
+        Case("overtime_by_month.cold", lambda: overtime_by_month(data_folder), setup=cold),
+        Case("calendar_month.cold", calendar_month, setup=cold),
+        Case("calendar_month.warm", calendar_month),
+        Case("save_time_entry", save_time_entries, calls=SAVE_BATCH),
+    ]
+
+
+def run_scale(employees: int, years: int, repeat: int, seed: int, cases: Optional[List[str]] = None) -> Dict:
+    started = time.perf_counter()
+    dataset = generator.generate(employees, years, seed)
+    data_folder = tempfile.mkdtemp(prefix=f"worktime_bench_{employees}x{years}_")
+    previous_folder = utils.DATA_FOLDER
+    try:
+        generator.write(data_folder, dataset)
+        generate_seconds = time.perf_counter() - started
+        utils.DATA_FOLDER = data_folder
+        results = {}
+        for case in build_cases(data_folder, dataset):
+            if cases and not any(case.name.startswith(prefix) for prefix in cases):
+                continue
+            times = []
+            for _ in range(repeat):
+                if case.setup is not None:
+                    case.setup()
+                gc.collect()
+                times.append(_timed(case.run))
+            results[case.name] = _summary(times, case.calls)
+            print(f"  {case.name:36s} {results[case.name]['median'] * 1000:10.2f} ms", file=sys.stderr)
+        return {
+            "employees": employees,
+            "years": years,
+            "records": {name: len(records) for name, records in dataset.items()},
+            "generate_seconds": generate_seconds,
+            "results": results,
+            "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        }
+    finally:
+        utils.DATA_FOLDER = previous_folder
+        get_repository(data_folder).invalidate()
+        _calendar_html.cache_clear()
+        shutil.rmtree(data_folder, ignore_errors=True)
+
+
+def parse_scales(value: str) -> List[Tuple[int, int]]:
+    """"50x1,500x3" -> [(50, 1), (500, 3)]"""
+    scales = []
+    for part in value.split(","):
+        employees, _, years = part.strip().partition("x")
+        scales.append((int(employees), int(years or 1)))
+    return scales
+
+
+def compare(before: Dict, after: Dict) -> List[str]:
+    """Median ratio after/before for every case present in both result files."""
+    lines = []
+    previous = {(s["employees"], s["years"]): s["results"] for s in before["scales"]}
+    for scale in after["scales"]:
+        old = previous.get((scale["employees"], scale["years"]))
+        if old is None:
+            continue
+        lines.append(f"{scale['employees']} Mitarbeiter x {scale['years']} Jahre")
+        for name, result in scale["results"].items():
+            if name not in old:
+                continue
+            ratio = result["median"] / old[name]["median"] if old[name]["median"] else float("inf")
+            lines.append(f"  {name:36s} {old[name]['median'] * 1000:10.2f} ms -> "
+                         f"{result['median'] * 1000:10.2f} ms  x{ratio:.2f}")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks der Speicher- und Auswertungspfade")
+    parser.add_argument("--scales", default=DEFAULT_SCALES, help="Mitarbeiter x Jahre, z. B. 50x1,500x3,5000x5")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--cases", help="Nur Fälle mit diesen Präfixen (kommagetrennt)")
+    parser.add_argument("--output", help="JSON-Datei (Standard: stdout)")
+    parser.add_argument("--compare", nargs=2, metavar=("VORHER", "NACHHER"),
+                        help="Zwei Ergebnisdateien vergleichen statt zu messen")
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0], encoding="utf-8") as f:
+            before = json.load(f)
+        with open(args.compare[1], encoding="utf-8") as f:
+            after = json.load(f)
+        print("\n".join(compare(before, after)))
+        return
+
+    cases = args.cases.split(",") if args.cases else None
+    report = {
+        "format": SUITE_FORMAT,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "environment": environment(),
+        "config": {"repeat": args.repeat, "seed": args.seed},
+        "scales": [],
+    }
+    for employees, years in parse_scales(args.scales):
+        print(f"{employees} Mitarbeiter x {years} Jahre", file=sys.stderr)
+        report["scales"].append(run_scale(employees, years, args.repeat, args.seed, cases))
+
+    output = json.dumps(report, indent=4, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# modules/absence_index.py
+"""
+Pre-parsed absence intervals for the calendar.
+
+Vacation requests and sick leaves are parsed once per data version into
+integer day intervals ``(first day, last day, user id, kind)`` sorted by
+their first day. Records that only carry an employee name are resolved via a
+name -> id map built once from the employee list.
+
+``month(year, month)`` turns the intervals overlapping one month into a
+day -> kind -> set of user ids map. Overlapping intervals are found by
+bisecting the sorted starts (an absence cannot start earlier than the
+longest absence before the month), so a month costs
+O(log R + days + overlapping records) instead of one scan of all records
+per day.
+"""
+
+import bisect
+import threading
+from datetime import date, datetime
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from modules.repository import DATA_FOLDER, get_repository
+
+VACATION = "vacation"
+SICK = "sick"
+SOURCE_COLLECTIONS = ("vacation_requests", "sick_leaves", "employees")
+
+
+def _parse_day(value) -> Optional[int]:
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").toordinal()
+    except (TypeError, ValueError):
+        return None
+
+
+class AbsenceIndex:
+    """Sorted absence intervals of all employees."""
+
+    def __init__(self, vacation_requests: List[Dict], sick_leaves: List[Dict], employees: List[Dict]):
+        self.name_to_id = {emp.get("name"): emp.get("id") for emp in employees}
+        intervals = []
+        for order, vacation in enumerate(vacation_requests):
+            user_id = vacation.get("user_id", vacation.get("employee_id", None))
+            interval = self._interval(vacation, user_id)
+            if interval:
+                intervals.append(interval + (order, user_id, VACATION))
+        for order, sick_leave in enumerate(sick_leaves):
+            user_id = sick_leave.get("user_id", None)
+            if user_id is None and "employee" in sick_leave:
+                user_id = self.name_to_id.get(sick_leave["employee"])
+            interval = self._interval(sick_leave, user_id)
+            if interval:
+                intervals.append(interval + (order, user_id, SICK))
+        intervals.sort()
+        self.intervals: List[Tuple[int, int, int, object, str]] = intervals
+        self._starts = [interval[0] for interval in intervals]
+        self.max_length = max((end - start for start, end, *_ in intervals), default=0)
+
+    @staticmethod
+    def _interval(record: Dict, user_id) -> Optional[Tuple[int, int]]:
+        start_key = "start_date" if "start_date" in record else "date"
+        end_key = "end_date" if "end_date" in record else "end"
+        if start_key not in record or end_key not in record:
+            return None
+        start, end = _parse_day(record[start_key]), _parse_day(record[end_key])
+        if start is None or end is None:
+            print(f"Fehler bei Abwesenheitsdaten: {record}")
+            return None
+        if end < start:
+            return None
+        return (start, end)
+
+    def overlapping(self, first: date, last: date) -> List[Tuple[int, int, int, object, str]]:
+        """Intervals that share at least one day with [first, last]."""
+        first_day, last_day = first.toordinal(), last.toordinal()
+        low = bisect.bisect_left(self._starts, first_day - self.max_length)
+        high = bisect.bisect_right(self._starts, last_day)
+        return [interval for interval in self.intervals[low:high] if interval[1] >= first_day]
+
+    def month(self, year: int, month: int) -> Dict[int, Dict[str, FrozenSet]]:
+        """
+        Day of month -> {"vacation": {...}, "sick": {...}} with all user ids
+        absent on that day (days without absences are omitted).
+
+        The overlapping intervals are swept once in start order: each interval
+        adds its user on its first visible day and removes it the day after its
+        last one, so the month costs O(days + overlapping intervals) plus the
+        size of the result.
+        """
+        first = date(year, month, 1).toordinal()
+        last = date(year + (month == 12), month % 12 + 1, 1).toordinal() - 1
+        days = last - first + 1
+        starts: List[List[Tuple[object, str]]] = [[] for _ in range(days + 1)]
+        ends: List[List[Tuple[object, str]]] = [[] for _ in range(days + 1)]
+        for start, end, _order, user_id, kind in self.overlapping(date.fromordinal(first), date.fromordinal(last)):
+            starts[max(start, first) - first].append((user_id, kind))
+            ends[min(end, last) - first + 1].append((user_id, kind))
+
+        # Zähler je (Mitarbeiter, Art), damit sich überlappende Anträge nicht gegenseitig entfernen
+        active: Dict[Tuple[object, str], int] = {}
+        occupancy: Dict[int, Dict[str, FrozenSet]] = {}
+        for offset in range(days):
+            for key in ends[offset]:
+                active[key] -= 1
+                if not active[key]:
+                    del active[key]
+            for key in starts[offset]:
+                active[key] = active.get(key, 0) + 1
+            if active:
+                occupancy[offset + 1] = {
+                    VACATION: frozenset(u for u, k in active if k == VACATION),
+                    SICK: frozenset(u for u, k in active if k == SICK),
+                }
+        return occupancy
+
+
+_indexes: Dict[str, Tuple[tuple, AbsenceIndex]] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_absence_index(data_folder: Optional[str] = None) -> AbsenceIndex:
+    """Returns the index for the current version of absences and employees."""
+    repository = get_repository(data_folder or DATA_FOLDER)
+    version = tuple(repository.version(name) for name in SOURCE_COLLECTIONS)
+    cached = _indexes.get(repository.data_folder)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    index = AbsenceIndex(repository.load("vacation_requests"), repository.load("sick_leaves"),
+                         repository.load("employees"))
+    with _indexes_lock:
+        _indexes[repository.data_folder] = (version, index)
+    return index
@@ -1,11 +1,18 @@
 import streamlit as st
 import pandas as pd
 import os
-import json
 import uuid
+import math
 import bcrypt
 from datetime import datetime, timedelta
-from modules.utils import load_employees, load_time_entries, load_vacation_requests, load_sick_leaves
+from modules.utils import load_employees, load_vacation_requests, load_sick_leaves, update_employees, add_employee, update_employee, delete_employee, update_vacation_statuses
+from modules.repository import get_repository
+from modules.indexes import get_index, get_search_index
+from modules.notifications import create_vacation_status_notifications
+from modules.backup import DEFAULT_COMPRESSION_LEVEL, BackupError, restore_backup, write_backup
+from modules.export import export_csv, remove_export
+from modules import metrics
+from modules.metrics import instrumented
 
 # Dateipfade
 DATA_DIR = "data"
@@ -13,12 +20,22 @@ EMPLOYEES_FILE = os.path.join(DATA_DIR, "employees.json")
 VACATION_FILE = os.path.join(DATA_DIR, "vacation_requests.json")
 SICK_FILE = os.path.join(DATA_DIR, "sick_leaves.json")
 
+# Mitarbeiter je Seite in der Mitarbeiterverwaltung
+EMPLOYEES_PAGE_SIZE = 20
+
+# CSV-Exporte (Dateiname des Downloads)
+CSV_EXPORTS = {
+    "Mitarbeiterdaten": "mitarbeiterdaten_export.csv",
+    "Urlaubsanträge": "urlaubsantraege_export.csv",
+    "Krankmeldungen": "krankmeldungen_export.csv",
+    "Arbeitszeiterfassung": "arbeitszeit_export.csv",
+}
+
 # Hilfsfunktionen
+@instrumented
 def save_employees(employees):
     """Speichert die Mitarbeiterdaten in der JSON-Datei."""
-    os.makedirs(os.path.dirname(EMPLOYEES_FILE), exist_ok=True)
-    with open(EMPLOYEES_FILE, "w", encoding="utf-8") as f:
-        json.dump(employees, f, indent=4, ensure_ascii=False)
+    get_repository(DATA_DIR).save("employees", employees)
 
 def hash_password(password):
     """Hasht ein Passwort mit bcrypt."""
@@ -29,7 +46,7 @@ def show():
     st.title("⚙️ Administrationsbereich")
     
     # Tabs für verschiedene Administrationsbereiche
-    tabs = st.tabs(["Mitarbeiterverwaltung", "Rollenverwaltung", "Urlaubsanträge", "Krankmeldungen", "Datenexport"])
+    tabs = st.tabs(["Mitarbeiterverwaltung", "Rollenverwaltung", "Urlaubsanträge", "Krankmeldungen", "Datenexport", "Leistung"])
     
     # Tab 1: Mitarbeiterverwaltung
     with tabs[0]:
@@ -79,30 +96,32 @@ def show():
                             "created_at": datetime.now().isoformat()
                         }
                         
-                        employees.append(new_employee)
-                        save_employees(employees)
+                        add_employee(new_employee)
                         st.success(f"Mitarbeiter {new_name} wurde erfolgreich hinzugefügt.")
                         st.rerun()
         
         # Mitarbeiter bearbeiten und löschen
         st.subheader("Mitarbeiterliste")
         
-        # Suchfilter
-        search_query = st.text_input("Suche nach Namen oder E-Mail", key="emp_search")
+        # Suche über den gemeinsamen Suchindex (Name, Benutzername, E-Mail, Team, Standort)
+        search_query = st.text_input("Suche nach Name, Benutzername, E-Mail, Team oder Standort", key="emp_search")
+        search_index = get_search_index(get_repository(DATA_DIR), "employees")
+        positions = search_index.search(search_query)
         
-        # Filtern der Mitarbeiter basierend auf der Suche
-        if search_query:
-            filtered_employees = [emp for emp in employees if 
-                                 search_query.lower() in emp.get("name", "").lower() or 
-                                 search_query.lower() in emp.get("email", "").lower()]
-        else:
-            filtered_employees = employees
+        # Nur die aktuelle Seite wird gerendert
+        pages = max(1, math.ceil(len(positions) / EMPLOYEES_PAGE_SIZE))
+        if st.session_state.get("emp_page", 1) > pages:
+            st.session_state["emp_page"] = 1
+        page = st.number_input(f"Seite (von {pages})", min_value=1, max_value=pages, value=1, key="emp_page")
+        first = (page - 1) * EMPLOYEES_PAGE_SIZE
+        page_employees = [search_index.records[i] for i in positions[first:first + EMPLOYEES_PAGE_SIZE]]
         
         # Anzeigen der Mitarbeiterliste
-        if not filtered_employees:
+        if not page_employees:
             st.info("Keine Mitarbeiter gefunden.")
         else:
-            for emp in filtered_employees:
+            st.caption(f"Mitarbeiter {first + 1}–{first + len(page_employees)} von {len(positions)}")
+            for emp in page_employees:
                 with st.expander(f"{emp.get('name')} - {emp.get('email')} ({emp.get('role')})", expanded=False):
                     col1, col2 = st.columns(2)
                     
@@ -126,21 +145,19 @@ def show():
                     with col3:
                         if st.button("Änderungen speichern", key=f"save_emp_{emp['id']}"):
                             # Aktualisiere Mitarbeiterdaten
-                            for e in employees:
-                                if e["id"] == emp["id"]:
-                                    e["name"] = edit_name
-                                    e["email"] = edit_email
-                                    e["username"] = edit_username
-                                    if edit_password:  # Nur aktualisieren, wenn ein neues Passwort eingegeben wurde
-                                        e["password"] = hash_password(edit_password)
-                                    e["role"] = edit_role
-                                    e["location"] = edit_location
-                                    e["team"] = edit_team
-                                    e["phone"] = edit_phone
-                                    e["updated_at"] = datetime.now().isoformat()
-                                    break
-                            
-                            save_employees(employees)
+                            changes = {
+                                "name": edit_name,
+                                "email": edit_email,
+                                "username": edit_username,
+                                "role": edit_role,
+                                "location": edit_location,
+                                "team": edit_team,
+                                "phone": edit_phone,
+                                "updated_at": datetime.now().isoformat()
+                            }
+                            if edit_password:  # Nur aktualisieren, wenn ein neues Passwort eingegeben wurde
+                                changes["password"] = hash_password(edit_password)
+                            update_employee(emp["id"], changes)
                             st.success(f"Mitarbeiter {edit_name} wurde erfolgreich aktualisiert.")
                             st.rerun()
                     
@@ -149,8 +166,7 @@ def show():
                             # Bestätigungsdialog
                             if st.checkbox(f"Wirklich löschen? Diese Aktion kann nicht rückgängig gemacht werden.", key=f"confirm_delete_{emp['id']}"):
                                 # Mitarbeiter aus der Liste entfernen
-                                employees = [e for e in employees if e["id"] != emp["id"]]
-                                save_employees(employees)
+                                delete_employee(emp["id"])
                                 st.success(f"Mitarbeiter {emp.get('name')} wurde erfolgreich gelöscht.")
                                 st.rerun()
     
@@ -192,14 +208,11 @@ def show():
         
         if st.button("Rolle aktualisieren"):
             # Rolle des ausgewählten Mitarbeiters aktualisieren
-            for emp in employees:
-                if emp["id"] == selected_emp_id:
-                    old_role = emp.get("role", "Mitarbeiter")
-                    emp["role"] = selected_role
-                    emp["updated_at"] = datetime.now().isoformat()
-                    break
-            
-            save_employees(employees)
+            old_role = next((emp.get("role", "Mitarbeiter") for emp in employees if emp["id"] == selected_emp_id), None)
+            update_employees(lambda current: [
+                {**emp, "role": selected_role, "updated_at": datetime.now().isoformat()} if emp["id"] == selected_emp_id else emp
+                for emp in current
+            ])
             st.success(f"Rolle von {next((emp['name'] for emp in employees if emp['id'] == selected_emp_id), '')} wurde von {old_role} zu {selected_role} geändert.")
     
     # Tab 3: Urlaubsanträge
@@ -214,52 +227,54 @@ def show():
         # Neue Anträge
         st.subheader("🔔 Neue Urlaubsanträge")
         
-        pending = [req for req in vacation_requests if req.get("status") == "pending"]
+        # Offene Anträge über den Status-Index statt über alle Anträge
+        vacation_index = get_index(get_repository(DATA_DIR), "vacation_requests")
+        pending = [vacation_index.records[i] for i in vacation_index.lookup("status", ["pending"])]
         if pending:
             st.warning(f"⚠️ {len(pending)} offene Urlaubsanträge")
-            for p in pending:
-                name = employee_map.get(p["user_id"], "Unbekannt")
-                with st.expander(f"{name}: {p['start_date']} bis {p['end_date']}", expanded=True):
-                    st.write(f"**Mitarbeiter:** {name}")
-                    st.write(f"**Zeitraum:** {p['start_date']} bis {p['end_date']}")
-                    st.write(f"**Antrag-ID:** {p.get('id', 'N/A')}")
-                    
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        if st.button("✅ Genehmigen", key=f"approve_{p.get('id')}"):
-                            # Antrag genehmigen
-                            for req in vacation_requests:
-                                if req.get("id") == p.get("id"):
-                                    req["status"] = "approved"
-                                    req["approved_at"] = datetime.now().isoformat()
-                                    break
-                            
-                            # Speichern
-                            with open(VACATION_FILE, "w", encoding="utf-8") as f:
-                                json.dump(vacation_requests, f, indent=4, ensure_ascii=False)
-                            
-                            st.success(f"Urlaubsantrag von {name} wurde genehmigt.")
-                            st.rerun()
-                    
-                    with col2:
-                        if st.button("❌ Ablehnen", key=f"reject_{p.get('id')}"):
-                            # Antrag ablehnen
-                            for req in vacation_requests:
-                                if req.get("id") == p.get("id"):
-                                    req["status"] = "rejected"
-                                    req["rejected_at"] = datetime.now().isoformat()
-                                    break
-                            
-                            # Speichern
-                            with open(VACATION_FILE, "w", encoding="utf-8") as f:
-                                json.dump(vacation_requests, f, indent=4, ensure_ascii=False)
-                            
-                            st.info(f"Urlaubsantrag von {name} wurde abgelehnt.")
-                            st.rerun()
+            pending_by_id = {p.get("id"): p for p in pending}
+            st.dataframe(pd.DataFrame([{
+                "Mitarbeiter": employee_map.get(p.get("user_id"), "Unbekannt"),
+                "Von": p.get("start_date", "N/A"),
+                "Bis": p.get("end_date", "N/A"),
+                "ID": p.get("id", "N/A"),
+            } for p in pending]), use_container_width=True)
+            
+            # Sammelbearbeitung: alle gewählten Anträge in einem Schreibvorgang
+            select_all = st.checkbox("Alle offenen Anträge auswählen", key="vacation_select_all")
+            selected_ids = st.multiselect(
+                "Anträge auswählen",
+                options=list(pending_by_id),
+                default=list(pending_by_id) if select_all else [],
+                format_func=lambda x: f"{employee_map.get(pending_by_id[x].get('user_id'), 'Unbekannt')}: "
+                                      f"{pending_by_id[x].get('start_date')} bis {pending_by_id[x].get('end_date')}",
+                key=f"vacation_selection_{select_all}",
+            )
+            
+            col1, col2 = st.columns(2)
+            new_status = None
+            with col1:
+                if st.button(f"✅ Ausgewählte genehmigen ({len(selected_ids)})", disabled=not selected_ids):
+                    new_status = "approved"
+            with col2:
+                if st.button(f"❌ Ausgewählte ablehnen ({len(selected_ids)})", disabled=not selected_ids):
+                    new_status = "rejected"
+            if new_status:
+                updated = update_vacation_statuses(selected_ids, new_status)
+                create_vacation_status_notifications(updated)
+                st.session_state["vacation_batch_result"] = (len(updated), len(selected_ids) - len(updated),
+                                                             new_status)
+                st.rerun()
         else:
             st.success("Keine neuen Anträge 🎉")
         
+        result = st.session_state.pop("vacation_batch_result", None)
+        if result:
+            count, skipped, status = result
+            st.success(f"{count} Urlaubsanträge wurden {'genehmigt' if status == 'approved' else 'abgelehnt'}.")
+            if skipped:
+                st.warning(f"{skipped} Anträge waren nicht mehr offen und wurden nicht geändert.")
+        
         # Alle Anträge
         st.subheader("Alle Urlaubsanträge")
         
@@ -338,135 +353,104 @@ def show():
         export_type = st.selectbox("Daten exportieren", 
                                  ["Mitarbeiterdaten", "Urlaubsanträge", "Krankmeldungen", "Arbeitszeiterfassung", "Alle Daten"])
         
-        if export_type == "Mitarbeiterdaten":
-            # Mitarbeiterdaten exportieren
-            employees = load_employees()
-            
-            # Sensible Daten entfernen
-            export_employees = []
-            for emp in employees:
-                export_emp = emp.copy()
-                if "password" in export_emp:
-                    export_emp["password"] = "********"  # Passwort ausblenden
-                export_employees.append(export_emp)
-            
-            if export_employees:
-                df = pd.DataFrame(export_employees)
-                csv = df.to_csv(index=False).encode("utf-8")
-                st.download_button("📥 Mitarbeiterdaten exportieren (CSV)", 
-                                 data=csv, 
-                                 file_name="mitarbeiterdaten_export.csv", 
-                                 mime="text/csv")
-            else:
-                st.info("Keine Mitarbeiterdaten zum Exportieren vorhanden.")
-        
-        elif export_type == "Urlaubsanträge":
-            # Urlaubsanträge exportieren
-            vacation_requests = load_vacation_requests()
-            employees = load_employees()
-            employee_map = {emp["id"]: emp["name"] for emp in employees}
-            
-            export_vacation = []
-            for req in vacation_requests:
-                export_req = {
-                    "Mitarbeiter": employee_map.get(req.get("user_id"), "Unbekannt"),
-                    "Von": req.get("start_date", "N/A"),
-                    "Bis": req.get("end_date", "N/A"),
-                    "Status": req.get("status", "pending"),
-                    "ID": req.get("id", "N/A")
-                }
-                export_vacation.append(export_req)
-            
-            if export_vacation:
-                df = pd.DataFrame(export_vacation)
-                csv = df.to_csv(index=False).encode("utf-8")
-                st.download_button("📥 Urlaubsanträge exportieren (CSV)", 
-                                 data=csv, 
-                                 file_name="urlaubsantraege_export.csv", 
-                                 mime="text/csv")
-            else:
-                st.info("Keine Urlaubsanträge zum Exportieren vorhanden.")
-        
-        elif export_type == "Krankmeldungen":
-            # Krankmeldungen exportieren
-            sick_leaves = load_sick_leaves()
+        if export_type in CSV_EXPORTS:
+            # Filter: Zeitraum (nicht für Mitarbeiterdaten) und Mitarbeiter
             employees = load_employees()
-            employee_map = {emp["id"]: emp["name"] for emp in employees}
-            
-            export_sick = []
-            for sick in sick_leaves:
-                export_s = {
-                    "Mitarbeiter": employee_map.get(sick.get("user_id"), "Unbekannt"),
-                    "Von": sick.get("start_date", "N/A"),
-                    "Bis": sick.get("end_date", "N/A"),
-                    "Grund": sick.get("reason", "Nicht angegeben"),
-                    "ID": sick.get("id", "N/A")
-                }
-                export_sick.append(export_s)
-            
-            if export_sick:
-                df = pd.DataFrame(export_sick)
-                csv = df.to_csv(index=False).encode("utf-8")
-                st.download_button("📥 Krankmeldungen exportieren (CSV)", 
-                                 data=csv, 
-                                 file_name="krankmeldungen_export.csv", 
-                                 mime="text/csv")
-            else:
-                st.info("Keine Krankmeldungen zum Exportieren vorhanden.")
-        
-        elif export_type == "Arbeitszeiterfassung":
-            # Arbeitszeiterfassung exportieren
-            time_entries = load_time_entries()
-            employees = load_employees()
-            employee_map = {emp["id"]: emp["name"] for emp in employees}
-            
-            export_time = []
-            for entry in time_entries:
-                export_e = {
-                    "Mitarbeiter": employee_map.get(entry.get("user_id"), "Unbekannt"),
-                    "Check-in": entry.get("check_in", "N/A"),
-                    "Check-out": entry.get("check_out", "N/A"),
-                    "Dauer (Stunden)": entry.get("duration_hours", "N/A"),
-                    "Standort": entry.get("location", "N/A"),
-                    "Überstunden": "Ja" if entry.get("overtime", False) else "Nein",
-                    "Notiz": entry.get("note", "")
-                }
-                export_time.append(export_e)
-            
-            if export_time:
-                df = pd.DataFrame(export_time)
-                csv = df.to_csv(index=False).encode("utf-8")
-                st.download_button("📥 Arbeitszeiterfassung exportieren (CSV)", 
-                                 data=csv, 
-                                 file_name="arbeitszeit_export.csv", 
-                                 mime="text/csv")
-            else:
-                st.info("Keine Arbeitszeitdaten zum Exportieren vorhanden.")
+            employee_names = {emp["id"]: emp["name"] for emp in employees}
+            start = end = None
+            if export_type != "Mitarbeiterdaten":
+                col1, col2 = st.columns(2)
+                with col1:
+                    use_range = st.checkbox("Zeitraum einschränken", key="export_use_range")
+                if use_range:
+                    with col2:
+                        today = datetime.now().date()
+                        start = st.date_input("Von", today.replace(day=1), key="export_start")
+                        end = st.date_input("Bis", today, key="export_end")
+            selected_ids = st.multiselect("Mitarbeiter (leer = alle)", options=list(employee_names),
+                                          format_func=lambda x: employee_names.get(x, x), key="export_users")
+            params = (export_type, start, end, tuple(selected_ids))
+
+            # Export in eine Spool-Datei schreiben und von dort ausliefern
+            previous = st.session_state.get("csv_export")
+            if previous is not None and previous[0] != params:
+                remove_export(previous[1])
+                st.session_state.pop("csv_export")
+                previous = None
+            if st.button("CSV-Export erstellen", key="export_create"):
+                if previous is not None:
+                    remove_export(previous[1])
+                path, count = export_csv(export_type, start, end, selected_ids or None, data_folder=DATA_DIR)
+                previous = st.session_state["csv_export"] = (params, path, count)
+            if previous is not None and os.path.exists(previous[1]):
+                _, path, count = previous
+                if count:
+                    with open(path, "rb") as f:
+                        st.download_button(f"📥 {export_type} exportieren (CSV, {count} Zeilen)",
+                                           data=f,
+                                           file_name=CSV_EXPORTS[export_type],
+                                           mime="text/csv")
+                else:
+                    st.info("Keine Daten für diese Auswahl vorhanden.")
         
         elif export_type == "Alle Daten":
-            # Alle Daten als JSON exportieren
-            employees = load_employees()
-            vacation_requests = load_vacation_requests()
-            sick_leaves = load_sick_leaves()
-            time_entries = load_time_entries()
-            
-            # Sensible Daten entfernen
-            export_employees = []
-            for emp in employees:
-                export_emp = emp.copy()
-                if "password" in export_emp:
-                    export_emp["password"] = "********"  # Passwort ausblenden
-                export_employees.append(export_emp)
-            
-            all_data = {
-                "employees": export_employees,
-                "vacation_requests": vacation_requests,
-                "sick_leaves": sick_leaves,
-                "time_entries": time_entries
-            }
-            
-            json_str = json.dumps(all_data, indent=4, ensure_ascii=False)
-            st.download_button("📥 Alle Daten exportieren (JSON)", 
-                             data=json_str, 
-                             file_name="worktime_app_export.json", 
-                             mime="application/json")
+            # Alle Sammlungen als ZIP-Backup (je Sammlung eine JSONL-Datei plus Manifest)
+            col1, col2 = st.columns(2)
+            with col1:
+                level = st.slider("Komprimierung (0 = keine)", 0, 9, DEFAULT_COMPRESSION_LEVEL, key="backup_level")
+            with col2:
+                include_passwords = st.checkbox("Passwort-Hashes einschließen", value=False, key="backup_passwords")
+            if st.button("Backup erstellen", key="backup_create"):
+                previous = st.session_state.pop("backup_file", None)
+                if previous is not None:
+                    remove_export(previous[0])
+                path, manifest = write_backup(data_folder=DATA_DIR, compression_level=level,
+                                              include_passwords=include_passwords)
+                st.session_state["backup_file"] = (path, manifest)
+            backup = st.session_state.get("backup_file")
+            if backup is not None and os.path.exists(backup[0]):
+                path, manifest = backup
+                counts = ", ".join(f"{name}: {entry['records']}" for name, entry in manifest["collections"].items())
+                st.caption(f"Datensätze – {counts}")
+                with open(path, "rb") as f:
+                    st.download_button("📥 Alle Daten exportieren (ZIP)", 
+                                     data=f, 
+                                     file_name=f"worktime_app_backup_{datetime.now():%Y%m%d}.zip", 
+                                     mime="application/zip")
+
+            # Wiederherstellung aus einem Backup
+            st.subheader("Backup wiederherstellen")
+            uploaded = st.file_uploader("Backup-Datei (ZIP)", type=["zip"], key="backup_upload")
+            confirm = st.checkbox("Ich bestätige, dass alle vorhandenen Daten ersetzt werden.", key="backup_confirm")
+            if uploaded is not None and st.button("Backup wiederherstellen", disabled=not confirm, key="backup_restore"):
+                try:
+                    restored = restore_backup(uploaded, data_folder=DATA_DIR)
+                except BackupError as e:
+                    st.error(f"Backup konnte nicht wiederhergestellt werden: {e}")
+                else:
+                    st.success("Backup wiederhergestellt: " + ", ".join(f"{name}: {count}" for name, count in restored.items()))
+
+    # Tab 6: Leistung (Laufzeiten der Reruns)
+    with tabs[5]:
+        st.header("Leistung")
+        if not metrics.ENABLED:
+            # Ohne aktive Messung wird die Messdatei nicht bei jedem Rerun der Admin-Seite gelesen
+            st.info(f"Die Messung ist ausgeschaltet. Zum Aktivieren die App mit {metrics.METRICS_ENV}=1 starten.")
+            records = []
+        else:
+            records = metrics.load_records()
+            if not records:
+                st.info("Noch keine Messwerte vorhanden.")
+        if records:
+            st.caption(f"{len(records)} Reruns aus {metrics.METRICS_FILE}")
+            st.subheader("Laufzeit pro Seite")
+            st.dataframe(pd.DataFrame(metrics.page_summary(records)))
+            duplicates = metrics.duplicate_load_summary(records)
+            st.subheader("Mehrfach geladene Daten innerhalb eines Reruns")
+            if duplicates:
+                st.dataframe(pd.DataFrame(duplicates))
+            else:
+                st.write("Keine.")
+            st.subheader("Letzte Reruns")
+            recent = pd.DataFrame(records[-50:][::-1])
+            st.dataframe(recent[["timestamp", "page", "cause", "wall_ms", "reads", "read_bytes", "writes", "write_bytes"]])
@@ -0,0 +1,186 @@
+# modules/backup.py
+"""
+ZIP backup and restore of all collections.
+
+``write_backup`` streams every collection into its own JSONL member of a
+ZIP archive (one record per line; time entries are read one month partition
+at a time), so neither a dict of all data nor one big JSON string is ever
+built. A ``manifest.json`` member lists, per collection, the record count
+and the SHA-256 of the member's bytes.
+
+``restore_backup`` verifies every member against the manifest first and
+only then replaces the collections in bulk through the repository (one
+atomic rewrite per collection; for time entries only changed months are
+rewritten). Password fields masked at export time keep the current hash of
+the same record id; a masked record without such a hash (e.g. when
+restoring into an empty folder) makes the restore fail before anything is
+written, since the account could not log in anymore.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import zipfile
+from datetime import datetime
+from typing import BinaryIO, Dict, Iterator, Optional, Tuple, Union
+
+from modules.repository import COLLECTIONS, DATA_FOLDER, PARTITIONED, get_repository
+
+BACKUP_FORMAT = 1
+BACKUP_MANIFEST = "manifest.json"
+BACKUP_PREFIX = "worktime_backup_"
+DEFAULT_COMPRESSION_LEVEL = 6
+PASSWORD_MASK = "********"
+PASSWORD_FIELDS = ("password", "password_hash")
+
+
+class BackupError(Exception):
+    """The archive is not a valid backup or does not match its manifest."""
+
+
+def _member(name: str) -> str:
+    return f"{name}.jsonl"
+
+
+def _iter_records(repository, name: str) -> Iterator[Dict]:
+    if COLLECTIONS[name][1] == PARTITIONED:
+        store = repository.partition_store(name)
+        for key in store.keys():
+            yield from store.read_partition(key)
+    else:
+        yield from repository.snapshot(name)[0]
+
+
+def _masked(record: Dict) -> Dict:
+    if not any(field in record for field in PASSWORD_FIELDS):
+        return record
+    return {key: PASSWORD_MASK if key in PASSWORD_FIELDS and value else value for key, value in record.items()}
+
+
+def write_backup(target: Union[str, BinaryIO, None] = None, data_folder: Optional[str] = None,
+                 compression_level: Optional[int] = DEFAULT_COMPRESSION_LEVEL,
+                 include_passwords: bool = False) -> Tuple[Union[str, BinaryIO], Dict]:
+    """
+    Writes the backup archive to ``target`` (path or binary file; default: a
+    new temporary file). ``compression_level`` 0 stores the members
+    uncompressed, 1-9 deflates them.
+
+    Returns ``(target, manifest)``.
+    """
+    if target is None:
+        fd, target = tempfile.mkstemp(prefix=BACKUP_PREFIX, suffix=".zip")
+        os.close(fd)
+    repository = get_repository(data_folder or DATA_FOLDER)
+    if compression_level:
+        compression, level = zipfile.ZIP_DEFLATED, compression_level
+    else:
+        compression, level = zipfile.ZIP_STORED, None
+    manifest = {"format": BACKUP_FORMAT, "created_at": datetime.now().isoformat(), "collections": {}}
+    with zipfile.ZipFile(target, "w", compression=compression, compresslevel=level) as archive:
+        for name in COLLECTIONS:
+            digest = hashlib.sha256()
+            count = 0
+            with archive.open(_member(name), "w", force_zip64=True) as member:
+                for record in _iter_records(repository, name):
+                    if not include_passwords:
+                        record = _masked(record)
+                    line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+                    member.write(line)
+                    digest.update(line)
+                    count += 1
+            manifest["collections"][name] = {"file": _member(name), "records": count, "sha256": digest.hexdigest()}
+        archive.writestr(BACKUP_MANIFEST, json.dumps(manifest, indent=4, ensure_ascii=False))
+    return target, manifest
+
+
+def read_manifest(archive: zipfile.ZipFile) -> Dict:
+    try:
+        manifest = json.loads(archive.read(BACKUP_MANIFEST))
+    except KeyError:
+        raise BackupError("Kein Manifest im Archiv gefunden.")
+    except json.JSONDecodeError as e:
+        raise BackupError(f"Manifest ist beschädigt: {e}")
+    if manifest.get("format") != BACKUP_FORMAT:
+        raise BackupError(f"Unbekanntes Backup-Format: {manifest.get('format')}")
+    unknown = set(manifest.get("collections", {})) - set(COLLECTIONS)
+    if unknown:
+        raise BackupError(f"Unbekannte Sammlungen im Backup: {', '.join(sorted(unknown))}")
+    return manifest
+
+
+def _verify(archive: zipfile.ZipFile, name: str, entry: Dict):
+    digest = hashlib.sha256()
+    count = 0
+    try:
+        with archive.open(entry["file"]) as member:
+            for line in member:
+                digest.update(line)
+                count += 1
+    except KeyError:
+        raise BackupError(f"{entry['file']} fehlt im Archiv.")
+    if count != entry.get("records") or digest.hexdigest() != entry.get("sha256"):
+        raise BackupError(f"{entry['file']} stimmt nicht mit dem Manifest überein.")
+
+
+def _read_member(archive: zipfile.ZipFile, entry: Dict) -> list:
+    with archive.open(entry["file"]) as member:
+        return [json.loads(line) for line in member if line.strip()]
+
+
+def _missing_hashes(records: list, current: list) -> list:
+    """Ids of records whose masked password has no current hash to take over."""
+    current_by_id = {record.get("id"): record for record in current if record.get("id") is not None}
+    return [record.get("id") for record in records for field in PASSWORD_FIELDS
+            if record.get(field) == PASSWORD_MASK and not current_by_id.get(record.get("id"), {}).get(field)]
+
+
+def _missing_hashes_error(name: str, ids: list) -> BackupError:
+    return BackupError(f"{name}: {len(ids)} Einträge ohne Passwort im Backup und ohne vorhandenes Passwort "
+                       f"({', '.join(map(str, ids[:5]))}); ein Backup mit Passwörtern wird benötigt.")
+
+
+def _keep_masked_passwords(name: str, records: list, current: list) -> list:
+    missing = _missing_hashes(records, current)
+    if missing:
+        raise _missing_hashes_error(name, missing)
+    current_by_id = {record.get("id"): record for record in current if record.get("id") is not None}
+    for record in records:
+        for field in PASSWORD_FIELDS:
+            if record.get(field) == PASSWORD_MASK:
+                record[field] = current_by_id[record.get("id")][field]
+    return records
+
+
+def restore_backup(source: Union[str, BinaryIO], data_folder: Optional[str] = None) -> Dict[str, int]:
+    """
+    Replaces all collections contained in the archive with its content.
+
+    Nothing is written unless every member matches the manifest and every
+    masked password has a current hash to keep. Returns collection ->
+    number of restored records.
+    """
+    repository = get_repository(data_folder or DATA_FOLDER)
+    try:
+        archive = zipfile.ZipFile(source)
+    except zipfile.BadZipFile as e:
+        raise BackupError(f"Keine gültige ZIP-Datei: {e}")
+    with archive:
+        manifest = read_manifest(archive)
+        collections = manifest["collections"]
+        for name, entry in collections.items():
+            _verify(archive, name, entry)
+        # Maskierte Passwörter ohne vorhandenen Hash vor dem ersten Schreiben ablehnen
+        for name, entry in collections.items():
+            masked = [record for record in _read_member(archive, entry)
+                      if any(record.get(field) == PASSWORD_MASK for field in PASSWORD_FIELDS)]
+            missing = _missing_hashes(masked, repository.load(name)) if masked else []
+            if missing:
+                raise _missing_hashes_error(name, missing)
+        restored = {}
+        for name, entry in collections.items():
+            records = _read_member(archive, entry)
+            repository.update(name, lambda current, name=name, records=records:
+                              _keep_masked_passwords(name, records, current))
+            restored[name] = len(records)
+    return restored
@@ -1,93 +1,181 @@
+import functools
+import html
 import streamlit as st
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime
 import calendar
-from modules.utils import load_sick_leaves, load_vacation_requests, load_employees, load_time_entries
-import locale
-
-try:
-    locale.setlocale(locale.LC_TIME, 'de_DE.UTF-8')  # für Linux/mac
-except locale.Error:
-    try:
-        locale.setlocale(locale.LC_TIME, 'deu')  # für Windows, fallback
-    except locale.Error:
-        pass  # Wenn beide fehlschlagen, Standard-Locale verwenden
+from modules.utils import DATA_FOLDER, load_sick_leaves, load_vacation_requests, load_employees
+from modules.absence_index import SICK, VACATION, get_absence_index
+from modules.holidays import holidays
+from modules.partitions import month_key
+from modules.repository import get_repository
+from modules.stats_engine import overtime_days as month_overtime_days
+from modules.utils import use_german_time_locale
 
 # --------------------
 # Daten vorbereiten
 # --------------------
 
-# Feiertage in Hamburg (mit Feiertagsnamen)
-feiertage = {
-    "2025-01-01": "Neujahr",
-    "2025-04-18": "Karfreitag",
-    "2025-05-01": "Tag der Arbeit",
-    "2025-05-29": "Himmelfahrt",
-    "2025-06-09": "Pfingstmontag",
-    "2025-10-03": "Tag der Deutschen Einheit",
-    "2025-12-25": "Weihnachten",
-    "2025-12-26": "2. Weihnachtstag",
-    "2024-01-01": "Neujahr",
-    "2024-03-29": "Karfreitag",
-    "2024-05-01": "Tag der Arbeit",
-    "2024-05-09": "Himmelfahrt",
-    "2024-05-20": "Pfingstmontag",
-    "2024-10-03": "Tag der Deutschen Einheit",
-    "2024-12-25": "Weihnachten",
-    "2024-12-26": "2. Weihnachtstag"
-}
+# Feiertage werden berechnet (modules/holidays.py), hier für Hamburg
+FEIERTAGE_BUNDESLAND = "HH"
+
+# Gerenderte Monate im gemeinsamen LRU-Cache und die Sammlungen, von denen sie abhängen;
+# von den Zeiteinträgen zählt nur die Monatspartition des angezeigten Monats
+CALENDAR_CACHE_SIZE = 64
+CALENDAR_COLLECTIONS = ("employees", "vacation_requests", "sick_leaves")
+
+
+def _calendar_version(repository, jahr, monat):
+    """Cache-Schlüssel der Daten eines Monats, ohne die Zeiteinträge anderer Monate zu lesen."""
+    key = month_key(datetime(jahr, monat, 1))
+    month_signature = repository.partition_store("time_entries").partition_signature(key)
+    return tuple(repository.version(name) for name in CALENDAR_COLLECTIONS) + (month_signature,)
+
+
+@functools.lru_cache(maxsize=CALENDAR_CACHE_SIZE)
+def _calendar_html(data_folder, version, jahr, monat, urlaub_filter, krank_filter, feiertag_filter,
+                   selected_user_id, heute):
+    """
+    Rendert die Kalendertabelle eines Monats.
+
+    Das Ergebnis hängt nur von den Argumenten ab: ``version`` enthält die
+    Datenversionen der Mitarbeiter und Abwesenheiten und die Signatur der
+    Monatspartition der Zeiteinträge, ``heute`` das aktuelle Datum. Feiertage
+    werden aus dem Jahr berechnet und brauchen keine Version. Der
+    LRU-Cache gilt prozessweit, also für alle Sitzungen gemeinsam.
+    """
+    # Calculate calendar start
+    start_date = datetime(jahr, monat, 1)
+
+    # Bestimme die Anzahl der Tage im Monat
+    _, days_in_month = calendar.monthrange(jahr, monat)
+    feiertage = holidays(jahr, FEIERTAGE_BUNDESLAND)
+
+    # Abwesenheiten des Monats: Tag -> Art -> Mitarbeiter-IDs (vorgeparste Intervalle)
+    occupancy = get_absence_index(data_folder).month(jahr, monat)
+
+    # Überstunden nur des angezeigten Monats: Tages-Bitmap und Mitarbeiter-IDs je Tag
+    overtime_bitmap, overtime_days = month_overtime_days(jahr, monat, data_folder)
+    user_map = {emp["id"]: emp["name"] for emp in get_repository(data_folder).snapshot("employees")[0]}
+    employee_ids = frozenset(user_map)
+    selected_user_filter = frozenset([selected_user_id]) if selected_user_id is not None else None
+
+    # Erstelle HTML für den Kalender
+    cal_html = f"""
+    <table class="calendar-table">
+        <thead>
+            <tr>
+                <th>Mo</th>
+                <th>Di</th>
+                <th>Mi</th>
+                <th>Do</th>
+                <th>Fr</th>
+                <th>Sa</th>
+                <th>So</th>
+            </tr>
+        </thead>
+        <tbody>
+    """
+
+    # Bestimme den Wochentag des ersten Tags im Monat (0 = Montag, 6 = Sonntag)
+    first_day_weekday = start_date.weekday()
 
-# Helper Functions
-def ist_feiertag(datum, feiertage):
-    return datum.strftime("%Y-%m-%d") in feiertage
+    # Erstelle Kalender-Zeilen
+    day_counter = 1
+    cal_html += "<tr>"
 
-def ist_urlaub(datum, urlaub_data):
-    for vacation in urlaub_data:
-        try:
-            start_key = 'start_date' if 'start_date' in vacation else 'date'
-            end_key = 'end_date' if 'end_date' in vacation else 'end'
+    # Füge leere Zellen für Tage vor dem ersten Tag des Monats hinzu
+    for i in range(first_day_weekday):
+        cal_html += "<td></td>"
 
-            if start_key not in vacation or end_key not in vacation:
-                continue
+    # Füge die Tage des Monats hinzu
+    while day_counter <= days_in_month:
+        current_date = datetime(jahr, monat, day_counter)
+        weekday = current_date.weekday()
+        
+        # Wenn wir am Ende einer Woche sind, beginne eine neue Zeile
+        if weekday == 0 and day_counter > 1:
+            cal_html += "</tr><tr>"
+        
+        # Bestimme den Status des Tages
+        css_class = ""
+        tooltip_lines = []
+        
+        # Ist es ein Wochenende?
+        if weekday >= 5:
+            css_class = "weekend"
+        
+        # Ist es heute?
+        if current_date.date() == heute:
+            css_class = "today"
+            tooltip_lines.append("Heute")
+        
+        # Ist es ein Feiertag?
+        date_str = current_date.strftime("%Y-%m-%d")
+        if date_str in feiertage and feiertag_filter:
+            css_class = "holiday"
+            tooltip_lines.append(f"Feiertag: {feiertage[date_str]}")
+        
+        # Abwesende und Überstunden des Tages; der Mitarbeiterfilter ist eine Schnittmenge
+        day_absences = occupancy.get(day_counter, {})
+        vacation_users = day_absences.get(VACATION, frozenset()) if urlaub_filter else frozenset()
+        sick_users = day_absences.get(SICK, frozenset()) if krank_filter else frozenset()
+        overtime_users = frozenset()
+        if overtime_bitmap[day_counter - 1]:
+            overtime_users = overtime_days[day_counter] & employee_ids
+        if selected_user_filter is not None:
+            vacation_users &= selected_user_filter
+            sick_users &= selected_user_filter
+            overtime_users &= selected_user_filter
+        
+        counts = []
+        for users, label, symbol, css in (
+            (vacation_users, "Urlaub", "U", "vacation"),
+            (sick_users, "Krank", "K", "sick"),
+            (overtime_users, "Überstunden", "Ü", "overtime"),
+        ):
+            if users:
+                css_class = css
+                names = sorted(user_map.get(u, "Unbekannt") for u in users)
+                tooltip_lines.append(f"{label} ({len(users)}): {', '.join(names)}")
+                counts.append(f"{symbol}{len(users)}")
+        
+        # Füge den Tag zum Kalender hinzu
+        content = str(day_counter)
+        if counts:
+            content += f'<div class="day-counts">{" ".join(counts)}</div>'
+        if css_class:
+            tooltip = html.escape("\n".join(tooltip_lines)).replace("\n", "&#10;")
+            cal_html += f'<td class="{css_class}" title="{tooltip}">{content}</td>'
+        else:
+            cal_html += f'<td>{content}</td>'
+        
+        day_counter += 1
 
-            vacation_start = datetime.strptime(vacation.get(start_key), '%Y-%m-%d').date()
-            vacation_end = datetime.strptime(vacation.get(end_key), '%Y-%m-%d').date()
+    # Fülle die letzte Zeile mit leeren Zellen auf
+    remaining_cells = 7 - ((day_counter - 1 + first_day_weekday) % 7)
+    if remaining_cells < 7:
+        for i in range(remaining_cells):
+            cal_html += "<td></td>"
 
-            if vacation_start <= datum.date() <= vacation_end:
-                user_id = vacation.get('user_id', vacation.get('employee_id', None))
-                return True, user_id
-        except Exception as e:
-            print(f"Fehler bei Urlaubsdaten: {e}")
-            continue
-    return False, None
+    cal_html += "</tr></tbody></table>"
+    return cal_html
 
-def ist_krank(datum, krank_data):
-    for sick_leave in krank_data:
-        try:
-            start_key = 'start_date' if 'start_date' in sick_leave else 'date'
-            end_key = 'end_date' if 'end_date' in sick_leave else 'end'
 
-            if start_key not in sick_leave or end_key not in sick_leave:
-                continue
 
-            sick_start = datetime.strptime(sick_leave.get(start_key), '%Y-%m-%d').date()
-            sick_end = datetime.strptime(sick_leave.get(end_key), '%Y-%m-%d').date()
+@functools.lru_cache(maxsize=CALENDAR_CACHE_SIZE)
+def _feiertage_im_monat(jahr, monat):
+    """Markdown-Zeilen der Feiertage eines Monats."""
+    zeilen = []
+    for date_str, name in holidays(jahr, FEIERTAGE_BUNDESLAND).items():
+        date = datetime.strptime(date_str, "%Y-%m-%d")
+        if date.month == monat and date.year == jahr:
+            zeilen.append(f"- {date.day}. {date.strftime('%B')}: {name}")
+    return tuple(zeilen)
 
-            if sick_start <= datum.date() <= sick_end:
-                user_id = sick_leave.get('user_id', None)
-                if user_id is None and 'employee' in sick_leave:
-                    employees = load_employees()
-                    for emp in employees:
-                        if emp.get('name') == sick_leave['employee']:
-                            user_id = emp.get('id')
-                            break
-                return True, user_id
-        except Exception as e:
-            print(f"Fehler bei Krankheitsdaten: {e}")
-            continue
-    return False, None
 
 def show_calendar():
+    use_german_time_locale()  # deutsche Monatsnamen
     st.title("📅 Kalender")
     
     # CSS für Kalender direkt einfügen
@@ -140,6 +228,11 @@ def show_calendar():
         color: white !important;
         font-weight: bold;
     }
+    .day-counts {
+        font-size: 10px;
+        font-weight: normal;
+        line-height: 1.1;
+    }
     .legend-container {
         display: flex;
         flex-wrap: wrap;
@@ -160,31 +253,8 @@ def show_calendar():
     </style>
     """, unsafe_allow_html=True)
 
-    # Load employee data and create user map
+    # Load employee data
     employees = load_employees()
-    user_map = {emp["id"]: emp["name"] for emp in employees}
-    
-    # Load sick leave and vacation data
-    sick_leaves = load_sick_leaves()
-    vacation_requests = load_vacation_requests()
-
-    # Load time entries and create overtime mapping
-    time_entries = load_time_entries()
-    overtime_map = {}
-    for entry in time_entries:
-        try:
-            entry_date = datetime.strptime(entry["check_in"].split(" ")[0], "%Y-%m-%d").date()
-            if "overtime" not in entry:
-                check_in = datetime.strptime(entry["check_in"], "%Y-%m-%d %H:%M:%S")
-                check_out = datetime.strptime(entry["check_out"], "%Y-%m-%d %H:%M:%S")
-                hours = (check_out - check_in).total_seconds() / 3600
-                is_overtime = hours > 8
-                overtime_map[(entry["user_id"], entry_date)] = is_overtime
-            else:
-                overtime_map[(entry["user_id"], entry_date)] = entry.get("overtime", False)
-        except Exception as e:
-            print(f"Fehler beim Verarbeiten von Überstunden: {e}")
-            continue
 
     # Monat auswählen
     heute = datetime.today()
@@ -198,9 +268,10 @@ def show_calendar():
                                                 "Juli", "August", "September", "Oktober", "November", "Dezember"][m-1])
     
     with col2:
+        jahre = list(range(min(2024, heute.year), heute.year + 2))
         jahr = st.selectbox("📅 Jahr", 
-                          options=list(range(2024, 2027)), 
-                          index=1 if heute.year == 2025 else 0 if heute.year == 2024 else 2)
+                          options=jahre, 
+                          index=jahre.index(heute.year))
 
     # Filter-Checkboxen
     col1, col2, col3 = st.columns(3)
@@ -221,114 +292,18 @@ def show_calendar():
     if selected_user != "Alle":
         selected_user_id = next((emp["id"] for emp in employees if emp["name"] == selected_user), None)
 
-    # Calculate calendar start and end
+    # Calculate calendar start
     start_date = datetime(jahr, monat, 1)
-    
-    # Bestimme die Anzahl der Tage im Monat
-    _, days_in_month = calendar.monthrange(jahr, monat)
-    end_date = datetime(jahr, monat, days_in_month)
 
     # Kalender-Überschrift
     st.write(f"### Kalender für {start_date.strftime('%B %Y')}")
 
-    # Erstelle HTML für den Kalender
-    cal_html = f"""
-    <table class="calendar-table">
-        <thead>
-            <tr>
-                <th>Mo</th>
-                <th>Di</th>
-                <th>Mi</th>
-                <th>Do</th>
-                <th>Fr</th>
-                <th>Sa</th>
-                <th>So</th>
-            </tr>
-        </thead>
-        <tbody>
-    """
-    
-    # Bestimme den Wochentag des ersten Tags im Monat (0 = Montag, 6 = Sonntag)
-    first_day_weekday = start_date.weekday()
-    
-    # Erstelle Kalender-Zeilen
-    day_counter = 1
-    cal_html += "<tr>"
-    
-    # Füge leere Zellen für Tage vor dem ersten Tag des Monats hinzu
-    for i in range(first_day_weekday):
-        cal_html += "<td></td>"
-    
-    # Füge die Tage des Monats hinzu
-    while day_counter <= days_in_month:
-        current_date = datetime(jahr, monat, day_counter)
-        weekday = current_date.weekday()
-        
-        # Wenn wir am Ende einer Woche sind, beginne eine neue Zeile
-        if weekday == 0 and day_counter > 1:
-            cal_html += "</tr><tr>"
-        
-        # Bestimme den Status des Tages
-        css_class = ""
-        tooltip = ""
-        
-        # Ist es ein Wochenende?
-        if weekday >= 5:
-            css_class = "weekend"
-        
-        # Ist es heute?
-        if current_date.date() == heute.date():
-            css_class = "today"
-            tooltip = "Heute"
-        
-        # Ist es ein Feiertag?
-        date_str = current_date.strftime("%Y-%m-%d")
-        if date_str in feiertage and feiertag_filter:
-            css_class = "holiday"
-            tooltip = f"Feiertag: {feiertage[date_str]}"
-        
-        # Ist es ein Urlaubstag?
-        is_vacation, vacation_user_id = ist_urlaub(current_date, vacation_requests)
-        if is_vacation and urlaub_filter and (selected_user == "Alle" or user_map.get(vacation_user_id) == selected_user):
-            css_class = "vacation"
-            tooltip = f"Urlaub: {user_map.get(vacation_user_id, 'Unbekannt')}"
-        
-        # Ist es ein Krankheitstag?
-        is_sick, sick_user_id = ist_krank(current_date, sick_leaves)
-        if is_sick and krank_filter and (selected_user == "Alle" or user_map.get(sick_user_id) == selected_user):
-            css_class = "sick"
-            tooltip = f"Krank: {user_map.get(sick_user_id, 'Unbekannt')}"
-        
-        # Ist es ein Überstundentag?
-        is_overtime = False
-        if selected_user_id:
-            is_overtime = overtime_map.get((selected_user_id, current_date.date()), False)
-        else:
-            for user_id in user_map.keys():
-                if overtime_map.get((user_id, current_date.date()), False):
-                    is_overtime = True
-                    break
-        
-        if is_overtime:
-            css_class = "overtime"
-            tooltip = "Überstunden"
-        
-        # Füge den Tag zum Kalender hinzu
-        if css_class:
-            cal_html += f'<td class="{css_class}" title="{tooltip}">{day_counter}</td>'
-        else:
-            cal_html += f'<td>{day_counter}</td>'
-        
-        day_counter += 1
-    
-    # Fülle die letzte Zeile mit leeren Zellen auf
-    remaining_cells = 7 - ((day_counter - 1 + first_day_weekday) % 7)
-    if remaining_cells < 7:
-        for i in range(remaining_cells):
-            cal_html += "<td></td>"
-    
-    cal_html += "</tr></tbody></table>"
-    
+    # Gerenderte Tabelle aus dem gemeinsamen Cache (Monat, Filter, Mitarbeiter, Datenversion)
+    repository = get_repository(DATA_FOLDER)
+    version = _calendar_version(repository, jahr, monat)
+    cal_html = _calendar_html(repository.data_folder, version, jahr, monat, urlaub_filter, krank_filter,
+                              feiertag_filter, selected_user_id, heute.date())
+
     # Zeige den Kalender an
     st.markdown(cal_html, unsafe_allow_html=True)
     
@@ -368,11 +343,7 @@ def show_calendar():
     
     # Zeige Feiertage für den ausgewählten Monat an
     st.subheader("Feiertage in Hamburg")
-    feiertage_im_monat = []
-    for date_str, name in feiertage.items():
-        date = datetime.strptime(date_str, "%Y-%m-%d")
-        if date.month == monat and date.year == jahr:
-            feiertage_im_monat.append(f"- {date.day}. {date.strftime('%B')}: {name}")
+    feiertage_im_monat = _feiertage_im_monat(jahr, monat)
     
     if feiertage_im_monat:
         for feiertag in feiertage_im_monat:
@@ -382,6 +353,8 @@ def show_calendar():
     
     # Export-Option
     if st.checkbox("Daten anzeigen"):
+        sick_leaves = load_sick_leaves()
+        vacation_requests = load_vacation_requests()
         combined_df = pd.DataFrame(vacation_requests + sick_leaves)
         st.dataframe(combined_df)
         csv = combined_df.to_csv(index=False).encode("utf-8")
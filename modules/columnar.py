@@ -0,0 +1,295 @@
+# modules/columnar.py
+"""
+Columnar (NumPy) representation of the time entries for analytics.
+
+Every monthly partition (see modules/partitions.py) is converted into a set
+of typed arrays and persisted next to it as ``.npy`` files::
+
+    data/time_entries/columnar/dictionaries.json
+    data/time_entries/columnar/2025-04/meta.json
+    data/time_entries/columnar/2025-04/user.npy        int32 user code
+    data/time_entries/columnar/2025-04/check_in.npy    int64 epoch seconds
+    data/time_entries/columnar/2025-04/check_out.npy   int64 epoch seconds
+    data/time_entries/columnar/2025-04/duration.npy    float64 hours
+    data/time_entries/columnar/2025-04/location.npy    int32 location code
+    data/time_entries/columnar/2025-04/overtime.npy    bool
+    data/time_entries/columnar/2025-04/overtime_hours.npy  float64 hours
+
+The arrays are opened memory-mapped. A partition is only converted again
+when its JSONL file changed (signature stored in ``meta.json``), so an append
+rebuilds the current month and nothing else.
+
+User ids and locations are stored as codes into append-only dictionaries:
+a code, once assigned, never changes, so arrays of older months stay valid.
+
+Timestamps are the naive local times of the JSON records counted as seconds
+since 1970-01-01; missing values are ``MISSING_TIME`` (and NaN durations,
+code -1 for user and location).
+
+``overtime`` answers "was this an overtime day" (an ``overtime`` key decides,
+otherwise more than ``OVERTIME_HOURS``). ``overtime_hours`` is what the
+monthly overtime statistics add up: ``duration_hours`` of the entries
+explicitly flagged ``overtime``, 0 for all others.
+"""
+
+import os
+import json
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from modules.journal import write_json_atomic
+from modules.locking import collection_lock
+from modules.partitions import UNDATED, month_key
+from modules.repository import DATA_FOLDER, get_repository
+
+COLUMNAR_DIR = "columnar"
+DICTIONARIES_FILE = "dictionaries.json"
+META_FILE = "meta.json"
+COLUMN_FORMAT = 3
+MISSING_TIME = np.iinfo(np.int64).min
+OVERTIME_HOURS = 8
+COMBINED_CACHE_SIZE = 8
+
+COLUMNS = {
+    "user": np.int32,
+    "check_in": np.int64,
+    "check_out": np.int64,
+    "duration": np.float64,
+    "location": np.int32,
+    "overtime": np.bool_,
+    "overtime_hours": np.float64,
+}
+
+
+def parse_times(values: List) -> np.ndarray:
+    """Vectorized parse of ISO timestamps into int64 epoch seconds."""
+    cleaned = [v if isinstance(v, str) and v else "NaT" for v in values]
+    try:
+        parsed = np.array(cleaned, dtype="datetime64[s]")
+    except ValueError:
+        # Einzelne kaputte Werte: elementweise parsen
+        parsed = np.empty(len(cleaned), dtype="datetime64[s]")
+        for i, value in enumerate(cleaned):
+            try:
+                parsed[i] = np.datetime64(value, "s")
+            except ValueError:
+                parsed[i] = np.datetime64("NaT")
+    return parsed.astype(np.int64)
+
+
+def _save_array(path: str, array: np.ndarray):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, array)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class TimeEntryColumns:
+    """Typed column arrays of (a window of) the time entries."""
+
+    def __init__(self, arrays: Dict[str, np.ndarray], users: List[str], locations: List[str]):
+        self.arrays = arrays
+        self.users = users
+        self.locations = locations
+
+    def __len__(self):
+        return len(self.arrays["user"])
+
+    def __getattr__(self, name):
+        arrays = self.__dict__.get("arrays", {})
+        if name in arrays:
+            return arrays[name]
+        raise AttributeError(name)
+
+    def user_codes(self) -> Dict[str, int]:
+        return {user_id: code for code, user_id in enumerate(self.users)}
+
+    def between(self, start=None, end=None) -> "TimeEntryColumns":
+        """Rows whose check-in day lies in [start, end] (dates, inclusive)."""
+        mask = self.check_in != MISSING_TIME
+        if start is not None:
+            mask &= self.check_in >= _day_start(start)
+        if end is not None:
+            mask &= self.check_in < _day_start(end) + 86400
+        return TimeEntryColumns({k: v[mask] for k, v in self.arrays.items()}, self.users, self.locations)
+
+    def days(self) -> np.ndarray:
+        """Check-in day as days since 1970-01-01 (MISSING_TIME stays negative)."""
+        return np.floor_divide(self.check_in, 86400)
+
+
+def _day_start(value) -> int:
+    if isinstance(value, str):
+        value = datetime.strptime(value[:10], "%Y-%m-%d")
+    return int(np.datetime64(value.strftime("%Y-%m-%d"), "s").astype(np.int64))
+
+
+class ColumnarStore:
+    """Builds and caches the column files of one partitioned collection."""
+
+    def __init__(self, data_folder: str, collection: str = "time_entries"):
+        self.repository = get_repository(data_folder)
+        self.collection = collection
+        self.partitions = self.repository.partition_store(collection)
+        self.directory = os.path.join(self.partitions.directory, COLUMNAR_DIR)
+        self._loaded: Dict[str, Tuple[list, Dict[str, np.ndarray]]] = {}
+        self._combined: Dict[tuple, Tuple[tuple, Dict[str, np.ndarray]]] = {}
+        self._dictionaries: Tuple[tuple, Dict[str, List[str]]] = (None, {"users": [], "locations": []})
+        self._lock = threading.Lock()
+
+    # --- Wörterbücher (nur anhängen) ---
+    def _dictionaries_path(self) -> str:
+        return os.path.join(self.directory, DICTIONARIES_FILE)
+
+    def dictionaries(self) -> Dict[str, List[str]]:
+        path = self._dictionaries_path()
+        try:
+            st = os.stat(path)
+            signature = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            return {"users": [], "locations": []}
+        if self._dictionaries[0] != signature:
+            with open(path, "r", encoding="utf-8") as f:
+                self._dictionaries = (signature, json.load(f))
+        return self._dictionaries[1]
+
+    # --- Partitionen ---
+    def _partition_signature(self, key: str) -> list:
+        try:
+            st = os.stat(self.partitions.partition_path(key))
+        except FileNotFoundError:
+            return [0, -1]
+        return [st.st_mtime_ns, st.st_size]
+
+    def _partition_dir(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def _read_meta(self, key: str) -> Optional[Dict]:
+        try:
+            with open(os.path.join(self._partition_dir(key), META_FILE), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _build(self, key: str, signature: list):
+        """Converts one partition; runs under the columnar lock."""
+        records = self.partitions.read_partition(key)
+        dictionaries = self.dictionaries()
+        users = list(dictionaries.get("users", []))
+        locations = list(dictionaries.get("locations", []))
+        user_codes = {u: i for i, u in enumerate(users)}
+        location_codes = {loc: i for i, loc in enumerate(locations)}
+
+        def code(mapping, values, value):
+            if value is None or value == "":
+                return -1
+            value = str(value)
+            if value not in mapping:
+                mapping[value] = len(values)
+                values.append(value)
+            return mapping[value]
+
+        n = len(records)
+        user = np.fromiter((code(user_codes, users, r.get("user_id")) for r in records), np.int32, n)
+        location = np.fromiter((code(location_codes, locations, r.get("location")) for r in records), np.int32, n)
+        check_in = parse_times([r.get("check_in") or r.get("check_in_time") for r in records])
+        check_out = parse_times([r.get("check_out") or r.get("check_out_time") for r in records])
+
+        given = np.fromiter(
+            (float(r["duration_hours"]) if isinstance(r.get("duration_hours"), (int, float)) else np.nan
+             for r in records), np.float64, n)
+        both = (check_in != MISSING_TIME) & (check_out != MISSING_TIME)
+        derived = np.where(both, (check_out - check_in) / 3600.0, np.nan)
+        # float64 wie in den JSON-Datensätzen, damit gerundete Summen gleich bleiben
+        duration = np.where(np.isnan(given), derived, given)
+
+        # Wie bisher entscheidet ein vorhandener Schlüssel "overtime" (auch None = nein),
+        # sonst die Dauer
+        flag = np.fromiter((int(bool(r["overtime"])) if "overtime" in r else -1 for r in records), np.int8, n)
+        overtime = np.where(flag >= 0, flag == 1, np.nan_to_num(duration, nan=0.0) > OVERTIME_HOURS)
+        # Überstundenstatistik: nur ausdrücklich markierte Einträge mit ihrer gespeicherten Dauer
+        overtime_hours = np.where(flag == 1, np.nan_to_num(given, nan=0.0), 0.0)
+
+        if len(users) != len(dictionaries.get("users", [])) or len(locations) != len(dictionaries.get("locations", [])):
+            write_json_atomic(self._dictionaries_path(), {"users": users, "locations": locations})
+
+        directory = self._partition_dir(key)
+        os.makedirs(directory, exist_ok=True)
+        arrays = {"user": user, "check_in": check_in, "check_out": check_out,
+                  "duration": duration, "location": location, "overtime": overtime.astype(np.bool_),
+                  "overtime_hours": overtime_hours}
+        for name, dtype in COLUMNS.items():
+            _save_array(os.path.join(directory, f"{name}.npy"), arrays[name].astype(dtype, copy=False))
+        meta = {"format": COLUMN_FORMAT, "signature": signature, "rows": n}
+        write_json_atomic(os.path.join(directory, META_FILE), meta)
+        return meta
+
+    def partition(self, key: str) -> Dict[str, np.ndarray]:
+        """Returns the (memory-mapped) arrays of one partition, rebuilding them if stale."""
+        signature = self._partition_signature(key)
+        cached = self._loaded.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        os.makedirs(self.directory, exist_ok=True)
+        with collection_lock(self._dictionaries_path()):
+            # Unter dem Lock, damit Metadaten und Arrays zum selben Build gehören
+            meta = self._read_meta(key)
+            signature = self._partition_signature(key)
+            if meta is None or meta.get("signature") != signature or meta.get("format") != COLUMN_FORMAT:
+                meta = self._build(key, signature)
+            directory = self._partition_dir(key)
+            # Leere Arrays lassen sich nicht mappen
+            mmap_mode = "r" if meta.get("rows") else None
+            arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode)
+                      for name in COLUMNS}
+        with self._lock:
+            self._loaded[key] = (signature, arrays)
+        return arrays
+
+    def columns(self, start=None, end=None) -> TimeEntryColumns:
+        """Concatenated columns of all partitions in the months of [start, end]."""
+        low = month_key(start) if start is not None else None
+        high = month_key(end) if end is not None else None
+        keys = [key for key in self.partitions.keys()
+                if not ((low is not None or high is not None) and key == UNDATED)
+                and (low is None or key >= low) and (high is None or key <= high)]
+        parts = [self.partition(key) for key in keys]
+        # Das Zusammenfügen kopiert alle Spalten: Ergebnis je Fenster merken
+        signature = tuple(tuple(self._loaded[key][0]) for key in keys)
+        cached = self._combined.get((low, high))
+        if cached is not None and cached[0] == signature:
+            arrays = cached[1]
+        else:
+            if parts:
+                arrays = {name: np.concatenate([p[name] for p in parts]) if len(parts) > 1 else parts[0][name]
+                          for name in COLUMNS}
+            else:
+                arrays = {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS.items()}
+            with self._lock:
+                if len(self._combined) >= COMBINED_CACHE_SIZE:
+                    self._combined.clear()
+                self._combined[(low, high)] = (signature, arrays)
+        dictionaries = self.dictionaries()
+        columns = TimeEntryColumns(arrays, dictionaries.get("users", []), dictionaries.get("locations", []))
+        if start is not None or end is not None:
+            columns = columns.between(start, end)
+        return columns
+
+
+_stores: Dict[str, ColumnarStore] = {}
+_stores_lock = threading.Lock()
+
+
+def load_columns(start=None, end=None, data_folder: Optional[str] = None) -> TimeEntryColumns:
+    """Returns the time entries (optionally a date window) as typed NumPy columns."""
+    key = os.path.abspath(data_folder or DATA_FOLDER)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = ColumnarStore(key)
+    return store.columns(start, end)
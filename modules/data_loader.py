@@ -1,51 +1,46 @@
 # modules/data_loader.py
 import json
 import os
-import bcrypt  # Zum Hashen der Passwörter
+from modules.metrics import instrumented
+from modules.repository import get_repository
 
 DATA_FOLDER = "data"
 EMPLOYEE_FILE = os.path.join(DATA_FOLDER, "employees.json")
 
 # Funktion zum Hashen des Passworts
 def hash_password(password: str) -> str:
+    import bcrypt  # Zum Hashen der Passwörter (erst bei Bedarf geladen)
     salt = bcrypt.gensalt()
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed.decode('utf-8')  # Rückgabe als String
 
 # Funktion zur Überprüfung des Passworts
 def check_password(stored_hash: str, password: str) -> bool:
+    import bcrypt
     return bcrypt.checkpw(password.encode('utf-8'), stored_hash.encode('utf-8'))
 
+@instrumented
 def load_employees():
     """Lädt die Mitarbeiterdaten aus der JSON-Datei."""
-    if os.path.exists(EMPLOYEE_FILE):
-        try:
-            with open(EMPLOYEE_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except json.JSONDecodeError:
-            print(f"Warning: Could not decode JSON from {EMPLOYEE_FILE}. Returning an empty list.")
-            return []
-    else:
-        print(f"Warning: Employee file not found at {EMPLOYEE_FILE}. Returning an empty list.")
-        return []
+    return get_repository(DATA_FOLDER).load("employees")
 
+@instrumented
 def save_employees(employees):
     """Speichert die Mitarbeiterdaten in der JSON-Datei."""
-    if not os.path.exists(DATA_FOLDER):
-        os.makedirs(DATA_FOLDER)
-    with open(EMPLOYEE_FILE, "w", encoding="utf-8") as f:
-        json.dump(employees, f, indent=4, ensure_ascii=False)
+    get_repository(DATA_FOLDER).save("employees", employees)
 
+@instrumented
 def load_employees_with_hashed_passwords():
     """Lädt Mitarbeiterdaten und stellt sicher, dass Passwörter gehasht sind."""
     employees = load_employees()
-    passwords_changed = False
-    for emp in employees:
-        if "password" in emp and not emp["password"].startswith("$2b$"):  # Grundlegende Prüfung auf bcrypt-Hash
-            emp["password"] = hash_password(emp["password"])
-            passwords_changed = True
-    if passwords_changed:
-        save_employees(employees)
+    if any("password" in emp and not emp["password"].startswith("$2b$") for emp in employees):  # Grundlegende Prüfung auf bcrypt-Hash
+        def _hash_plaintext(current):
+            return [
+                {**emp, "password": hash_password(emp["password"])}
+                if "password" in emp and not emp["password"].startswith("$2b$") else emp
+                for emp in current
+            ]
+        employees = get_repository(DATA_FOLDER).update("employees", _hash_plaintext)
     return employees
 
 # Optional: Funktion zum Finden eines Mitarbeiters anhand des Benutzernamens (nützlich für Login)
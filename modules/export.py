@@ -0,0 +1,188 @@
+# modules/export.py
+"""
+Streaming CSV export for the admin page.
+
+Rows are produced by generators straight from the store (time entries
+partition by partition, absences record by record) and written in chunks
+of ``EXPORT_CHUNK_ROWS`` to a temporary spool file. No DataFrame or
+in-memory CSV string of the whole export is built, so the memory needed
+while exporting does not grow with the number of rows; the download is
+served from the file.
+
+Filters: an inclusive date range (check-in day for time entries, overlap
+for absences) and a set of employee ids.
+"""
+
+import csv
+import itertools
+import os
+import tempfile
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from modules.partitions import UNDATED, month_key
+from modules.repository import DATA_FOLDER, get_repository
+from modules.utils import entry_date
+
+EXPORT_CHUNK_ROWS = 1000
+EXPORT_PREFIX = "worktime_export_"
+
+TIME_ENTRY_COLUMNS = ["Mitarbeiter", "Check-in", "Check-out", "Dauer (Stunden)", "Standort", "Überstunden", "Notiz"]
+VACATION_COLUMNS = ["Mitarbeiter", "Von", "Bis", "Status", "ID"]
+SICK_LEAVE_COLUMNS = ["Mitarbeiter", "Von", "Bis", "Grund", "ID"]
+
+
+def _day(value) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, date):
+        return value.strftime("%Y-%m-%d")
+    return str(value)[:10]
+
+
+# --- Quellen ---
+def iter_time_entries(start=None, end=None, user_ids=None, data_folder: Optional[str] = None) -> Iterator[Dict]:
+    """Time entries with a check-in day in [start, end], one month partition at a time."""
+    start, end = _day(start), _day(end)
+    store = get_repository(data_folder or DATA_FOLDER).partition_store("time_entries")
+    low = month_key(start) if start else None
+    high = month_key(end) if end else None
+    for key in store.keys():
+        if key == UNDATED:
+            if start or end:
+                continue
+        elif (low and key < low) or (high and key > high):
+            continue
+        for entry in store.read_partition(key):
+            if user_ids is not None and entry.get("user_id") not in user_ids:
+                continue
+            if start or end:
+                day = entry_date(entry)
+                if day is None or (start and day < start) or (end and day > end):
+                    continue
+            yield entry
+
+
+def iter_absences(collection: str, start=None, end=None, user_ids=None,
+                  data_folder: Optional[str] = None) -> Iterator[Dict]:
+    """Vacation requests or sick leaves overlapping [start, end]."""
+    start, end = _day(start), _day(end)
+    records, _ = get_repository(data_folder or DATA_FOLDER).snapshot(collection)
+    for record in records:
+        if user_ids is not None and record.get("user_id") not in user_ids:
+            continue
+        if start or end:
+            first = record.get("start_date") or record.get("date")
+            last = record.get("end_date") or record.get("end") or first
+            if not isinstance(first, str) or not isinstance(last, str):
+                continue
+            if (end and first[:10] > end) or (start and last[:10] < start):
+                continue
+        yield record
+
+
+# --- Zeilen ---
+def time_entry_rows(entries: Iterable[Dict], employee_map: Dict) -> Iterator[List]:
+    for entry in entries:
+        yield [
+            employee_map.get(entry.get("user_id"), "Unbekannt"),
+            entry.get("check_in", "N/A"),
+            entry.get("check_out", "N/A"),
+            entry.get("duration_hours", "N/A"),
+            entry.get("location", "N/A"),
+            "Ja" if entry.get("overtime", False) else "Nein",
+            entry.get("note", ""),
+        ]
+
+
+def vacation_rows(requests: Iterable[Dict], employee_map: Dict) -> Iterator[List]:
+    for req in requests:
+        yield [
+            employee_map.get(req.get("user_id"), "Unbekannt"),
+            req.get("start_date", "N/A"),
+            req.get("end_date", "N/A"),
+            req.get("status", "pending"),
+            req.get("id", "N/A"),
+        ]
+
+
+def sick_leave_rows(sick_leaves: Iterable[Dict], employee_map: Dict) -> Iterator[List]:
+    for sick in sick_leaves:
+        yield [
+            employee_map.get(sick.get("user_id"), "Unbekannt"),
+            sick.get("start_date", "N/A"),
+            sick.get("end_date", "N/A"),
+            sick.get("reason", "Nicht angegeben"),
+            sick.get("id", "N/A"),
+        ]
+
+
+def employee_rows(employees: List[Dict]) -> Iterator[List]:
+    """Employees without password hashes; columns are the union of all keys."""
+    columns = list(dict.fromkeys(key for emp in employees for key in emp))
+    yield columns
+    for emp in employees:
+        yield ["********" if key == "password" and key in emp else emp.get(key) for key in columns]
+
+
+# --- Spool-Datei ---
+def write_csv(rows: Iterable[List], header: Optional[List[str]] = None,
+              chunk_rows: int = EXPORT_CHUNK_ROWS) -> tuple:
+    """
+    Writes ``rows`` chunk by chunk into a temporary CSV file.
+
+    Returns ``(path, row_count)``; the caller removes the file when it was
+    served (see remove_export).
+    """
+    fd, path = tempfile.mkstemp(prefix=EXPORT_PREFIX, suffix=".csv")
+    count = 0
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f, lineterminator="\n")
+            if header is not None:
+                writer.writerow(header)
+            rows = iter(rows)
+            while True:
+                chunk = list(itertools.islice(rows, chunk_rows))
+                if not chunk:
+                    break
+                writer.writerows(chunk)
+                count += len(chunk)
+    except BaseException:
+        os.remove(path)
+        raise
+    return path, count
+
+
+def remove_export(path: Optional[str]):
+    if path and os.path.exists(path):
+        os.remove(path)
+
+
+def export_csv(export_type: str, start=None, end=None, user_ids=None,
+               data_folder: Optional[str] = None) -> tuple:
+    """
+    Writes one of the admin exports ("Mitarbeiterdaten", "Urlaubsanträge",
+    "Krankmeldungen", "Arbeitszeiterfassung") to a spool file.
+
+    Returns ``(path, row_count)``.
+    """
+    repository = get_repository(data_folder or DATA_FOLDER)
+    employees, _ = repository.snapshot("employees")
+    employee_map = {emp["id"]: emp["name"] for emp in employees}
+    if user_ids is not None:
+        user_ids = set(user_ids)
+    if export_type == "Mitarbeiterdaten":
+        selected = [emp for emp in employees if user_ids is None or emp.get("id") in user_ids]
+        path, count = write_csv(employee_rows(selected))
+        return path, max(count - 1, 0)
+    if export_type == "Urlaubsanträge":
+        rows = vacation_rows(iter_absences("vacation_requests", start, end, user_ids, data_folder), employee_map)
+        return write_csv(rows, VACATION_COLUMNS)
+    if export_type == "Krankmeldungen":
+        rows = sick_leave_rows(iter_absences("sick_leaves", start, end, user_ids, data_folder), employee_map)
+        return write_csv(rows, SICK_LEAVE_COLUMNS)
+    if export_type == "Arbeitszeiterfassung":
+        rows = time_entry_rows(iter_time_entries(start, end, user_ids, data_folder), employee_map)
+        return write_csv(rows, TIME_ENTRY_COLUMNS)
+    raise ValueError(f"Unbekannter Export: {export_type}")
@@ -0,0 +1,158 @@
+# modules/holidays.py
+"""
+Public holidays in Germany for any year, and working-day counting.
+
+Holidays are computed, not listed: fixed dates plus the movable feasts
+derived from Easter Sunday (Gauss/Meeus algorithm for the Gregorian
+calendar). ``holidays(year, state)`` returns "YYYY-MM-DD" -> name and is
+cached per year and state, so a lookup is a dict access.
+
+``working_days(starts, ends, state)`` counts Monday-Friday days without
+holidays for whole arrays of inclusive date ranges at once with
+``np.busday_count``; the holiday calendar of the covered years is built
+once and cached.
+"""
+
+import functools
+from datetime import date, timedelta
+from typing import Dict, Iterable, Tuple
+
+import numpy as np
+
+DEFAULT_STATE = "HH"  # Hamburg
+
+STATES = {
+    "BW": "Baden-Württemberg",
+    "BY": "Bayern",
+    "BE": "Berlin",
+    "BB": "Brandenburg",
+    "HB": "Bremen",
+    "HH": "Hamburg",
+    "HE": "Hessen",
+    "MV": "Mecklenburg-Vorpommern",
+    "NI": "Niedersachsen",
+    "NW": "Nordrhein-Westfalen",
+    "RP": "Rheinland-Pfalz",
+    "SL": "Saarland",
+    "SN": "Sachsen",
+    "ST": "Sachsen-Anhalt",
+    "SH": "Schleswig-Holstein",
+    "TH": "Thüringen",
+}
+
+# Landesfeiertage: Länder bzw. erstes Jahr
+_EPIPHANY_STATES = {"BW", "BY", "ST"}
+_CORPUS_CHRISTI_STATES = {"BW", "BY", "HE", "NW", "RP", "SL"}
+_ALL_SAINTS_STATES = {"BW", "BY", "NW", "RP", "SL"}
+_REFORMATION_STATES = {"BB", "MV", "SN", "ST", "TH"}
+_REFORMATION_STATES_SINCE_2018 = {"HB", "HH", "NI", "SH"}
+_WOMENS_DAY_SINCE = {"BE": 2019, "MV": 2023}
+_ONE_OFF = {
+    ("BE", date(2020, 5, 8)): "Tag der Befreiung",
+    ("BE", date(2025, 5, 8)): "Tag der Befreiung",
+}
+
+
+def easter_sunday(year: int) -> date:
+    """Easter Sunday of a year (Gregorian calendar)."""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _check_state(state: str) -> str:
+    if state not in STATES:
+        raise ValueError(f"Unbekanntes Bundesland: {state}")
+    return state
+
+
+@functools.lru_cache(maxsize=None)
+def _holiday_dates(year: int, state: str) -> Tuple[Tuple[date, str], ...]:
+    easter = easter_sunday(year)
+    days = [
+        (date(year, 1, 1), "Neujahr"),
+        (easter - timedelta(days=2), "Karfreitag"),
+        (easter + timedelta(days=1), "Ostermontag"),
+        (date(year, 5, 1), "Tag der Arbeit"),
+        (easter + timedelta(days=39), "Himmelfahrt"),
+        (easter + timedelta(days=50), "Pfingstmontag"),
+        (date(year, 12, 25), "Weihnachten"),
+        (date(year, 12, 26), "2. Weihnachtstag"),
+    ]
+    if year >= 1990:
+        days.append((date(year, 10, 3), "Tag der Deutschen Einheit"))
+    if state in _EPIPHANY_STATES:
+        days.append((date(year, 1, 6), "Heilige Drei Könige"))
+    if year >= _WOMENS_DAY_SINCE.get(state, year + 1):
+        days.append((date(year, 3, 8), "Internationaler Frauentag"))
+    if state == "BB":
+        days.append((easter, "Ostersonntag"))
+        days.append((easter + timedelta(days=49), "Pfingstsonntag"))
+    if state in _CORPUS_CHRISTI_STATES:
+        days.append((easter + timedelta(days=60), "Fronleichnam"))
+    if state == "SL":
+        days.append((date(year, 8, 15), "Mariä Himmelfahrt"))
+    if state == "TH" and year >= 2019:
+        days.append((date(year, 9, 20), "Weltkindertag"))
+    if (state in _REFORMATION_STATES or year == 2017
+            or (state in _REFORMATION_STATES_SINCE_2018 and year >= 2018)):
+        days.append((date(year, 10, 31), "Reformationstag"))
+    if state in _ALL_SAINTS_STATES:
+        days.append((date(year, 11, 1), "Allerheiligen"))
+    if state == "SN":
+        # Mittwoch vor dem 23. November
+        nov_22 = date(year, 11, 22)
+        days.append((nov_22 - timedelta(days=(nov_22.weekday() - 2) % 7), "Buß- und Bettag"))
+    days.extend((day, name) for (one_off_state, day), name in _ONE_OFF.items()
+                if one_off_state == state and day.year == year)
+    return tuple(sorted(days))
+
+
+@functools.lru_cache(maxsize=None)
+def _holidays(year: int, state: str) -> Dict[str, str]:
+    return {day.isoformat(): name for day, name in _holiday_dates(year, state)}
+
+
+def holidays(year: int, state: str = DEFAULT_STATE) -> Dict[str, str]:
+    """Holidays of one year and state as "YYYY-MM-DD" -> name (shared dict, read-only)."""
+    return _holidays(year, _check_state(state))
+
+
+def is_holiday(day: date, state: str = DEFAULT_STATE) -> bool:
+    return day.isoformat() in holidays(day.year, state)
+
+
+@functools.lru_cache(maxsize=None)
+def holiday_array(year: int, state: str = DEFAULT_STATE) -> np.ndarray:
+    """Holidays of one year as a sorted ``datetime64[D]`` array."""
+    return np.array([day for day, _ in _holiday_dates(year, _check_state(state))], dtype="datetime64[D]")
+
+
+@functools.lru_cache(maxsize=32)
+def _busday_calendar(first_year: int, last_year: int, state: str) -> np.busdaycalendar:
+    years = [holiday_array(year, state) for year in range(first_year, last_year + 1)]
+    return np.busdaycalendar(weekmask="1111100", holidays=np.concatenate(years))
+
+
+def working_days(starts: Iterable, ends: Iterable, state: str = DEFAULT_STATE) -> np.ndarray:
+    """
+    Working days (Mon-Fri without holidays) of each inclusive range
+    [starts[i], ends[i]]. Accepts dates or "YYYY-MM-DD" strings; ranges whose
+    end lies before their start count 0.
+    """
+    starts = np.asarray(starts, dtype="datetime64[D]")
+    ends = np.asarray(ends, dtype="datetime64[D]")
+    if starts.size == 0:
+        return np.zeros(starts.shape, dtype=np.int64)
+    years = np.concatenate([starts, ends]).astype("datetime64[Y]").astype(np.int64) + 1970
+    calendar = _busday_calendar(int(years.min()), int(years.max()), _check_state(state))
+    counts = np.busday_count(starts, ends + np.timedelta64(1, "D"), busdaycal=calendar)
+    return np.maximum(counts, 0).astype(np.int64)
@@ -1,124 +1,76 @@
 import streamlit as st
 import datetime
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-try:
-    from sqlalchemy import func, extract
-    from modules.models import CheckIn, SickLeave, VacationRequest, User, get_db_session
-except ImportError:
-    # If SQLAlchemy import fails, we're using the JSON implementation
-    from modules.models import CheckIn, SickLeave, VacationRequest, User, get_db_session
-from fpdf import FPDF
+from modules.models import STORAGE_BACKEND, CheckIn, User, get_db_session
+from modules.models_json import DATA_FOLDER as JSON_DATA_FOLDER
+from modules.rollups import weekly_hours
+
+def _weekly_hours_from_db(user_id, start_date, end_date):
+    """Stunden je (ISO-Jahr, ISO-Woche) aus einer Abfrage der abgeschlossenen Einträge im Zeitraum."""
+    with get_db_session() as session:
+        query = session.query(CheckIn).filter(
+            CheckIn.check_out_time.isnot(None),
+            CheckIn.check_in_time >= start_date,
+            CheckIn.check_in_time < end_date + datetime.timedelta(days=1),
+        )
+        if user_id is not None:
+            query = query.filter(CheckIn.user_id == user_id)
+        checkins = query.all()
+    weekly_data = {}
+    for checkin in checkins:
+        if checkin.check_in_time and checkin.check_out_time:
+            hours = (checkin.check_out_time - checkin.check_in_time).total_seconds() / 3600
+            iso_year, iso_week, _ = checkin.check_in_time.isocalendar()
+            weekly_data[(iso_year, iso_week)] = weekly_data.get((iso_year, iso_week), 0) + hours
+    return weekly_data
+
+def _sync_sqlite_copy():
+    """Schreibvorgänge der App landen direkt in SQLite; außerhalb der App geänderte JSON-Daten hier nachziehen."""
+    from modules import migrate_to_sqlite
+    if migrate_to_sqlite.is_stale(JSON_DATA_FOLDER):
+        migrate_to_sqlite.migrate(JSON_DATA_FOLDER)
 
 def show_home_page():
     """Displays the home page content."""
     
     try:
-        # Using the context manager to handle session lifecycle
-        with get_db_session() as session:
-            # Try to use SQLAlchemy style querying first
-            try:
-                mitarbeiter_list = [u.name for u in session.query(User).all()]
-            except (AttributeError, TypeError):
-                # If that fails, assume we're using JSON implementation
-                mitarbeiter_list = [u.get('name', '') for u in session.users]
-            
-            # Just to confirm the list is being retrieved
-            print(mitarbeiter_list)
-        
         # Zeitraum-Filter
         start_date = st.date_input("Startdatum", datetime.date(2023, 1, 1))
         end_date = st.date_input("Enddatum", datetime.date(2023, 12, 31))
         
         # Mitarbeiter-Filter
         with get_db_session() as session:
-            try:
-                # Try SQLAlchemy style
-                mitarbeiter_list = [u.name for u in session.query(User).all()]
-            except (AttributeError, TypeError):
-                # JSON implementation
-                mitarbeiter_list = [u.get('name', '') for u in session.users]
-                
-            if mitarbeiter_list:
-                selected_user = st.selectbox("Mitarbeiter auswählen", mitarbeiter_list)
-            else:
-                st.warning("Keine Mitarbeiter gefunden.")
-                selected_user = None
+            users = session.query(User).all()
+        mitarbeiter_list = [u.name for u in users]
+            
+        if mitarbeiter_list:
+            selected_user = st.selectbox("Mitarbeiter auswählen", mitarbeiter_list)
+        else:
+            st.warning("Keine Mitarbeiter gefunden.")
+            selected_user = None
+        selected_user_id = next((u.id for u in users if u.name == selected_user), None)
         
-        # Daten aus der Datenbank holen
-        with get_db_session() as session:
-            try:
-                # Try SQLAlchemy style first
-                min_check_in = session.query(func.min(CheckIn.check_in_time)).filter(
-                    CheckIn.check_in_time.isnot(None)).scalar()
-                
-                # Wenn keine Daten vorhanden sind, auf 0 setzen
-                if not min_check_in:
-                    min_check_in = 0
-                
-                # Überprüfung auf None und sicherstellen, dass Berechnung möglich ist
-                if min_check_in and min_check_in != 0:
-                    total_hours = session.query(
-                        func.sum(func.extract('epoch', CheckIn.check_out_time - CheckIn.check_in_time) / 3600)
-                    ).scalar()
-                else:
-                    total_hours = 0
-                    
-            except (AttributeError, TypeError, NameError):
-                # JSON implementation
-                total_hours = 0
-                for entry in session.checkins:
-                    if entry.get('check_in_time') and entry.get('check_out_time'):
-                        try:
-                            check_in = datetime.datetime.fromisoformat(entry['check_in_time'])
-                            check_out = datetime.datetime.fromisoformat(entry['check_out_time'])
-                            hours = (check_out - check_in).total_seconds() / 3600
-                            total_hours += hours
-                        except (ValueError, TypeError):
-                            pass
+        # Stunden je (ISO-Jahr, ISO-Woche): JSON-Ablage aus dem gepflegten Rollup,
+        # SQLite über die indizierte Bereichsabfrage
+        if STORAGE_BACKEND == "sqlite":
+            _sync_sqlite_copy()
+            weekly_data = _weekly_hours_from_db(selected_user_id, start_date, end_date)
+        else:
+            weekly_data = weekly_hours(selected_user_id, start_date, end_date, data_folder=JSON_DATA_FOLDER)
+        total_hours = sum(weekly_data.values())
             
-            # Ergebnis anzeigen
-            st.metric("Gesamtstunden", f"{total_hours:.2f} Std." if total_hours else "0 Std.")
+        # Ergebnis anzeigen
+        st.metric("Gesamtstunden", f"{total_hours:.2f} Std." if total_hours else "0 Std.")
         
         # Diagramme
         st.subheader("📅 Arbeitszeiten pro Woche")
         
-        # Beispiel für ein Diagramm mit Plotly (Arbeitsstunden pro Woche)
-        with get_db_session() as session:
-            try:
-                # Try SQLAlchemy style first
-                weekly_hours = session.query(
-                    extract('week', CheckIn.check_in_time).label('week'),
-                    func.sum(func.extract('epoch', CheckIn.check_out_time - CheckIn.check_in_time) / 3600).label('hours')
-                ).group_by('week').order_by('week').all()
-                
-                weeks = [f"KW {int(week)}" for week, _ in weekly_hours]
-                hours = [round(hour, 2) for _, hour in weekly_hours]
-                
-            except (AttributeError, TypeError, NameError):
-                # JSON implementation
-                weekly_data = {}
-                for entry in session.checkins:
-                    if entry.get('check_in_time') and entry.get('check_out_time'):
-                        try:
-                            check_in = datetime.datetime.fromisoformat(entry['check_in_time'])
-                            check_out = datetime.datetime.fromisoformat(entry['check_out_time'])
-                            week_num = check_in.isocalendar()[1]  # Get ISO week number
-                            hours = (check_out - check_in).total_seconds() / 3600
-                            
-                            if week_num in weekly_data:
-                                weekly_data[week_num] += hours
-                            else:
-                                weekly_data[week_num] = hours
-                        except (ValueError, TypeError):
-                            pass
-                
-                # Sort by week number
-                sorted_weeks = sorted(weekly_data.keys())
-                weeks = [f"KW {week}" for week in sorted_weeks]
-                hours = [round(weekly_data[week], 2) for week in sorted_weeks]
+        # Sort by ISO year and week number
+        sorted_weeks = sorted(weekly_data.keys())
+        weeks = [f"KW {week}/{year}" for year, week in sorted_weeks]
+        hours = [round(weekly_data[week], 2) for week in sorted_weeks]
         
         if weeks and hours:
+            import plotly.graph_objects as go  # plotly erst für das Diagramm laden
             fig = go.Figure(data=[go.Bar(x=weeks, y=hours)])
             st.plotly_chart(fig)
         else:
@@ -0,0 +1,260 @@
+# modules/indexes.py
+"""
+Shared in-memory indexes over repository collections.
+
+A ``CollectionIndex`` wraps the repository's cached record list and builds
+indexes on demand:
+
+* hash indexes (value -> positions) for equality and IN lookups on fields
+  such as ``id``, ``user_id`` and ``status``,
+* sorted indexes (value, position) for range lookups on date fields.
+
+Indexes are shared by all sessions and kept per collection version. When a
+collection only grew (journal appends), the existing indexes are extended
+with the new records instead of being rebuilt.
+
+Values are read through ``FIELD_ALIASES`` (the stored records use several
+key spellings, e.g. ``check_in`` and ``check_in_time``) and normalized with
+``query.normalize_value`` so that dates compare chronologically.
+
+``SearchIndex`` serves the admin search boxes: word prefixes and character
+n-grams of a few text fields map to record positions, rebuilt per
+collection version.
+"""
+
+import bisect
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from modules.query import normalize_value
+
+HASH_FIELDS = {"id", "user_id", "status"}
+SORTED_FIELDS = {"check_in_time", "check_out_time", "start_date", "end_date", "date"}
+
+# Collection -> model field -> keys in the stored records (first match wins)
+FIELD_ALIASES = {
+    "time_entries": {
+        "check_in_time": ("check_in_time", "check_in"),
+        "check_out_time": ("check_out_time", "check_out"),
+        "notes": ("notes", "note"),
+    },
+    "vacation_requests": {
+        "end_date": ("end_date", "end"),
+        "reason": ("reason", "note"),
+    },
+    "sick_leaves": {
+        "date": ("date", "start_date"),
+        "end_date": ("end", "end_date"),
+    },
+}
+
+
+def field_value(record: Dict, field: str, aliases: Optional[Dict] = None) -> Any:
+    """Returns the normalized value of a model field from a stored record."""
+    for key in (aliases or {}).get(field, (field,)):
+        value = record.get(key)
+        if value is not None:
+            return normalize_value(value)
+    return None
+
+
+class CollectionIndex:
+    """Lazily built hash and sorted indexes over one record list."""
+
+    def __init__(self, records: List[Dict], aliases: Optional[Dict] = None):
+        self.records = records
+        self.aliases = aliases or {}
+        self.size = len(records)
+        self._hash: Dict[str, Dict[Any, List[int]]] = {}
+        self._sorted: Dict[str, Tuple[List[Any], List[int]]] = {}
+        self._lock = threading.Lock()
+
+    def value(self, position: int, field: str) -> Any:
+        return field_value(self.records[position], field, self.aliases)
+
+    def _hashable(self, value: Any) -> Any:
+        try:
+            hash(value)
+            return value
+        except TypeError:
+            return repr(value)
+
+    def hash_index(self, field: str) -> Dict[Any, List[int]]:
+        index = self._hash.get(field)
+        if index is None:
+            with self._lock:
+                index = self._hash.get(field)
+                if index is None:
+                    index = {}
+                    for position in range(self.size):
+                        index.setdefault(self._hashable(self.value(position, field)), []).append(position)
+                    self._hash[field] = index
+        return index
+
+    def sorted_index(self, field: str) -> Tuple[List[Any], List[int]]:
+        index = self._sorted.get(field)
+        if index is None:
+            with self._lock:
+                index = self._sorted.get(field)
+                if index is None:
+                    pairs = []
+                    for position in range(self.size):
+                        value = self.value(position, field)
+                        if value is not None:
+                            pairs.append((value, position))
+                    try:
+                        pairs.sort()
+                    except TypeError:
+                        # Gemischte Typen lassen sich nicht sortieren: kein Index
+                        pairs = None
+                    index = ([v for v, _ in pairs], [p for _, p in pairs]) if pairs is not None else None
+                    self._sorted[field] = index
+        return index
+
+    def extend(self):
+        """Adds records appended to the list since the index was built."""
+        with self._lock:
+            new_size = len(self.records)
+            for position in range(self.size, new_size):
+                for field, index in self._hash.items():
+                    index.setdefault(self._hashable(self.value(position, field)), []).append(position)
+                for field, index in self._sorted.items():
+                    if index is None:
+                        continue
+                    value = self.value(position, field)
+                    if value is None:
+                        continue
+                    keys, positions = index
+                    try:
+                        at = bisect.bisect_right(keys, value)
+                    except TypeError:
+                        self._sorted[field] = None
+                        continue
+                    keys.insert(at, value)
+                    positions.insert(at, position)
+            self.size = new_size
+
+    # --- Lookups ---
+    def lookup(self, field: str, values: Iterable[Any]) -> List[int]:
+        """Positions whose field equals one of ``values`` (ascending)."""
+        index = self.hash_index(field)
+        result = []
+        for value in set(values):
+            result.extend(index.get(self._hashable(value), ()))
+        return sorted(result)
+
+    def range(self, field: str, low=None, high=None,
+              include_low: bool = True, include_high: bool = True) -> Optional[List[int]]:
+        """Positions with ``low <= value <= high`` (bounds optional), or None if not indexable."""
+        index = self.sorted_index(field)
+        if index is None:
+            return None
+        keys, positions = index
+        try:
+            start = 0 if low is None else (
+                bisect.bisect_left(keys, low) if include_low else bisect.bisect_right(keys, low))
+            end = len(keys) if high is None else (
+                bisect.bisect_right(keys, high) if include_high else bisect.bisect_left(keys, high))
+        except TypeError:
+            return None
+        return positions[start:end]
+
+
+_indexes: Dict[Tuple[str, str], Tuple[int, CollectionIndex]] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(repository, collection: str) -> CollectionIndex:
+    """Returns the shared index for the current version of a collection."""
+    records, version = repository.snapshot(collection)
+    key = (repository.data_folder, collection)
+    with _indexes_lock:
+        entry = _indexes.get(key)
+        if entry is not None:
+            cached_version, index = entry
+            if cached_version == version and index.records is records:
+                return index
+            if index.records is records and len(records) >= index.size:
+                # Nur angehängt (Journal): vorhandene Indizes fortschreiben
+                index.extend()
+                _indexes[key] = (version, index)
+                return index
+        index = CollectionIndex(records, FIELD_ALIASES.get(collection))
+        _indexes[key] = (version, index)
+        return index
+
+
+# Collection -> fields searched by the admin search boxes
+SEARCH_FIELDS = {
+    "employees": ("name", "username", "email", "team", "location"),
+}
+
+_TOKEN = re.compile(r"\w+")
+NGRAM = 3
+
+
+class SearchIndex:
+    """
+    Case-insensitive substring search over a few text fields.
+
+    Every word prefix maps to the positions of the records containing it, so
+    prefix queries are one dict lookup. Every substring of up to ``NGRAM``
+    characters maps to its records as well: shorter queries are looked up
+    directly, longer ones intersect the lists of their n-grams and only the
+    remaining candidates are checked for the whole query. No query scans all
+    records. Prefix hits are returned first, then the other matches in
+    record order.
+    """
+
+    def __init__(self, records: List[Dict], fields: Iterable[str]):
+        self.records = records
+        self.texts = ["\n".join(str(record.get(field) or "") for field in fields).lower() for record in records]
+        self.prefixes: Dict[str, List[int]] = {}
+        self.ngrams: Dict[str, List[int]] = {}
+        for position, text in enumerate(self.texts):
+            seen = set()
+            for token in _TOKEN.findall(text):
+                for length in range(1, len(token) + 1):
+                    seen.add(token[:length])
+            for prefix in seen:
+                self.prefixes.setdefault(prefix, []).append(position)
+            grams = {text[i:i + n] for n in range(1, NGRAM + 1) for i in range(len(text) - n + 1)}
+            for gram in grams:
+                self.ngrams.setdefault(gram, []).append(position)
+
+    def _matches(self, query: str) -> List[int]:
+        """Positions of all records containing ``query``, in record order."""
+        if len(query) <= NGRAM:
+            return self.ngrams.get(query, [])
+        postings = sorted((self.ngrams.get(query[i:i + NGRAM], []) for i in range(len(query) - NGRAM + 1)),
+                          key=len)
+        if not postings[0]:
+            return []
+        candidates = set(postings[0]).intersection(*postings[1:])
+        return [i for i in sorted(candidates) if query in self.texts[i]]
+
+    def search(self, query: str) -> List[int]:
+        """Positions of the matching records (all records for an empty query)."""
+        query = (query or "").strip().lower()
+        if not query:
+            return list(range(len(self.records)))
+        prefix_hits = self.prefixes.get(query, []) if _TOKEN.fullmatch(query) else []
+        first = set(prefix_hits)
+        return list(prefix_hits) + [i for i in self._matches(query) if i not in first]
+
+
+_search_indexes: Dict[Tuple[str, str], Tuple[int, SearchIndex]] = {}
+
+
+def get_search_index(repository, collection: str) -> SearchIndex:
+    """Returns the shared search index for the current version of a collection."""
+    records, version = repository.snapshot(collection)
+    key = (repository.data_folder, collection)
+    with _indexes_lock:
+        entry = _search_indexes.get(key)
+        if entry is not None and entry[0] == version and entry[1].records is records:
+            return entry[1]
+        index = SearchIndex(records, SEARCH_FIELDS[collection])
+        _search_indexes[key] = (version, index)
+        return index
@@ -0,0 +1,169 @@
+# modules/journal.py
+"""
+Append-only JSONL journal for collections that grow with every punch.
+
+A journaled collection consists of the legacy JSON array file (e.g.
+``time_entries.json``) plus a ``.jsonl`` sidecar with one JSON object per
+line. New records are appended to the sidecar, so a write costs O(1)
+instead of rewriting the whole history. Readers replay the array first and
+the journal afterwards. A full rewrite (e.g. after editing an entry)
+compacts both back into the array file and removes the journal.
+
+Besides plain appends the journal can carry single-record edits: a line
+with ``"_op": "upsert"`` replaces the record with the same id (the full new
+record follows in the line), ``"_op": "delete"`` removes it. Replaying these
+lines is idempotent, so a journal that survives a compaction does no harm.
+
+All rewrites go through ``write_json_atomic``: the data is written to a
+temporary file in the same folder, fsynced and then renamed over the target,
+so readers never observe a truncated file.
+"""
+
+import os
+import json
+import tempfile
+from typing import List, Dict
+
+from modules.metrics import record_read, record_write
+
+OP_KEY = "_op"
+UPSERT = "upsert"
+DELETE = "delete"
+
+
+class CorruptFileError(ValueError):
+    """Raised when a data file exists but cannot be parsed."""
+
+
+def journal_path_for(array_path: str) -> str:
+    """Returns the path of the JSONL journal belonging to a JSON array file."""
+    return os.path.splitext(array_path)[0] + ".jsonl"
+
+
+def load_array(path: str) -> List[Dict]:
+    """
+    Loads a JSON array file. A missing or empty file is an empty collection,
+    anything else that does not parse raises CorruptFileError.
+    """
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        content = f.read()
+        record_read(path, os.fstat(f.fileno()).st_size)
+    if not content.strip():
+        return []
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError as e:
+        raise CorruptFileError(f"Error decoding JSON from {path}: {e}") from e
+
+
+def _write_atomic(path: str, dump):
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            dump(f)
+            f.flush()
+            os.fsync(f.fileno())
+            record_write(path, os.fstat(f.fileno()).st_size)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_json_atomic(path: str, data):
+    """Writes JSON to a temp file next to ``path`` and renames it into place."""
+    _write_atomic(path, lambda f: json.dump(data, f, indent=4, ensure_ascii=False))
+
+
+def write_jsonl_atomic(path: str, records: List[Dict]):
+    """Like write_json_atomic, but one record per line (journal format)."""
+    _write_atomic(path, lambda f: f.writelines(json.dumps(r, ensure_ascii=False) + "\n" for r in records))
+
+
+def read_journal(path: str) -> List[Dict]:
+    """Reads all records from a JSONL journal, skipping torn or empty lines."""
+    if not os.path.exists(path):
+        return []
+    records = []
+    with open(path, "r", encoding="utf-8") as f:
+        record_read(path, os.fstat(f.fileno()).st_size)
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                # Eine abgebrochene letzte Zeile (z. B. nach einem Absturz) wird ignoriert
+                print(f"Skipping unreadable journal line in {path}.")
+    return records
+
+
+def append_record(path: str, record: Dict):
+    """Appends a single record as one line to the journal."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(line)
+        f.flush()
+        os.fsync(f.fileno())
+    record_write(path, len(line.encode("utf-8")))
+
+
+def journal_op(op: str, record: Dict) -> Dict:
+    """Journal line for a single-record edit (UPSERT with the full record, DELETE with its id)."""
+    if op == DELETE:
+        return {OP_KEY: DELETE, "id": record["id"]}
+    return {OP_KEY: UPSERT, **record}
+
+
+def replay(records: List[Dict], journal: List[Dict]) -> List[Dict]:
+    """Applies journal lines (appends and edits) to ``records`` in order."""
+    if not journal:
+        return records
+    # Stirbt der Prozess zwischen Umbenennen und Löschen des Journals,
+    # stehen dessen Einträge bereits im Array und werden übersprungen.
+    known_ids = {r.get("id") for r in records if isinstance(r, dict) and r.get("id")}
+    positions = None
+    for line in journal:
+        op = line.get(OP_KEY)
+        if op is None:
+            if not line.get("id") or line.get("id") not in known_ids:
+                records.append(line)
+                if positions is not None and line.get("id"):
+                    positions[line["id"]] = len(records) - 1
+            continue
+        if positions is None:
+            positions = {r.get("id"): i for i, r in enumerate(records) if isinstance(r, dict) and r.get("id")}
+        record_id = line.get("id")
+        position = positions.get(record_id)
+        if op == UPSERT:
+            record = {k: v for k, v in line.items() if k != OP_KEY}
+            if position is None:
+                positions[record_id] = len(records)
+                records.append(record)
+            else:
+                records[position] = record
+        elif op == DELETE and position is not None:
+            records[position] = None
+            del positions[record_id]
+    return [r for r in records if r is not None]
+
+
+def load_journaled(array_path: str) -> List[Dict]:
+    """Loads the legacy array and replays the journal on top of it."""
+    return replay(load_array(array_path), read_journal(journal_path_for(array_path)))
+
+
+def compact(array_path: str, records: List[Dict]):
+    """Writes all records back into the array file and drops the journal."""
+    write_json_atomic(array_path, records)
+    journal = journal_path_for(array_path)
+    if os.path.exists(journal):
+        os.remove(journal)
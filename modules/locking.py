@@ -0,0 +1,60 @@
+# modules/locking.py
+"""
+Advisory per-collection locks.
+
+Each collection file gets its own lock, so writers of different collections
+never wait for each other. Within one process a re-entrant thread lock
+serialises the threads of all Streamlit sessions; across processes an
+``fcntl.flock`` on a ``.lock`` sidecar file does the same. Readers never take
+the lock: files are only ever replaced atomically, so a reader always sees
+either the old or the new version.
+"""
+
+import os
+import threading
+import contextlib
+
+try:
+    import fcntl
+except ImportError:  # Windows: nur der prozessinterne Lock greift
+    fcntl = None
+
+_guard = threading.Lock()
+_thread_locks = {}
+_held = {}
+
+
+def lock_path_for(path: str) -> str:
+    directory, name = os.path.split(path)
+    return os.path.join(directory, f".{os.path.splitext(name)[0]}.lock")
+
+
+def _thread_lock(key: str) -> threading.RLock:
+    with _guard:
+        lock = _thread_locks.get(key)
+        if lock is None:
+            lock = _thread_locks[key] = threading.RLock()
+        return lock
+
+
+@contextlib.contextmanager
+def collection_lock(path: str):
+    """Holds the exclusive write lock of the collection stored at ``path``."""
+    key = os.path.abspath(path)
+    with _thread_lock(key):
+        # Nur der äußerste Aufruf eines Threads nimmt den Datei-Lock
+        outer = _held.get(key, 0) == 0
+        _held[key] = _held.get(key, 0) + 1
+        fd = None
+        try:
+            if outer and fcntl is not None:
+                lock_file = lock_path_for(key)
+                os.makedirs(os.path.dirname(lock_file), exist_ok=True)
+                fd = os.open(lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            if fd is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+                os.close(fd)
+            _held[key] -= 1
@@ -1,13 +1,69 @@
 import streamlit as st
-import bcrypt
 import json
 import os
 from datetime import datetime, timedelta
 import uuid
 import re
+from modules.data_loader import DATA_FOLDER, load_employees, hash_password, check_password
+from modules.journal import write_json_atomic
+from modules.locking import collection_lock
 from modules.navigation import set_page
-
-# (Die restlichen Imports und globalen Variablen bleiben gleich)
+from modules.utils import add_employee, check_password as check_user_password, update_employee_password
+
+LOGIN_ATTEMPTS_FILE = os.path.join(DATA_FOLDER, "login_attempts.json")
+MAX_LOGIN_ATTEMPTS = 5
+LOCKOUT_MINUTES = 15
+
+# --- Anmeldeversuche ---
+def _load_login_attempts():
+    try:
+        with open(LOGIN_ATTEMPTS_FILE, "r", encoding="utf-8") as f:
+            attempts = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    return attempts if isinstance(attempts, dict) else {}
+
+def _update_login_attempts_file(mutate):
+    """Liest, ändert und schreibt die Anmeldeversuche unter dem Schreib-Lock."""
+    with collection_lock(LOGIN_ATTEMPTS_FILE):
+        attempts = _load_login_attempts()
+        mutate(attempts)
+        write_json_atomic(LOGIN_ATTEMPTS_FILE, attempts)
+
+def get_login_attempts(username):
+    """Gibt die Anmeldeversuche eines Benutzers zurück ({"attempts": n, "lockout_until": ISO-Zeit oder None})."""
+    entry = _load_login_attempts().get(username) or {}
+    return {"attempts": entry.get("attempts", 0), "lockout_until": entry.get("lockout_until")}
+
+def update_login_attempts(username, success=False):
+    """Zählt einen Fehlversuch (Sperre ab MAX_LOGIN_ATTEMPTS) oder setzt nach Erfolg zurück."""
+    if not username:
+        return
+    def _mutate(attempts):
+        if success:
+            attempts[username] = {"attempts": 0, "lockout_until": None}
+            return
+        count = attempts.get(username, {}).get("attempts", 0) + 1
+        lockout_until = None
+        if count >= MAX_LOGIN_ATTEMPTS:
+            lockout_until = (datetime.now() + timedelta(minutes=LOCKOUT_MINUTES)).isoformat()
+        attempts[username] = {"attempts": count, "lockout_until": lockout_until}
+    _update_login_attempts_file(_mutate)
+
+def reset_login_attempts(username):
+    if not username:
+        return False
+    _update_login_attempts_file(lambda attempts: attempts.update({username: {"attempts": 0, "lockout_until": None}}))
+    return True
+
+def verify_password(password, stored_hash):
+    """Prüft ein Passwort gegen den gespeicherten bcrypt-Hash (ungültige Hashes schlagen fehl)."""
+    if not password or not stored_hash:
+        return False
+    try:
+        return check_password(stored_hash, password)
+    except ValueError:
+        return False
 
 def reset_registration_form():
     st.session_state.reg_name = ""
@@ -67,7 +123,7 @@ def show_login():
                     employees = load_employees()
                     user = next((emp for emp in employees if emp.get("username") == username), None)
 
-                    if user and verify_password(password, user["password"]):
+                    if user and verify_password(password, user.get("password")):
                         # Erfolgreiche Anmeldung
                         update_login_attempts(username, success=True)
 
@@ -210,13 +266,47 @@ def show_login():
                         "created_at": datetime.now().isoformat()
                     }
 
-                    employees.append(new_user)
-                    if save_employees(employees):
+                    try:
+                        add_employee(new_user)
+                    except Exception as e:
+                        st.error(f"Fehler beim Speichern der Registrierung. Bitte versuchen Sie es später erneut. ({e})")
+                    else:
                         st.success("Registrierung erfolgreich! Sie können sich jetzt anmelden.")
                         st.button("Registrierungsformular zurücksetzen", on_click=reset_registration_form)
-                    else:
-                        st.error("Fehler beim Speichern der Registrierung. Bitte versuchen Sie es später erneut.")
 
             st.markdown('</div>', unsafe_allow_html=True)
 
-# (Der Aufruf von show_login() im Hauptskript bleibt wahrscheinlich gleich)
\ No newline at end of file
+def show_change_password():
+    """Passwortänderung für den angemeldeten Benutzer."""
+    st.title("🔑 Passwort ändern")
+    user = st.session_state.get("user")
+    if not user:
+        st.warning("Bitte melden Sie sich an.")
+        return
+
+    current_password = st.text_input("Aktuelles Passwort", type="password", key="current_password")
+    new_password = st.text_input("Neues Passwort", type="password", key="new_password")
+    confirm_password = st.text_input("Neues Passwort bestätigen", type="password", key="confirm_new_password")
+
+    if st.button("Passwort ändern", key="change_password_button"):
+        if not current_password or not new_password:
+            st.error("Bitte füllen Sie alle Felder aus.")
+        elif len(new_password) < 6:
+            st.error("Passwort muss mindestens 6 Zeichen lang sein.")
+        elif new_password != confirm_password:
+            st.error("Passwörter stimmen nicht überein.")
+        elif not check_user_password(user["id"], current_password):
+            st.error("Das aktuelle Passwort ist falsch.")
+        else:
+            update_employee_password(user["id"], new_password)
+            st.success("Passwort wurde geändert.")
+
+def show_admin_dashboard():
+    """Administrationsbereich (nur für Admins)."""
+    user = st.session_state.get("user")
+    if not user or user.get("role") != "Admin":
+        st.error("Keine Berechtigung für den Administrationsbereich.")
+        return
+    from modules.admin_page import show
+    show()
+
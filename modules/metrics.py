@@ -0,0 +1,268 @@
+# modules/metrics.py
+"""
+Opt-in instrumentation of script reruns.
+
+Enabled with the environment variable ``WORKTIME_METRICS=1`` (read at
+import). The app runs every rerun inside ``rerun(page)``; meanwhile the
+storage layer reports file reads and writes (``record_read`` /
+``record_write``, called from modules/journal.py and the partition
+manifest), and the JSON ``load_*``/``save_*`` helpers decorated with
+``@instrumented`` count their calls. At the end of the rerun one JSON line
+is appended to ``METRICS_FILE`` (rotated at ``METRICS_MAX_BYTES``)::
+
+    {"timestamp": "...", "session": "3f2a9c1e", "page": "Calendar",
+     "cause": "widget:urlaub_filter", "wall_ms": 84.2,
+     "reads": 3, "read_bytes": 51234, "writes": 0, "write_bytes": 0,
+     "calls": {"utils.load_employees": {"count": 2, "ms": 1.3}},
+     "duplicate_loads": ["utils.load_employees"]}
+
+The cause is the ``set_page`` call that requested the rerun
+(``page:<name>``), otherwise the keyed widgets whose value changed since
+the end of the previous rerun (``widget:<key>``). Widgets without a key are not part
+of the session state; such reruns are reported as ``unbekannt``.
+
+When disabled, ``instrumented`` returns the function unchanged and the
+hooks return after a single attribute lookup.
+"""
+
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import date, datetime
+from logging.handlers import RotatingFileHandler
+from typing import Dict, List, Optional
+
+METRICS_ENV = "WORKTIME_METRICS"
+METRICS_FILE = os.path.join("data", "metrics", "reruns.jsonl")
+METRICS_MAX_BYTES = 5 * 2 ** 20
+METRICS_BACKUPS = 3
+
+# Schlüssel im Session State (werden beim Widget-Vergleich übersprungen)
+CAUSE_KEY = "_metrics_cause"
+SESSION_KEY = "_metrics_session"
+WIDGETS_KEY = "_metrics_widgets"
+UNKNOWN_CAUSE = "unbekannt"
+FIRST_RUN_CAUSE = "start"
+
+ENABLED = os.environ.get(METRICS_ENV, "").strip().lower() not in ("", "0", "false", "no")
+
+_SIMPLE_TYPES = (str, int, float, bool, type(None), date)
+
+_local = threading.local()
+_logger: Optional[logging.Logger] = None
+_logger_lock = threading.Lock()
+
+
+class RerunMetrics:
+    """Counters of one rerun."""
+
+    def __init__(self, page: str, cause: str, session: str):
+        self.page = page
+        self.cause = cause
+        self.session = session
+        self.started = time.perf_counter()
+        self.reads = 0
+        self.read_bytes = 0
+        self.writes = 0
+        self.write_bytes = 0
+        self.calls: Dict[str, Dict] = {}
+
+    def add_call(self, name: str, seconds: float):
+        call = self.calls.setdefault(name, {"count": 0, "ms": 0.0})
+        call["count"] += 1
+        call["ms"] += seconds * 1000
+
+    def to_record(self) -> Dict:
+        return {
+            "timestamp": datetime.now().isoformat(timespec="milliseconds"),
+            "session": self.session,
+            "page": self.page,
+            "cause": self.cause,
+            "wall_ms": round((time.perf_counter() - self.started) * 1000, 3),
+            "reads": self.reads,
+            "read_bytes": self.read_bytes,
+            "writes": self.writes,
+            "write_bytes": self.write_bytes,
+            "calls": {name: {"count": c["count"], "ms": round(c["ms"], 3)} for name, c in self.calls.items()},
+            "duplicate_loads": sorted(name for name, c in self.calls.items()
+                                      if c["count"] > 1 and name.rsplit(".", 1)[-1].startswith("load_")),
+        }
+
+
+# --- Hooks der Ablage ---
+def record_read(path: str, nbytes: int):
+    rerun = getattr(_local, "rerun", None)
+    if rerun is not None:
+        rerun.reads += 1
+        rerun.read_bytes += nbytes
+
+
+def record_write(path: str, nbytes: int):
+    rerun = getattr(_local, "rerun", None)
+    if rerun is not None:
+        rerun.writes += 1
+        rerun.write_bytes += nbytes
+
+
+def instrumented(func):
+    """Counts calls and time of ``func`` per rerun (no-op unless enabled)."""
+    if not ENABLED:
+        return func
+    name = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        rerun = getattr(_local, "rerun", None)
+        if rerun is None:
+            return func(*args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            rerun.add_call(name, time.perf_counter() - started)
+    return wrapper
+
+
+# --- Rerun ---
+def note_navigation(page_name: str):
+    """Remembers that the next rerun was requested by ``set_page(page_name)``."""
+    if ENABLED:
+        import streamlit as st
+        st.session_state[CAUSE_KEY] = f"page:{page_name}"
+
+
+def _widget_values(session_state) -> Dict:
+    values = {}
+    for key in list(session_state.keys()):
+        if isinstance(key, str) and key.startswith("_metrics"):
+            continue
+        value = session_state[key]
+        if isinstance(value, _SIMPLE_TYPES) or (
+                isinstance(value, (list, tuple)) and all(isinstance(v, _SIMPLE_TYPES) for v in value)):
+            values[key] = value
+    return values
+
+
+def _rerun_cause(session_state) -> str:
+    """Compares the widget values with those at the end of the previous rerun."""
+    values = _widget_values(session_state)
+    previous = session_state.get(WIDGETS_KEY)
+    # Ersatz, falls der Lauf mit st.stop() endet (danach ist der Session State gesperrt)
+    session_state[WIDGETS_KEY] = values
+    cause = session_state.get(CAUSE_KEY)
+    if cause:
+        del session_state[CAUSE_KEY]
+        return cause
+    if previous is None:
+        return FIRST_RUN_CAUSE
+    # Neu erschienene Widgets zählen nur, wenn sie gerade geklickt bzw. angehakt wurden
+    changed = [key for key, value in values.items()
+               if (previous[key] != value if key in previous else value is True)]
+    # Ein im letzten Lauf geklickter Button springt wieder auf False zurück
+    clicked = [key for key in changed if not (previous.get(key) is True and values[key] is False)]
+    changed = clicked or changed
+    return ",".join(f"widget:{key}" for key in sorted(map(str, changed))) or UNKNOWN_CAUSE
+
+
+def _metrics_logger() -> logging.Logger:
+    global _logger
+    with _logger_lock:
+        if _logger is None:
+            os.makedirs(os.path.dirname(METRICS_FILE), exist_ok=True)
+            handler = RotatingFileHandler(METRICS_FILE, maxBytes=METRICS_MAX_BYTES, backupCount=METRICS_BACKUPS,
+                                          encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger = logging.getLogger("worktime.metrics")
+            logger.setLevel(logging.INFO)
+            logger.propagate = False  # nicht zusätzlich in app.log
+            logger.addHandler(handler)
+            _logger = logger
+        return _logger
+
+
+@contextmanager
+def rerun(page: str):
+    """Measures the enclosed script run (also when it ends with st.rerun() or st.stop())."""
+    if not ENABLED or getattr(_local, "rerun", None) is not None:
+        yield
+        return
+    import streamlit as st
+    from streamlit.runtime.scriptrunner import StopException
+    session_state = st.session_state
+    if SESSION_KEY not in session_state:
+        session_state[SESSION_KEY] = uuid.uuid4().hex[:8]
+    current = RerunMetrics(str(page), _rerun_cause(session_state), session_state[SESSION_KEY])
+    _local.rerun = current
+    try:
+        yield current
+    finally:
+        _local.rerun = None
+        _metrics_logger().info(json.dumps(current.to_record(), ensure_ascii=False))
+        try:
+            session_state[WIDGETS_KEY] = _widget_values(session_state)
+        except StopException:
+            pass
+
+
+# --- Auswertung ---
+def load_records(path: str = METRICS_FILE, backups: int = METRICS_BACKUPS) -> List[Dict]:
+    """All stored reruns, oldest rotated file first."""
+    records = []
+    for candidate in [f"{path}.{i}" for i in range(backups, 0, -1)] + [path]:
+        if not os.path.exists(candidate):
+            continue
+        with open(candidate, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    return records
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100) of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+def page_summary(records: List[Dict]) -> List[Dict]:
+    """Per page: reruns, p50/p95 wall time and mean I/O per rerun."""
+    pages: Dict[str, List[Dict]] = {}
+    for record in records:
+        pages.setdefault(record.get("page", "?"), []).append(record)
+    summary = []
+    for page, runs in sorted(pages.items()):
+        wall = [r.get("wall_ms", 0.0) for r in runs]
+        summary.append({
+            "Seite": page,
+            "Reruns": len(runs),
+            "p50 (ms)": round(percentile(wall, 50), 1),
+            "p95 (ms)": round(percentile(wall, 95), 1),
+            "Lesezugriffe/Rerun": round(sum(r.get("reads", 0) for r in runs) / len(runs), 2),
+            "Gelesen (KiB)/Rerun": round(sum(r.get("read_bytes", 0) for r in runs) / len(runs) / 1024, 1),
+            "Schreibzugriffe/Rerun": round(sum(r.get("writes", 0) for r in runs) / len(runs), 2),
+            "Reruns mit Mehrfachladen": sum(1 for r in runs if r.get("duplicate_loads")),
+        })
+    return summary
+
+
+def duplicate_load_summary(records: List[Dict]) -> List[Dict]:
+    """Functions loaded more than once within a rerun: affected reruns and calls."""
+    totals: Dict[tuple, Dict] = {}
+    for record in records:
+        for name in record.get("duplicate_loads", []):
+            entry = totals.setdefault((record.get("page", "?"), name), {"reruns": 0, "calls": 0})
+            entry["reruns"] += 1
+            entry["calls"] += record.get("calls", {}).get(name, {}).get("count", 0)
+    return [
+        {"Seite": page, "Funktion": name, "Reruns": entry["reruns"],
+         "Aufrufe je Rerun": round(entry["calls"] / entry["reruns"], 1)}
+        for (page, name), entry in sorted(totals.items(), key=lambda item: -item[1]["reruns"])
+    ]
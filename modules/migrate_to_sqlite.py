@@ -0,0 +1,182 @@
+# modules/migrate_to_sqlite.py
+"""
+Importiert die JSON-Dateien des data-Ordners in die SQLite-Datenbank.
+
+Aufruf:
+    python -m modules.migrate_to_sqlite [--data data] [--db data/worktime.db]
+
+Die JSON-Dateien bleiben die führende Ablage. Jeder Aufruf gleicht die
+Datenbank vollständig neu ab (auch in JSON gelöschte Einträge verschwinden)
+und merkt sich die Signaturen der JSON-Sammlungen; ``is_stale()`` meldet, ob
+seitdem außerhalb der App etwas geschrieben wurde. Einträge ohne ID erhalten
+eine aus ihrem Inhalt abgeleitete, stabile ID.
+
+Mit WORKTIME_STORAGE=sqlite ruft das Repository nach jedem Schreibvorgang
+``mirror_write()`` auf: die betroffene Tabelle wird in derselben
+Schreiboperation abgeglichen (ein angehängter Eintrag wird einzeln
+eingefügt), ein manueller Abgleich ist dann nicht nötig.
+"""
+
+import os
+import json
+import uuid
+import argparse
+from typing import Dict, List, Optional, Tuple
+
+from modules.repository import Repository, get_repository
+from modules.models_json import User, CheckIn, VacationRequest, SickLeave
+from modules import models_sqlite
+
+
+# JSON-Sammlungen, aus denen die Datenbank befüllt wird
+SOURCE_COLLECTIONS = ("users", "employees", "time_entries", "vacation_requests", "sick_leaves")
+
+
+def _signatures(repository: Repository) -> Dict[str, str]:
+    return {name: json.dumps(repository.signature(name)) for name in SOURCE_COLLECTIONS}
+
+
+def is_stale(data_folder: str = models_sqlite.DATA_FOLDER, database: Optional[str] = None) -> bool:
+    """True if a JSON collection changed since the last migrate() (or none ran yet)."""
+    connection = models_sqlite.connect(database)
+    try:
+        stored = dict(connection.execute("SELECT collection, signature FROM sync_state").fetchall())
+    finally:
+        connection.close()
+    return stored != _signatures(get_repository(data_folder))
+
+
+def _stable_id(record: Dict) -> str:
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, json.dumps(record, sort_keys=True, ensure_ascii=False)))
+
+
+def _convert(model_class, record: Dict):
+    obj = model_class.from_dict(record)
+    if not obj.id:
+        obj.id = _stable_id(record)
+    return obj
+
+
+def _users(repository: Repository) -> Tuple[List[User], int]:
+    """Users and employees share the users table (employees win on equal ids)."""
+    users, skipped = {}, 0
+    for record in repository.load("users") + repository.load("employees"):
+        if record.get("id") is None:
+            skipped += 1
+            continue
+        users[str(record["id"])] = _user(record)
+    return list(users.values()), skipped
+
+
+def _user(record: Dict) -> User:
+    return User(
+        id=str(record["id"]),
+        user_id=record.get("user_id") or record.get("username"),
+        name=record.get("name"),
+        email=record.get("email"),
+        password=record.get("password"),
+        role=record.get("role", "Mitarbeiter"),
+    )
+
+
+# JSON-Sammlung -> Modellklasse ihrer Tabelle
+MODELS = {
+    "users": User,
+    "employees": User,
+    "time_entries": CheckIn,
+    "vacation_requests": VacationRequest,
+    "sick_leaves": SickLeave,
+}
+
+
+def _objects(repository: Repository, name: str) -> Tuple[List, int]:
+    """Model objects of the table that ``name`` feeds, and the number of skipped records."""
+    if MODELS[name] is User:
+        return _users(repository)
+    objects, skipped = [], 0
+    for record in repository.load(name):
+        try:
+            objects.append(_convert(MODELS[name], record))
+        except (ValueError, TypeError, AttributeError):
+            skipped += 1
+    return objects, skipped
+
+
+def _store_signatures(session, signatures: Dict[str, str]):
+    session.connection.executemany("INSERT OR REPLACE INTO sync_state (collection, signature) VALUES (?, ?)",
+                                   signatures.items())
+
+
+def migrate(data_folder: str = models_sqlite.DATA_FOLDER, database: Optional[str] = None) -> Dict[str, int]:
+    """Replaces the SQLite contents with the users/employees, time entries, vacation requests and sick leaves."""
+    repository = Repository(data_folder)
+    signatures = _signatures(repository)
+    counts = {"users": 0, "checkins": 0, "vacation_requests": 0, "sick_leaves": 0, "skipped": 0}
+    objects = []
+    for name, key in (("users", "users"), ("time_entries", "checkins"),
+                      ("vacation_requests", "vacation_requests"), ("sick_leaves", "sick_leaves")):
+        table_objects, skipped = _objects(repository, name)
+        objects.extend(table_objects)
+        counts[key] = len(table_objects)
+        counts["skipped"] += skipped
+
+    session = models_sqlite.SQLiteSession(database)
+    try:
+        # Ein Abgleich in einer Transaktion: Leser sehen den alten oder den neuen Stand
+        for table, _, _ in models_sqlite.TABLES.values():
+            session.connection.execute(f"DELETE FROM {table}")
+        session.add_all(objects)
+        session.connection.execute("DELETE FROM sync_state")
+        _store_signatures(session, signatures)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+    return counts
+
+
+def mirror_write(repository: Repository, name: str, record: Optional[Dict] = None):
+    """
+    Applies a write of collection ``name`` to the SQLite copy of the models'
+    data folder: ``record`` is a single appended record, otherwise the
+    table fed by ``name`` is replaced. Other data folders are ignored.
+
+    Runs inside the repository's write path (under the collection lock); the
+    table and the stored signature change in one transaction.
+    """
+    if name not in MODELS or os.path.abspath(repository.data_folder) != os.path.abspath(models_sqlite.DATA_FOLDER):
+        return
+    if record is None:
+        objects, _ = _objects(repository, name)
+    elif MODELS[name] is User:
+        objects = [_user(record)] if record.get("id") is not None else []
+    else:
+        objects = [_convert(MODELS[name], record)]
+    session = models_sqlite.SQLiteSession()
+    try:
+        if record is None:
+            session.connection.execute(f"DELETE FROM {models_sqlite.TABLES[MODELS[name]][0]}")
+        session.add_all(objects)
+        _store_signatures(session, {name: json.dumps(repository.signature(name))})
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON-Daten in die SQLite-Datenbank importieren")
+    parser.add_argument("--data", default=models_sqlite.DATA_FOLDER, help="Ordner mit den JSON-Dateien")
+    parser.add_argument("--db", default=models_sqlite.DATABASE_FILE, help="Pfad der SQLite-Datenbank")
+    args = parser.parse_args()
+    counts = migrate(args.data, args.db)
+    for key, value in counts.items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
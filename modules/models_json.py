@@ -9,6 +9,9 @@ import json
 from datetime import datetime
 from typing import List, Dict, Optional, Generator, Any
 import contextlib
+from modules.repository import get_repository
+from modules.query import Field, Predicate, as_ordering
+from modules.indexes import FIELD_ALIASES, HASH_FIELDS, SORTED_FIELDS, field_value, get_index
 
 # Data folder and file paths
 DATA_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
@@ -36,74 +39,257 @@ def _save_json(file_path: str, data: List[Dict]):
     with open(file_path, 'w', encoding='utf-8') as f:
         json.dump(data, f, indent=4, ensure_ascii=False)
 
+# Session attribute -> repository collection
+SESSION_COLLECTIONS = {
+    "users": "users",
+    "checkins": "time_entries",
+    "vacation_requests": "vacation_requests",
+    "sick_leaves": "sick_leaves",
+}
+
 # Session class to mimic SQLAlchemy session behavior
 class JSONSession:
+    """
+    Collections are loaded lazily on first access (``session.users`` etc.) and
+    only collections that changed are written on commit. Objects passed to
+    add() are appended individually (a single journal line for check-ins);
+    a collection modified in place must be flagged with mark_dirty(), which
+    makes commit() rewrite it completely.
+    """
+
     def __init__(self):
-        self.users = _load_json(USERS_FILE)
-        self.checkins = _load_json(CHECKINS_FILE)
-        self.vacation_requests = _load_json(VACATION_REQUESTS_FILE)
-        self.sick_leaves = _load_json(SICK_LEAVES_FILE)
-        self.changes = False
+        self.repository = get_repository(DATA_FOLDER)
+        self._pending = {name: [] for name in SESSION_COLLECTIONS}
+        self._dirty = set()
+    
+    def __getattr__(self, name):
+        # Wird nur für noch nicht geladene Attribute aufgerufen
+        if name in SESSION_COLLECTIONS:
+            # Vor dem ersten Zugriff mit add() hinzugefügte Einträge gehören dazu
+            data = self.repository.load(SESSION_COLLECTIONS[name]) + self._pending[name]
+            setattr(self, name, data)
+            return data
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    @property
+    def changes(self):
+        return bool(self._dirty) or any(self._pending.values())
+
+    def mark_dirty(self, name):
+        """Flag a collection (e.g. "checkins") that was modified in place."""
+        if name not in SESSION_COLLECTIONS:
+            raise KeyError(name)
+        self._dirty.add(name)
     
+    def _query(self, name, query_class, model_class):
+        collection = SESSION_COLLECTIONS[name]
+        if name in self._dirty or self._pending[name]:
+            # Ungespeicherte Änderungen: die eigene Kopie durchsuchen
+            return query_class(getattr(self, name), model_class, aliases=FIELD_ALIASES.get(collection))
+        index = get_index(self.repository, collection)
+        return query_class(index.records, model_class, index=index)
+
     def query(self, model_class):
         """Simulate SQLAlchemy query functionality."""
         if model_class == User:
-            return UserQuery(self.users)
+            return self._query("users", UserQuery, User)
         elif model_class == CheckIn:
-            return CheckInQuery(self.checkins)
+            return self._query("checkins", CheckInQuery, CheckIn)
         elif model_class == VacationRequest:
-            return VacationRequestQuery(self.vacation_requests)
+            return self._query("vacation_requests", VacationRequestQuery, VacationRequest)
         elif model_class == SickLeave:
-            return SickLeaveQuery(self.sick_leaves)
+            return self._query("sick_leaves", SickLeaveQuery, SickLeave)
         return None
     
     def add(self, obj):
         """Add a new object to the session."""
         if isinstance(obj, User):
-            self.users.append(obj.to_dict())
+            name = "users"
         elif isinstance(obj, CheckIn):
-            self.checkins.append(obj.to_dict())
+            name = "checkins"
         elif isinstance(obj, VacationRequest):
-            self.vacation_requests.append(obj.to_dict())
+            name = "vacation_requests"
         elif isinstance(obj, SickLeave):
-            self.sick_leaves.append(obj.to_dict())
-        self.changes = True
+            name = "sick_leaves"
+        else:
+            return
+        record = obj.to_dict()
+        self._pending[name].append(record)
+        # Eine bereits geladene Collection sieht den neuen Eintrag sofort
+        if name in self.__dict__:
+            self.__dict__[name].append(record)
     
     def commit(self):
-        """Commit changes to JSON files."""
-        if self.changes:
-            _save_json(USERS_FILE, self.users)
-            _save_json(CHECKINS_FILE, self.checkins)
-            _save_json(VACATION_REQUESTS_FILE, self.vacation_requests)
-            _save_json(SICK_LEAVES_FILE, self.sick_leaves)
-            self.changes = False
+        """Commit changes to JSON files (only the collections that changed)."""
+        for name, collection in SESSION_COLLECTIONS.items():
+            if name in self._dirty:
+                self.repository.save(collection, getattr(self, name))
+            else:
+                for record in self._pending[name]:
+                    self.repository.append(collection, record)
+            self._pending[name] = []
+        self._dirty.clear()
     
     def close(self):
         """Close the session."""
         pass
 
 # Base query classes to mimic SQLAlchemy query behavior
+def _matches(value, predicate: Predicate) -> bool:
+    """Evaluates one predicate against a normalized record value."""
+    op, expected = predicate.op, predicate.value
+    if op == "is":
+        return value is expected if expected is None else value == expected
+    if op == "is not":
+        return value is not expected if expected is None else value != expected
+    if op == "==":
+        return value == expected
+    if op == "!=":
+        return value != expected
+    if op == "in":
+        return value in expected
+    if value is None:
+        return False
+    try:
+        if op == "between":
+            return expected[0] <= value <= expected[1]
+        if op == "<":
+            return value < expected
+        if op == "<=":
+            return value <= expected
+        if op == ">":
+            return value > expected
+        return value >= expected
+    except TypeError:
+        return False
+
+
 class BaseQuery:
-    def __init__(self, data):
+    """
+    Evaluates predicates (see modules/query.py) against the stored records.
+
+    With an ``index`` (shared CollectionIndex over ``data``) equality, IN and
+    range predicates on indexed fields narrow the candidates first; all other
+    predicates are checked on those candidates only. Without an index (the
+    session holds uncommitted changes) every record is scanned.
+    """
+
+    def __init__(self, data, model_class=None, index=None, aliases=None):
         self.data = data
+        self.model_class = model_class
+        self.index = index
+        self.aliases = index.aliases if index is not None else (aliases or {})
         self.filters = []
+        self.orderings = []
+        self._limit = None
+        self._offset = 0
     
-    def filter(self, condition):
-        """Add a filter condition."""
-        self.filters.append(condition)
+    def filter(self, *conditions):
+        """Add one or more predicates (combined with AND)."""
+        for condition in conditions:
+            if not isinstance(condition, Predicate):
+                raise TypeError(f"Ungültige Filterbedingung: {condition!r}")
+        self.filters.extend(conditions)
+        return self
+
+    def filter_by(self, **values):
+        """Add equality predicates given as keyword arguments."""
+        for field, value in values.items():
+            self.filters.append(Predicate(field, "is" if value is None else "==", value))
+        return self
+
+    def order_by(self, *fields):
+        """Sort by one or more fields (Field, field.desc() or field name)."""
+        self.orderings.extend(as_ordering(f) for f in fields)
         return self
+
+    def limit(self, count: int):
+        self._limit = count
+        return self
+
+    def offset(self, count: int):
+        self._offset = count or 0
+        return self
+
+    def _value(self, position: int, field: str):
+        return field_value(self.data[position], field, self.aliases)
+
+    def _index_lookup(self, predicate: Predicate):
+        """Positions for an indexable predicate, or None if it must be scanned."""
+        index, field, op, value = self.index, predicate.field, predicate.op, predicate.value
+        if field in HASH_FIELDS:
+            if op == "==" or (op == "is" and value is not None):
+                return index.lookup(field, (value,))
+            if op == "in":
+                return index.lookup(field, value)
+        if field in SORTED_FIELDS:
+            if op == "between":
+                return index.range(field, value[0], value[1])
+            if op in ("<", "<="):
+                return index.range(field, high=value, include_high=op == "<=")
+            if op in (">", ">="):
+                return index.range(field, low=value, include_low=op == ">=")
+            if op == "==" and value is not None:
+                return index.range(field, value, value)
+        return None
+
+    def _positions(self) -> List[int]:
+        candidates = None
+        residual = []
+        for predicate in self.filters:
+            found = self._index_lookup(predicate) if self.index is not None else None
+            if found is None:
+                residual.append(predicate)
+            elif candidates is None:
+                candidates = set(found)
+            else:
+                candidates.intersection_update(found)
+        if candidates is None:
+            positions = range(len(self.data))
+        else:
+            positions = sorted(candidates)
+        if not residual:
+            return list(positions)
+        return [p for p in positions
+                if all(_matches(self._value(p, pred.field), pred) for pred in residual)]
+
+    def _matching(self) -> List[Dict]:
+        positions = self._positions()
+        # Stabile Sortierung, letzte Sortierung zuerst; None-Werte ans Ende
+        for ordering in reversed(self.orderings):
+            values = {p: self._value(p, ordering.field) for p in positions}
+            present = [p for p in positions if values[p] is not None]
+            missing = [p for p in positions if values[p] is None]
+            try:
+                present.sort(key=values.__getitem__, reverse=ordering.descending)
+            except TypeError:
+                present.sort(key=lambda p: str(values[p]), reverse=ordering.descending)
+            positions = present + missing
+        end = None if self._limit is None else self._offset + self._limit
+        return [self.data[p] for p in positions[self._offset:end]]
     
     def all(self):
         """Return all matching items."""
-        result = self.data
-        # Apply filters (simplified)
+        result = self._matching()
+        if self.model_class is not None:
+            return [self.model_class.from_dict(item) for item in result]
         return result
     
     def first(self):
         """Return first matching item or None."""
-        items = self.all()
+        previous = self._limit
+        self._limit = 1
+        try:
+            items = self.all()
+        finally:
+            self._limit = previous
         return items[0] if items else None
 
+    def count(self) -> int:
+        if self.orderings or self._limit is not None or self._offset:
+            return len(self._matching())
+        return len(self._positions())
+
 # Query classes for each model
 class UserQuery(BaseQuery):
     pass
@@ -119,6 +305,13 @@ class SickLeaveQuery(BaseQuery):
 
 # Model classes to mimic SQLAlchemy models
 class User:
+    id = Field()
+    user_id = Field()
+    name = Field()
+    email = Field()
+    password = Field()
+    role = Field()
+
     def __init__(self, id=None, user_id=None, name=None, email=None, password=None, role="Mitarbeiter"):
         self.id = id
         self.user_id = user_id
@@ -149,6 +342,14 @@ class User:
         )
 
 class CheckIn:
+    id = Field()
+    user_id = Field()
+    check_in_time = Field()
+    check_out_time = Field()
+    location = Field()
+    action = Field()
+    notes = Field()
+
     def __init__(self, id=None, user_id=None, check_in_time=None, check_out_time=None, location=None, action=None, notes=None):
         self.id = id
         self.user_id = user_id
@@ -171,24 +372,36 @@ class CheckIn:
     
     @classmethod
     def from_dict(cls, data):
+        # Einträge der Check-in-Seite verwenden "check_in"/"check_out"/"note"
+        check_in = data.get("check_in_time") or data.get("check_in")
+        check_out = data.get("check_out_time") or data.get("check_out")
         return cls(
             id=data.get("id"),
             user_id=data.get("user_id"),
-            check_in_time=datetime.fromisoformat(data["check_in_time"]) if data.get("check_in_time") else None,
-            check_out_time=datetime.fromisoformat(data["check_out_time"]) if data.get("check_out_time") else None,
+            check_in_time=datetime.fromisoformat(check_in) if check_in else None,
+            check_out_time=datetime.fromisoformat(check_out) if check_out else None,
             location=data.get("location"),
             action=data.get("action"),
-            notes=data.get("notes")
+            notes=data.get("notes", data.get("note"))
         )
 
 class VacationRequest:
-    def __init__(self, id=None, user_id=None, start_date=None, end_date=None, reason=None, approved=False):
+    id = Field()
+    user_id = Field()
+    start_date = Field()
+    end_date = Field()
+    reason = Field()
+    approved = Field()
+    status = Field()
+
+    def __init__(self, id=None, user_id=None, start_date=None, end_date=None, reason=None, approved=False, status=None):
         self.id = id
         self.user_id = user_id
         self.start_date = start_date
         self.end_date = end_date
         self.reason = reason
         self.approved = approved
+        self.status = status or ("approved" if approved else "pending")
     
     def to_dict(self):
         return {
@@ -197,25 +410,35 @@ class VacationRequest:
             "start_date": self.start_date.isoformat() if self.start_date else None,
             "end_date": self.end_date.isoformat() if self.end_date else None,
             "reason": self.reason,
-            "approved": self.approved
+            "approved": self.approved,
+            "status": self.status
         }
     
     @classmethod
     def from_dict(cls, data):
+        end = data.get("end_date") or data.get("end")
         return cls(
             id=data.get("id"),
             user_id=data.get("user_id"),
             start_date=datetime.fromisoformat(data["start_date"]) if data.get("start_date") else None,
-            end_date=datetime.fromisoformat(data["end_date"]) if data.get("end_date") else None,
-            reason=data.get("reason"),
-            approved=data.get("approved", False)
+            end_date=datetime.fromisoformat(end) if end else None,
+            reason=data.get("reason", data.get("note")),
+            approved=data.get("approved", data.get("status") == "approved"),
+            status=data.get("status")
         )
 
 class SickLeave:
-    def __init__(self, id=None, user_id=None, date=None, note=None):
+    id = Field()
+    user_id = Field()
+    date = Field()
+    end_date = Field()
+    note = Field()
+
+    def __init__(self, id=None, user_id=None, date=None, note=None, end_date=None):
         self.id = id
         self.user_id = user_id
         self.date = date
+        self.end_date = end_date
         self.note = note
     
     def to_dict(self):
@@ -223,15 +446,20 @@ class SickLeave:
             "id": self.id,
             "user_id": self.user_id,
             "date": self.date.isoformat() if self.date else None,
+            "end": self.end_date.isoformat() if self.end_date else None,
             "note": self.note
         }
     
     @classmethod
     def from_dict(cls, data):
+        # Krankmeldungen kommen als "date"/"end" oder "start_date"/"end_date" vor
+        start = data.get("date") or data.get("start_date")
+        end = data.get("end") or data.get("end_date")
         return cls(
             id=data.get("id"),
             user_id=data.get("user_id"),
-            date=datetime.fromisoformat(data["date"]) if data.get("date") else None,
+            date=datetime.fromisoformat(start) if start else None,
+            end_date=datetime.fromisoformat(end) if end else None,
             note=data.get("note")
         )
 
@@ -0,0 +1,300 @@
+"""
+models_sqlite.py - SQLite storage engine for the model classes
+This module stores users, check-ins, vacation requests and sick leaves in a
+SQLite database (WAL mode) using only the standard library. It offers the same
+get_db_session() contract as models_json.py, and the queries accept the same
+predicates (see modules/query.py), but filters, ordering and limits are
+executed by SQLite on indexed columns instead of scanning every record.
+
+The JSON files stay the primary store: the pages write through modules/utils
+and the repository, which applies each write to this database in the same
+write path when the SQLite backend is selected (see
+modules/migrate_to_sqlite.py). ``sync_state`` holds the signature of every
+JSON collection as last applied, so readers can tell when files were changed
+outside the app and a full re-sync is needed.
+"""
+
+import os
+import uuid
+import sqlite3
+import threading
+import contextlib
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from modules.models_json import User, CheckIn, VacationRequest, SickLeave
+from modules.query import Predicate, as_ordering, normalize_value
+
+# Data folder and database path
+DATA_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+DATABASE_FILE = os.environ.get("WORKTIME_DB", os.path.join(DATA_FOLDER, "worktime.db"))
+
+# Model class -> (table, columns, datetime columns)
+TABLES = {
+    User: ("users", ["id", "user_id", "name", "email", "password", "role"], set()),
+    CheckIn: ("checkins", ["id", "user_id", "check_in_time", "check_out_time", "location", "action", "notes"],
+              {"check_in_time", "check_out_time"}),
+    VacationRequest: ("vacation_requests", ["id", "user_id", "start_date", "end_date", "reason", "approved", "status"],
+                      {"start_date", "end_date"}),
+    SickLeave: ("sick_leaves", ["id", "user_id", "date", "end_date", "note"], {"date", "end_date"}),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    user_id TEXT,
+    name TEXT,
+    email TEXT,
+    password TEXT,
+    role TEXT DEFAULT 'Mitarbeiter'
+);
+CREATE INDEX IF NOT EXISTS ix_users_user_id ON users (user_id);
+CREATE INDEX IF NOT EXISTS ix_users_email ON users (email);
+
+CREATE TABLE IF NOT EXISTS checkins (
+    id TEXT PRIMARY KEY,
+    user_id TEXT,
+    check_in_time TEXT,
+    check_out_time TEXT,
+    location TEXT,
+    action TEXT,
+    notes TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_checkins_user_time ON checkins (user_id, check_in_time);
+CREATE INDEX IF NOT EXISTS ix_checkins_time ON checkins (check_in_time);
+
+CREATE TABLE IF NOT EXISTS vacation_requests (
+    id TEXT PRIMARY KEY,
+    user_id TEXT,
+    start_date TEXT,
+    end_date TEXT,
+    reason TEXT,
+    approved INTEGER DEFAULT 0,
+    status TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_vacation_user ON vacation_requests (user_id, start_date);
+CREATE INDEX IF NOT EXISTS ix_vacation_status ON vacation_requests (status);
+CREATE INDEX IF NOT EXISTS ix_vacation_dates ON vacation_requests (start_date, end_date);
+
+CREATE TABLE IF NOT EXISTS sick_leaves (
+    id TEXT PRIMARY KEY,
+    user_id TEXT,
+    date TEXT,
+    end_date TEXT,
+    note TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_sick_user ON sick_leaves (user_id, date);
+CREATE INDEX IF NOT EXISTS ix_sick_dates ON sick_leaves (date, end_date);
+
+-- Signaturen der JSON-Sammlungen beim letzten Abgleich (modules/migrate_to_sqlite.py)
+CREATE TABLE IF NOT EXISTS sync_state (
+    collection TEXT PRIMARY KEY,
+    signature TEXT
+);
+"""
+
+_initialized = set()
+_init_lock = threading.Lock()
+
+
+def connect(database: Optional[str] = None) -> sqlite3.Connection:
+    """Opens a connection in WAL mode and creates the schema on first use."""
+    database = database or DATABASE_FILE
+    os.makedirs(os.path.dirname(os.path.abspath(database)), exist_ok=True)
+    connection = sqlite3.connect(database, timeout=30, check_same_thread=False)
+    connection.row_factory = sqlite3.Row
+    connection.execute("PRAGMA synchronous=NORMAL")
+    with _init_lock:
+        if database not in _initialized:
+            # WAL lässt Leser parallel zu einem Schreiber arbeiten
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+            connection.commit()
+            _initialized.add(database)
+    return connection
+
+
+def _to_row(obj) -> List:
+    table, columns, datetime_columns = TABLES[type(obj)]
+    if not getattr(obj, "id", None):
+        obj.id = str(uuid.uuid4())
+    row = []
+    for column in columns:
+        value = getattr(obj, column, None)
+        if column == "approved":
+            value = int(bool(value))
+        row.append(normalize_value(value))
+    return row
+
+
+def _from_row(model_class, row: sqlite3.Row):
+    _, columns, datetime_columns = TABLES[model_class]
+    obj = model_class.__new__(model_class)
+    for column in columns:
+        value = row[column]
+        if column in datetime_columns and value:
+            value = datetime.fromisoformat(value)
+        elif column == "approved":
+            value = bool(value)
+        setattr(obj, column, value)
+    return obj
+
+
+class SQLiteQuery:
+    """Query builder that compiles predicates into indexed SQL."""
+
+    def __init__(self, connection: sqlite3.Connection, model_class):
+        self.connection = connection
+        self.model_class = model_class
+        self.table, self.columns, _ = TABLES[model_class]
+        self.filters: List[Predicate] = []
+        self.orderings = []
+        self._limit = None
+        self._offset = None
+
+    def _column(self, name: str) -> str:
+        if name not in self.columns:
+            raise AttributeError(f"{self.model_class.__name__} hat kein Feld '{name}'")
+        return name
+
+    def filter(self, *conditions):
+        """Add one or more predicates (combined with AND)."""
+        self.filters.extend(conditions)
+        return self
+
+    def filter_by(self, **values):
+        """Add equality predicates given as keyword arguments."""
+        for field, value in values.items():
+            self.filters.append(Predicate(field, "is" if value is None else "==", value))
+        return self
+
+    def order_by(self, *fields):
+        self.orderings.extend(as_ordering(f) for f in fields)
+        return self
+
+    def limit(self, count: int):
+        self._limit = count
+        return self
+
+    def offset(self, count: int):
+        self._offset = count
+        return self
+
+    def _where(self):
+        clauses, params = [], []
+        for predicate in self.filters:
+            column = self._column(predicate.field)
+            if predicate.op == "in":
+                if not predicate.value:
+                    clauses.append("0")
+                    continue
+                clauses.append(f"{column} IN ({', '.join('?' for _ in predicate.value)})")
+                params.extend(predicate.value)
+            elif predicate.op == "between":
+                clauses.append(f"{column} BETWEEN ? AND ?")
+                params.extend(predicate.value)
+            elif predicate.op in ("is", "is not"):
+                if predicate.value is None:
+                    clauses.append(f"{column} {predicate.op.upper()} NULL")
+                else:
+                    clauses.append(f"{column} {predicate.op.upper()} ?")
+                    params.append(predicate.value)
+            else:
+                op = "=" if predicate.op == "==" else predicate.op
+                clauses.append(f"{column} {op} ?")
+                params.append(predicate.value)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def _select(self, what: str, with_order: bool = True):
+        where, params = self._where()
+        sql = f"SELECT {what} FROM {self.table}{where}"
+        if with_order and self.orderings:
+            sql += " ORDER BY " + ", ".join(
+                f"{self._column(o.field)} {'DESC' if o.descending else 'ASC'}" for o in self.orderings)
+        if with_order and (self._limit is not None or self._offset is not None):
+            sql += " LIMIT ? OFFSET ?"
+            params += [self._limit if self._limit is not None else -1, self._offset or 0]
+        return sql, params
+
+    def all(self):
+        """Return all matching items."""
+        sql, params = self._select(", ".join(self.columns))
+        return [_from_row(self.model_class, row) for row in self.connection.execute(sql, params)]
+
+    def first(self):
+        """Return first matching item or None."""
+        previous = self._limit
+        self._limit = 1
+        try:
+            items = self.all()
+        finally:
+            self._limit = previous
+        return items[0] if items else None
+
+    def count(self) -> int:
+        sql, params = self._select("COUNT(*)", with_order=False)
+        return self.connection.execute(sql, params).fetchone()[0]
+
+    def delete(self) -> int:
+        where, params = self._where()
+        return self.connection.execute(f"DELETE FROM {self.table}{where}", params).rowcount
+
+
+class SQLiteSession:
+    """Session with the same surface as JSONSession, backed by SQLite."""
+
+    def __init__(self, database: Optional[str] = None):
+        self.connection = connect(database)
+
+    def query(self, model_class):
+        if model_class not in TABLES:
+            return None
+        return SQLiteQuery(self.connection, model_class)
+
+    def add(self, obj):
+        """Insert or update an object (matched by id)."""
+        table, columns, _ = TABLES[type(obj)]
+        self.connection.execute(
+            f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+            _to_row(obj),
+        )
+
+    def add_all(self, objects):
+        """Bulk insert/update of many objects of one or more model classes."""
+        by_class: Dict[type, List] = {}
+        for obj in objects:
+            by_class.setdefault(type(obj), []).append(_to_row(obj))
+        for model_class, rows in by_class.items():
+            table, columns, _ = TABLES[model_class]
+            self.connection.executemany(
+                f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+                rows,
+            )
+
+    def delete(self, obj):
+        table, _, _ = TABLES[type(obj)]
+        self.connection.execute(f"DELETE FROM {table} WHERE id = ?", (obj.id,))
+
+    def commit(self):
+        self.connection.commit()
+
+    def rollback(self):
+        self.connection.rollback()
+
+    def close(self):
+        self.connection.close()
+
+
+# Session management
+@contextlib.contextmanager
+def get_db_session():
+    """Context manager to get a database session."""
+    session = SQLiteSession()
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
@@ -1,4 +1,5 @@
 import streamlit as st
+from modules.metrics import note_navigation
 
 def set_page(page_name):
     """
@@ -8,5 +9,6 @@ def set_page(page_name):
         page_name (str): Name der Zielseite
     """
     st.session_state.current_page = page_name
+    note_navigation(page_name)
     # Automatisches Rerun nach Seitenwechsel, um doppeltes Klicken zu vermeiden
     st.rerun()
@@ -2,38 +2,33 @@ import streamlit as st
 import json
 import os
 from datetime import datetime
+from modules.metrics import instrumented
+from modules.repository import get_repository
 
 # Datei für Benachrichtigungen
 NOTIFICATIONS_FILE = "data/notifications.json"
 
+def _repo():
+    return get_repository(os.path.dirname(NOTIFICATIONS_FILE))
+
 def initialize_notifications():
     """Initialisiert die Benachrichtigungsdatei, falls sie nicht existiert."""
     if not os.path.exists(NOTIFICATIONS_FILE):
-        with open(NOTIFICATIONS_FILE, "w", encoding="utf-8") as f:
-            json.dump([], f)
+        _repo().save("notifications", [])
 
+@instrumented
 def save_notification(notification):
     """Speichert eine neue Benachrichtigung in der Datei."""
-    initialize_notifications()
-    
-    with open(NOTIFICATIONS_FILE, "r", encoding="utf-8") as f:
-        notifications = json.load(f)
-    
     # Füge Zeitstempel hinzu
     notification["timestamp"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     notification["read"] = False
     
-    notifications.append(notification)
-    
-    with open(NOTIFICATIONS_FILE, "w", encoding="utf-8") as f:
-        json.dump(notifications, f, indent=4, ensure_ascii=False)
+    _repo().append("notifications", notification)
 
+@instrumented
 def load_notifications(user_id=None, admin_only=False):
     """Lädt Benachrichtigungen aus der Datei."""
-    initialize_notifications()
-    
-    with open(NOTIFICATIONS_FILE, "r", encoding="utf-8") as f:
-        notifications = json.load(f)
+    notifications = _repo().load("notifications")
     
     # Filtere nach Benutzer-ID, falls angegeben
     if user_id and not admin_only:
@@ -50,18 +45,13 @@ def load_notifications(user_id=None, admin_only=False):
 
 def mark_notification_as_read(notification_id):
     """Markiert eine Benachrichtigung als gelesen."""
-    initialize_notifications()
+    def _mark(notifications):
+        for i, notification in enumerate(notifications):
+            if notification.get("id") == notification_id:
+                notifications[i] = {**notification, "read": True}
+                break
     
-    with open(NOTIFICATIONS_FILE, "r", encoding="utf-8") as f:
-        notifications = json.load(f)
-    
-    for notification in notifications:
-        if notification.get("id") == notification_id:
-            notification["read"] = True
-            break
-    
-    with open(NOTIFICATIONS_FILE, "w", encoding="utf-8") as f:
-        json.dump(notifications, f, indent=4, ensure_ascii=False)
+    _repo().update("notifications", _mark)
 
 def create_vacation_notification(employee_name, start_date, end_date, status="eingereicht"):
     """Erstellt eine Benachrichtigung für einen Urlaubsantrag."""
@@ -87,18 +77,38 @@ def create_sick_leave_notification(employee_name, start_date, end_date):
     }
     save_notification(notification)
 
-def create_vacation_status_notification(user_id, employee_name, start_date, end_date, status):
-    """Erstellt eine Benachrichtigung über den Status eines Urlaubsantrags."""
+def _vacation_status_notification(user_id, start_date, end_date, status, suffix=""):
     status_text = "genehmigt" if status == "approved" else "abgelehnt"
-    notification = {
-        "id": f"vacation_status_{datetime.now().strftime('%Y%m%d%H%M%S')}",
+    return {
+        "id": f"vacation_status_{datetime.now().strftime('%Y%m%d%H%M%S')}{suffix}",
         "type": "vacation_status",
         "title": f"Urlaubsantrag {status_text}",
         "message": f"Dein Urlaubsantrag vom {start_date} bis {end_date} wurde {status_text}.",
         "admin_notification": False,
         "recipient_id": user_id
     }
-    save_notification(notification)
+
+def create_vacation_status_notification(user_id, employee_name, start_date, end_date, status):
+    """Erstellt eine Benachrichtigung über den Status eines Urlaubsantrags."""
+    save_notification(_vacation_status_notification(user_id, start_date, end_date, status))
+
+@instrumented
+def save_notifications(notifications):
+    """Speichert mehrere Benachrichtigungen mit einem einzigen Schreibvorgang."""
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    for notification in notifications:
+        notification["timestamp"] = timestamp
+        notification["read"] = False
+    if notifications:
+        _repo().update("notifications", lambda current: current.extend(notifications))
+
+def create_vacation_status_notifications(requests):
+    """Benachrichtigt die Mitarbeiter mehrerer bearbeiteter Urlaubsanträge in einem Schreibvorgang."""
+    save_notifications([
+        _vacation_status_notification(req.get("user_id"), req.get("start_date"), req.get("end_date"),
+                                      req.get("status"), suffix=f"_{req.get('id')}")
+        for req in requests
+    ])
 
 def show_notifications():
     """Zeigt Benachrichtigungen für den aktuellen Benutzer an."""
@@ -0,0 +1,64 @@
+# modules/pages.py
+"""
+Registry of the app pages.
+
+Every page is registered as ``(module, function)`` and its module is only
+imported when the page is rendered for the first time, so the login screen
+does not pay for pandas, NumPy, plotly or the analytics modules of pages
+that were never opened. Python's module cache makes later renders a dict
+lookup.
+
+A registered page whose own module or render function does not exist
+raises ``PageNotImplemented``; import errors raised while the page module
+loads its dependencies (e.g. a missing pandas) propagate unchanged.
+"""
+
+import importlib
+from typing import Callable, Dict, Optional, Tuple
+
+PAGES: Dict[str, Tuple[str, str]] = {
+    "Login": ("modules.login", "show_login"),
+    "Home": ("modules.home_page", "show_home_page"),
+    "Check-in/Check-out": ("modules.checkin_page", "show_checkin_checkout"),
+    "Calendar": ("modules.calendar", "show_calendar"),
+    "Stats": ("modules.stats", "show_stats"),
+    "Vacation": ("modules.vacation", "display_vacation_page"),
+    "Sick Leave": ("modules.sick_leave", "show_sick_leave"),
+    "Notifications": ("modules.notifications", "show_notifications"),
+    "Change Password": ("modules.login", "show_change_password"),
+    # Beide Namen zeigen den Administrationsbereich mit Rollenprüfung
+    "Admin Dashboard": ("modules.login", "show_admin_dashboard"),
+    "Admin": ("modules.login", "show_admin_dashboard"),
+}
+
+
+class PageNotImplemented(Exception):
+    """The module or render function of a registered page does not exist."""
+
+
+def get_page(name: str) -> Optional[Callable[[], None]]:
+    """Render function of a page (imports its module on first use); None for unknown pages."""
+    entry = PAGES.get(name)
+    if entry is None:
+        return None
+    module_name, function_name = entry
+    try:
+        module = importlib.import_module(module_name)
+    except ModuleNotFoundError as e:
+        # Nur das Fehlen des Seitenmoduls selbst, nicht einer seiner Abhängigkeiten
+        if e.name != module_name:
+            raise
+        raise PageNotImplemented(f"Modul {module_name} der Seite '{name}' fehlt") from e
+    render = getattr(module, function_name, None)
+    if render is None:
+        raise PageNotImplemented(f"{module_name}.{function_name} der Seite '{name}' fehlt")
+    return render
+
+
+def show_page(name: str) -> bool:
+    """Renders a page; returns False if no page of that name is registered."""
+    render = get_page(name)
+    if render is None:
+        return False
+    render()
+    return True
@@ -0,0 +1,199 @@
+# modules/partitions.py
+"""
+Month-partitioned storage for time entries.
+
+Instead of one ``time_entries.json`` holding the whole history, every month
+lives in its own JSONL file::
+
+    data/time_entries/manifest.json
+    data/time_entries/2025-03.jsonl
+    data/time_entries/2025-04.jsonl
+
+A record belongs to the month of its check-in (``check_in`` /
+``check_in_time``); records without a usable date go to ``undated.jsonl``.
+The manifest lists the partitions, so range reads open only the months they
+need and appends touch a single small file.
+
+The legacy single file (``time_entries.json`` plus its ``.jsonl`` journal)
+is imported automatically the first time the partitioned store is used and
+is left in place untouched.
+"""
+
+import os
+import json
+import threading
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+from modules.journal import (
+    CorruptFileError, append_record, load_journaled, read_journal,
+    write_json_atomic, write_jsonl_atomic,
+)
+from modules.metrics import record_read
+
+MANIFEST_FILE = "manifest.json"
+MANIFEST_FORMAT = 1
+UNDATED = "undated"
+DATE_KEYS = ("check_in", "check_in_time")
+
+
+def _file_signature(path: str) -> Tuple[int, int]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return (0, -1)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def partition_key(record: Dict) -> str:
+    """Returns the month ("YYYY-MM") a record is stored under."""
+    for key in DATE_KEYS:
+        value = record.get(key)
+        if isinstance(value, str) and len(value) >= 7 and value[4] == "-" and value[:4].isdigit():
+            return value[:7]
+    return UNDATED
+
+
+def month_key(value) -> str:
+    """Month key of a date, datetime or ISO string."""
+    if isinstance(value, (date, datetime)):
+        return f"{value.year:04d}-{value.month:02d}"
+    return str(value)[:7]
+
+
+class PartitionedStore:
+    """Reads and writes a collection split into monthly JSONL files."""
+
+    def __init__(self, directory: str, legacy_path: Optional[str] = None):
+        self.directory = directory
+        self.legacy_path = legacy_path
+        self.manifest_path = os.path.join(directory, MANIFEST_FILE)
+        self._manifest: Tuple[tuple, List[str]] = ((0, -1), [])
+        self._partitions: Dict[str, Tuple[tuple, List[Dict]]] = {}
+        self._lock = threading.Lock()
+
+    def partition_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.jsonl")
+
+    # --- Manifest ---
+    def exists(self) -> bool:
+        return os.path.exists(self.manifest_path)
+
+    def keys(self) -> List[str]:
+        """Partition keys in chronological order (undated last)."""
+        signature = _file_signature(self.manifest_path)
+        cached_signature, keys = self._manifest
+        if signature != cached_signature:
+            if signature == (0, -1):
+                keys = []
+            else:
+                try:
+                    with open(self.manifest_path, "r", encoding="utf-8") as f:
+                        manifest = json.load(f)
+                        record_read(self.manifest_path, os.fstat(f.fileno()).st_size)
+                except json.JSONDecodeError as e:
+                    raise CorruptFileError(f"Error decoding JSON from {self.manifest_path}: {e}") from e
+                keys = sorted(manifest.get("partitions", []), key=lambda k: (k == UNDATED, k))
+            self._manifest = (signature, keys)
+        return keys
+
+    def _write_manifest(self, keys):
+        write_json_atomic(self.manifest_path, {
+            "format": MANIFEST_FORMAT,
+            "partition_by": "month of check_in",
+            "partitions": sorted(keys, key=lambda k: (k == UNDATED, k)),
+        })
+
+    def signature(self) -> tuple:
+        """Changes whenever the manifest or any partition file changes."""
+        keys = self.keys()
+        return (_file_signature(self.manifest_path),) + tuple(
+            _file_signature(self.partition_path(key)) for key in keys)
+
+    def partition_signature(self, key: str) -> Tuple[int, int]:
+        """Changes whenever the file of one partition changes (without reading the others)."""
+        return _file_signature(self.partition_path(key))
+
+    # --- Lesen ---
+    def read_partition(self, key: str) -> List[Dict]:
+        """Returns the cached records of one partition (shared list, read-only)."""
+        path = self.partition_path(key)
+        signature = _file_signature(path)
+        cached = self._partitions.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        records = read_journal(path)
+        with self._lock:
+            self._partitions[key] = (signature, records)
+        return records
+
+    def read_all(self) -> List[Dict]:
+        records = []
+        for key in self.keys():
+            records.extend(self.read_partition(key))
+        return records
+
+    def read_range(self, start=None, end=None) -> List[Dict]:
+        """Records of all partitions from the month of ``start`` to the month of ``end``."""
+        low = month_key(start) if start is not None else None
+        high = month_key(end) if end is not None else None
+        records = []
+        for key in self.keys():
+            if key == UNDATED:
+                continue
+            if (low is None or key >= low) and (high is None or key <= high):
+                records.extend(self.read_partition(key))
+        return records
+
+    # --- Schreiben (Aufrufer hält den Collection-Lock) ---
+    def import_legacy(self) -> int:
+        """Splits the legacy array file (and its journal) into partitions."""
+        records = load_journaled(self.legacy_path) if self.legacy_path else []
+        self.rewrite(records)
+        return len(records)
+
+    def append(self, record: Dict):
+        key = partition_key(record)
+        keys = self.keys()
+        if key not in keys:
+            # Erst das Manifest, dann die Zeile: ein Absturz dazwischen hinterlässt
+            # höchstens eine leere, aber bekannte Partition
+            self._write_manifest(keys + [key])
+        path = self.partition_path(key)
+        cached = self._partitions.get(key)
+        fresh = cached is not None and cached[0] == _file_signature(path)
+        append_record(path, record)
+        with self._lock:
+            if fresh and self._partitions.get(key) is cached:
+                cached[1].append(record)
+                self._partitions[key] = (_file_signature(path), cached[1])
+            else:
+                self._partitions.pop(key, None)
+
+    def rewrite(self, records: List[Dict]):
+        """Replaces the whole collection, rewriting only partitions that changed."""
+        groups: Dict[str, List[Dict]] = {}
+        for record in records:
+            groups.setdefault(partition_key(record), []).append(record)
+        exists = self.exists()
+        old_keys = set(self.keys()) if exists else set()
+        new_keys = set(groups)
+        if not exists or not new_keys <= old_keys:
+            # Neue Partitionen zuerst bekannt machen, damit kein Monat verloren geht
+            self._write_manifest(old_keys | new_keys)
+        for key, group in groups.items():
+            path = self.partition_path(key)
+            if key in old_keys and os.path.exists(path) and self.read_partition(key) == group:
+                continue
+            write_jsonl_atomic(path, group)
+            with self._lock:
+                self._partitions[key] = (_file_signature(path), group)
+        stale = old_keys - new_keys
+        if stale:
+            self._write_manifest(new_keys)
+            for key in stale:
+                path = self.partition_path(key)
+                if os.path.exists(path):
+                    os.remove(path)
+                with self._lock:
+                    self._partitions.pop(key, None)
@@ -0,0 +1,117 @@
+# modules/query.py
+"""
+Backend-neutral query expressions for the model classes.
+
+Model attributes are ``Field`` descriptors, so ``CheckIn.user_id == "42"`` or
+``CheckIn.check_in_time.between(start, end)`` build ``Predicate`` objects in
+the style of SQLAlchemy. The JSON and the SQLite backend both accept these
+predicates in ``query(...).filter(...)``.
+
+Dates and datetimes are compared as normalized ISO strings
+(``YYYY-MM-DD`` / ``YYYY-MM-DD HH:MM:SS``), which sort chronologically.
+"""
+
+from datetime import date, datetime
+from typing import Any, Iterable
+
+
+def normalize_value(value: Any) -> Any:
+    """Brings dates, datetimes and ISO strings into one sortable string form."""
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, str) and len(value) > 10 and value[10] == "T" and value[4:5] == "-":
+        return value[:10] + " " + value[11:]
+    return value
+
+
+class Predicate:
+    """A single condition ``field <op> value``."""
+
+    OPERATORS = ("==", "!=", "<", "<=", ">", ">=", "in", "between", "is", "is not")
+
+    def __init__(self, field: str, op: str, value: Any):
+        if op not in self.OPERATORS:
+            raise ValueError(f"Unbekannter Operator: {op}")
+        self.field = field
+        self.op = op
+        if op == "in":
+            self.value = tuple(normalize_value(v) for v in value)
+        elif op == "between":
+            self.value = (normalize_value(value[0]), normalize_value(value[1]))
+        else:
+            self.value = normalize_value(value)
+
+    def __repr__(self):
+        return f"Predicate({self.field!r}, {self.op!r}, {self.value!r})"
+
+
+class Ordering:
+    """Sort order for ``order_by``."""
+
+    def __init__(self, field: str, descending: bool = False):
+        self.field = field
+        self.descending = descending
+
+
+class Field:
+    """Model attribute that behaves like a plain attribute on instances."""
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        return obj.__dict__.get(self.name)
+
+    def __set__(self, obj, value):
+        obj.__dict__[self.name] = value
+
+    __hash__ = object.__hash__
+
+    def __eq__(self, other):
+        return Predicate(self.name, "is" if other is None else "==", other)
+
+    def __ne__(self, other):
+        return Predicate(self.name, "is not" if other is None else "!=", other)
+
+    def __lt__(self, other):
+        return Predicate(self.name, "<", other)
+
+    def __le__(self, other):
+        return Predicate(self.name, "<=", other)
+
+    def __gt__(self, other):
+        return Predicate(self.name, ">", other)
+
+    def __ge__(self, other):
+        return Predicate(self.name, ">=", other)
+
+    def in_(self, values: Iterable):
+        return Predicate(self.name, "in", list(values))
+
+    def between(self, low, high):
+        return Predicate(self.name, "between", (low, high))
+
+    def is_(self, value):
+        return Predicate(self.name, "is", value)
+
+    def isnot(self, value):
+        return Predicate(self.name, "is not", value)
+
+    def asc(self):
+        return Ordering(self.name)
+
+    def desc(self):
+        return Ordering(self.name, descending=True)
+
+
+def as_ordering(item) -> Ordering:
+    """Accepts a Field, an Ordering or a field name."""
+    if isinstance(item, Ordering):
+        return item
+    if isinstance(item, Field):
+        return Ordering(item.name)
+    return Ordering(str(item))
@@ -0,0 +1,331 @@
+# modules/repository.py
+"""
+Shared, cached access to the JSON data files.
+
+All pages read their collections through one ``Repository`` per data folder.
+The repository is a process-wide singleton, so every Streamlit session shares
+the same in-memory copy. Each collection is parsed once and then served from
+memory until either
+
+* the backing file changes on disk (detected via mtime/size), or
+* the collection is written through the repository, which bumps its
+  internal version counter and replaces the cached copy without re-parsing.
+
+Time entries are stored month-partitioned (see modules/partitions.py);
+``load_range()`` reads only the months of a date window. Employees are
+journaled: ``update_record()`` / ``delete_record()`` append a single line
+instead of rewriting the file.
+
+``version(name)`` exposes that counter so callers can key derived caches on it.
+
+Writes are crash-safe and concurrency-safe: every rewrite is an atomic
+temp-file-and-rename, and read-modify-write cycles run through ``update()``
+under the collection's own advisory lock, re-reading the file first so that
+concurrent sessions never overwrite each other's changes.
+
+With ``WORKTIME_STORAGE=sqlite`` every write is also applied to the SQLite
+copy of the models (see ``migrate_to_sqlite.mirror_write``) while the
+collection lock is still held.
+"""
+
+import os
+import uuid
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from modules.journal import (
+    CorruptFileError, DELETE, UPSERT, journal_op, journal_path_for, load_array,
+    load_journaled, append_record, compact, write_json_atomic,
+)
+from modules.locking import collection_lock
+from modules.partitions import PartitionedStore
+
+DATA_FOLDER = "data"
+# SQLite-Backend gewählt: Schreibvorgänge werden in die Datenbank übernommen
+SQLITE_COPY = os.environ.get("WORKTIME_STORAGE", "json").lower() == "sqlite"
+
+# Storage kinds: a JSON array file, an array plus JSONL journal, or monthly
+# partitions in a folder (the file name is then the legacy file to import)
+ARRAY = "array"
+JOURNAL = "journal"
+PARTITIONED = "partitioned"
+
+# Collection name -> (file name, storage kind)
+COLLECTIONS = {
+    "employees": ("employees.json", JOURNAL),
+    "users": ("users.json", ARRAY),
+    "time_entries": ("time_entries.json", PARTITIONED),
+    "vacation_requests": ("vacation_requests.json", ARRAY),
+    "sick_leaves": ("sick_leaves.json", ARRAY),
+    "notifications": ("notifications.json", ARRAY),
+}
+
+
+def _file_signature(path: str) -> Tuple[int, int]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return (0, -1)
+    return (st.st_mtime_ns, st.st_size)
+
+
+class Repository:
+    """In-memory cache of all JSON collections of one data folder."""
+
+    def __init__(self, data_folder: str):
+        self.data_folder = data_folder
+        # Schreib-Locks pro Collection; Leser nehmen nur den kurzen Zustands-Lock
+        self._locks = {name: threading.RLock() for name in COLLECTIONS}
+        self._state_lock = threading.Lock()
+        self._cache: Dict[str, Tuple[tuple, List[Dict]]] = {}
+        self._versions: Dict[str, int] = {name: 0 for name in COLLECTIONS}
+        self._stores: Dict[str, PartitionedStore] = {}
+
+    # --- Pfade & Signaturen ---
+    def path(self, name: str) -> str:
+        return os.path.join(self.data_folder, COLLECTIONS[name][0])
+
+    def _kind(self, name: str) -> str:
+        return COLLECTIONS[name][1]
+
+    def partition_store(self, name: str) -> PartitionedStore:
+        """Returns the partition store, importing the legacy file on first use."""
+        store = self._stores.get(name)
+        if store is None:
+            path = self.path(name)
+            store = PartitionedStore(os.path.splitext(path)[0], legacy_path=path)
+            if not store.exists():
+                with self._locks[name], collection_lock(path):
+                    if not store.exists():
+                        store.import_legacy()
+            self._stores[name] = store
+        return store
+
+    def _signature(self, name: str) -> tuple:
+        path = self.path(name)
+        kind = self._kind(name)
+        if kind == PARTITIONED:
+            return self.partition_store(name).signature()
+        if kind == JOURNAL:
+            return _file_signature(path) + _file_signature(journal_path_for(path))
+        return _file_signature(path)
+
+    def _read(self, name: str) -> List[Dict]:
+        path = self.path(name)
+        kind = self._kind(name)
+        if kind == PARTITIONED:
+            return self.partition_store(name).read_all()
+        if kind == JOURNAL:
+            return load_journaled(path)
+        return load_array(path)
+
+    def _records(self, name: str, strict: bool = False) -> List[Dict]:
+        """
+        Returns the cached list itself, re-reading the file only if it changed.
+
+        A file that cannot be parsed raises CorruptFileError when ``strict`` is
+        set (writers must never build on it); readers get the last good copy.
+        """
+        signature = self._signature(name)
+        cached = self._cache.get(name)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        try:
+            records = self._read(name)
+        except CorruptFileError as e:
+            if strict:
+                raise
+            print(f"{e}. Using last known data.")
+            return cached[1] if cached is not None else []
+        with self._state_lock:
+            # Nur übernehmen, wenn kein Schreiber den Cache inzwischen ersetzt hat
+            if self._cache.get(name) is cached:
+                self._cache[name] = (signature, records)
+                if cached is not None:
+                    self._versions[name] += 1
+        return records
+
+    # --- Öffentliche API ---
+    def load(self, name: str) -> List[Dict]:
+        """
+        Returns the collection as a new list.
+
+        The list is a shallow copy, the record dicts are shared with the cache:
+        callers that modify a record must write the collection back via save().
+        """
+        return list(self._records(name))
+
+    def signature(self, name: str) -> tuple:
+        """On-disk signature of the collection (changes with every write, also by other processes)."""
+        return self._signature(name)
+
+    def version(self, name: str) -> int:
+        """Returns a counter that changes whenever the collection changes."""
+        self._records(name)
+        return self._versions[name]
+
+    def snapshot(self, name: str) -> Tuple[List[Dict], int]:
+        """
+        Returns the cached list itself together with its version.
+
+        The list is shared and must be treated as read-only; it is meant for
+        derived structures (indexes, aggregates) keyed on the version.
+        """
+        signature = self._signature(name)
+        with self._state_lock:
+            cached = self._cache.get(name)
+            if cached is not None and cached[0] == signature:
+                return cached[1], self._versions[name]
+        records = self._records(name)
+        return records, self._versions[name]
+
+    def load_range(self, name: str, start=None, end=None) -> List[Dict]:
+        """
+        Returns the records of the months from ``start`` to ``end`` (dates or
+        ISO strings, both optional) as a new list.
+
+        Only partitioned collections are pruned; callers still filter by day.
+        Other collections return everything.
+        """
+        if self._kind(name) != PARTITIONED:
+            return self.load(name)
+        return self.partition_store(name).read_range(start, end)
+
+    def _write(self, name: str, records: List[Dict]):
+        path = self.path(name)
+        kind = self._kind(name)
+        if kind == PARTITIONED:
+            self.partition_store(name).rewrite(records)
+        elif kind == JOURNAL:
+            compact(path, records)
+        else:
+            write_json_atomic(path, records)
+        with self._state_lock:
+            self._cache[name] = (self._signature(name), records)
+            self._versions[name] += 1
+        self._mirror(name)
+
+    def _mirror(self, name: str, record: Optional[Dict] = None):
+        """Applies the write to the SQLite copy; a failure leaves the copy stale until the next full sync."""
+        if not SQLITE_COPY:
+            return
+        try:
+            from modules import migrate_to_sqlite  # erst mit aktivem SQLite-Backend laden
+            migrate_to_sqlite.mirror_write(self, name, record)
+        except Exception as e:
+            print(f"SQLite-Kopie von {name} nicht aktualisiert: {e}")
+
+    def save(self, name: str, records: List[Dict]):
+        """
+        Rewrites a whole collection and updates the cache in place.
+
+        Prefer update() for read-modify-write cycles: save() overwrites
+        whatever other sessions wrote since ``records`` was loaded.
+        """
+        records = list(records)
+        with self._locks[name], collection_lock(self.path(name)):
+            self._write(name, records)
+
+    def update(self, name: str, mutate: Callable[[List[Dict]], Optional[List[Dict]]]):
+        """
+        Applies ``mutate`` to the current on-disk state under the collection lock.
+
+        ``mutate`` receives a fresh list and may change it in place or return a
+        replacement list. Returns the list that was written.
+        """
+        with self._locks[name], collection_lock(self.path(name)):
+            records = list(self._records(name, strict=True))
+            result = mutate(records)
+            if result is not None:
+                records = list(result)
+            self._write(name, records)
+            return records
+
+    def append(self, name: str, record: Dict):
+        """Adds one record; journaled and partitioned collections append a single line."""
+        kind = self._kind(name)
+        if kind == ARRAY:
+            self.update(name, lambda records: records.append(record))
+            return
+        # Die ID macht das Journal bei einer unterbrochenen Kompaktierung idempotent
+        record.setdefault("id", str(uuid.uuid4()))
+        with self._locks[name], collection_lock(self.path(name)):
+            cached = self._cache.get(name)
+            fresh = cached is not None and cached[0] == self._signature(name)
+            if kind == PARTITIONED:
+                self.partition_store(name).append(record)
+            else:
+                append_record(journal_path_for(self.path(name)), record)
+            with self._state_lock:
+                if fresh and self._cache.get(name) is cached:
+                    cached[1].append(record)
+                    self._cache[name] = (self._signature(name), cached[1])
+                else:
+                    self._cache.pop(name, None)
+                self._versions[name] += 1
+            self._mirror(name, record)
+
+    def update_record(self, name: str, record_id, changes: Dict) -> Optional[Dict]:
+        """
+        Merges ``changes`` into the record with ``record_id`` and returns it
+        (None if there is no such record).
+
+        Journaled collections write one journal line instead of rewriting the
+        file; other collections fall back to update().
+        """
+        return self._edit_record(name, record_id, UPSERT, changes)
+
+    def delete_record(self, name: str, record_id) -> bool:
+        """Removes the record with ``record_id``; returns whether it existed."""
+        return self._edit_record(name, record_id, DELETE) is not None
+
+    def _edit_record(self, name: str, record_id, op: str, changes: Optional[Dict] = None) -> Optional[Dict]:
+        result = []
+
+        def edit(records):
+            for i, record in enumerate(records):
+                if record.get("id") == record_id:
+                    result.append({**record, **changes} if op == UPSERT else record)
+                    if op == UPSERT:
+                        records[i] = result[0]
+                    else:
+                        del records[i]
+                    return records
+            return records
+
+        if self._kind(name) != JOURNAL:
+            self.update(name, edit)
+            return result[0] if result else None
+        with self._locks[name], collection_lock(self.path(name)):
+            # Neue Liste statt Änderung an Ort und Stelle: abgeleitete Indizes
+            # erkennen so, dass nicht nur angehängt wurde
+            records = edit(list(self._records(name, strict=True)))
+            if not result:
+                return None
+            append_record(journal_path_for(self.path(name)), journal_op(op, result[0]))
+            with self._state_lock:
+                self._cache[name] = (self._signature(name), records)
+                self._versions[name] += 1
+            self._mirror(name)
+        return result[0]
+
+    def invalidate(self, name: Optional[str] = None):
+        """Drops cached data so the next access re-reads from disk."""
+        with self._state_lock:
+            for key in ([name] if name else list(COLLECTIONS)):
+                self._cache.pop(key, None)
+                self._versions[key] += 1
+
+
+_repositories: Dict[str, Repository] = {}
+_repositories_lock = threading.Lock()
+
+
+def get_repository(data_folder: Optional[str] = None) -> Repository:
+    """Returns the shared repository for a data folder (default: DATA_FOLDER)."""
+    key = os.path.abspath(data_folder or DATA_FOLDER)
+    with _repositories_lock:
+        repo = _repositories.get(key)
+        if repo is None:
+            repo = _repositories[key] = Repository(key)
+        return repo
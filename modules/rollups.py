@@ -0,0 +1,127 @@
+# modules/rollups.py
+"""
+Maintained hour totals of the time entries for the home page.
+
+``WeeklyRollup`` holds the worked hours of every completed entry (check-in
+and check-out present) summed per (ISO year, ISO week, user) and per
+(day, user). It is built once from the shared repository list and, when
+entries were only appended (check-in page, journal), extended with just the
+new records, so a render never reparses the history.
+
+``weekly_hours(user_id, start, end)`` answers from the week totals; only the
+partial weeks at the edges of the range are summed from the day totals.
+"""
+
+import threading
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from modules.columnar import MISSING_TIME, parse_times
+from modules.repository import DATA_FOLDER, get_repository
+
+ALL_USERS = None  # Schlüssel für die Summe über alle Mitarbeiter
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+class WeeklyRollup:
+    """Hours per ISO week and per day, each per user and in total."""
+
+    def __init__(self, records: List[Dict]):
+        self.records = records
+        self.size = 0
+        self.weeks: Dict[object, Dict[Tuple[int, int], float]] = {}
+        self.days: Dict[object, Dict[int, float]] = {}
+        self.extend()
+
+    def extend(self):
+        """Adds the records appended since the last call."""
+        new = self.records[self.size:]
+        self.size += len(new)
+        if not new:
+            return
+        check_in = parse_times([r.get("check_in_time") or r.get("check_in") for r in new])
+        check_out = parse_times([r.get("check_out_time") or r.get("check_out") for r in new])
+        done = (check_in != MISSING_TIME) & (check_out != MISSING_TIME)
+        frame = pd.DataFrame({
+            "user_id": np.array([r.get("user_id") for r in new], dtype=object)[done],
+            "day": np.floor_divide(check_in[done], 86400),
+            "hours": (check_out[done] - check_in[done]) / 3600.0,
+        })
+        if frame.empty:
+            return
+        per_day = frame.groupby(["user_id", "day"], dropna=False)["hours"].sum()
+        weeks = {}
+        for day in np.unique(frame["day"]).tolist():
+            iso = date.fromordinal(day + _EPOCH_ORDINAL).isocalendar()
+            weeks[day] = (iso[0], iso[1])
+        for (user_id, day), hours in per_day.items():
+            for key in (user_id, ALL_USERS):
+                user_days = self.days.setdefault(key, {})
+                user_days[day] = user_days.get(day, 0.0) + hours
+                user_weeks = self.weeks.setdefault(key, {})
+                user_weeks[weeks[day]] = user_weeks.get(weeks[day], 0.0) + hours
+
+    def weekly_hours(self, user_id, start: date, end: date) -> Dict[Tuple[int, int], float]:
+        """(ISO year, ISO week) -> hours of entries with a check-in day in [start, end]."""
+        result: Dict[Tuple[int, int], float] = {}
+        if end < start:
+            return result
+        # Volle Wochen aus den Wochensummen, Randtage aus den Tagessummen
+        first_monday = start + timedelta(days=(7 - start.weekday()) % 7)
+        last_sunday = end - timedelta(days=(end.weekday() + 1) % 7)
+        if first_monday <= last_sunday:
+            for (iso_year, iso_week), hours in self.weeks.get(user_id, {}).items():
+                if first_monday <= date.fromisocalendar(iso_year, iso_week, 1) <= last_sunday:
+                    result[(iso_year, iso_week)] = result.get((iso_year, iso_week), 0.0) + hours
+            # Ohne Randtage nicht rechnen: date.min/date.max als offene Grenzen liefen sonst über
+            edges = []
+            if start < first_monday:
+                edges.append((start, first_monday - timedelta(days=1)))
+            if last_sunday < end:
+                edges.append((last_sunday + timedelta(days=1), end))
+        else:
+            edges = [(start, end)]
+        user_days = self.days.get(user_id, {})
+        for low, high in edges:
+            for offset in range((high - low).days + 1):
+                day = low + timedelta(days=offset)
+                hours = user_days.get(day.toordinal() - _EPOCH_ORDINAL)
+                if hours is not None:
+                    iso = day.isocalendar()
+                    result[(iso[0], iso[1])] = result.get((iso[0], iso[1]), 0.0) + hours
+        return result
+
+
+_rollups: Dict[str, Tuple[int, WeeklyRollup]] = {}
+_rollups_lock = threading.Lock()
+
+
+def get_weekly_rollup(data_folder: Optional[str] = None) -> WeeklyRollup:
+    """Returns the rollup for the current version of the time entries."""
+    repository = get_repository(data_folder or DATA_FOLDER)
+    records, version = repository.snapshot("time_entries")
+    key = repository.data_folder
+    with _rollups_lock:
+        entry = _rollups.get(key)
+        if entry is not None:
+            cached_version, rollup = entry
+            if cached_version == version and rollup.records is records:
+                return rollup
+            if rollup.records is records and len(records) >= rollup.size:
+                # Nur angehängt: neue Einträge einrechnen
+                rollup.extend()
+                _rollups[key] = (version, rollup)
+                return rollup
+        rollup = WeeklyRollup(records)
+        _rollups[key] = (version, rollup)
+        return rollup
+
+
+def weekly_hours(user_id=ALL_USERS, start: Optional[date] = None, end: Optional[date] = None,
+                 data_folder: Optional[str] = None) -> Dict[Tuple[int, int], float]:
+    """Hours per (ISO year, ISO week) of one user (or all) in [start, end]."""
+    return get_weekly_rollup(data_folder).weekly_hours(user_id, start or date.min, end or date.max)
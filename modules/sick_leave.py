@@ -2,21 +2,12 @@ import streamlit as st
 from datetime import date
 import json, os
 from modules.notifications import create_sick_leave_notification
+from modules.utils import save_sick_leave as _append_sick_leave
 
 SICK_FILE = "data/sick_leaves.json"
 
 def save_sick_leave(entry):
-    if not os.path.exists(SICK_FILE):
-        with open(SICK_FILE, "w", encoding="utf-8") as f:
-            json.dump([], f)
-
-    with open(SICK_FILE, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    data.append(entry)
-
-    with open(SICK_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+    _append_sick_leave(entry)
 
 def show_sick_leave():
     st.title("🔴 Krankmeldung")
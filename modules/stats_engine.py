@@ -0,0 +1,277 @@
+# modules/stats_engine.py
+"""
+Vectorized statistics for the Stats page.
+
+``StatsEngine`` is built once per data version (time entries, employees,
+sick leaves and vacation requests) and holds
+
+* the time entries as typed arrays from the column store
+  (modules/columnar.py), with each row mapped to its employee position, and
+* a normalized absence frame (one row per sick leave / approved vacation
+  with user id and number of days).
+
+All four tabs read their tables from the engine: per-employee hours, entry
+counts and overtime days are ``np.bincount`` aggregations over a date mask,
+absence days are pandas groupbys. Nothing loops over individual entries in
+Python and no timestamp is parsed twice. ``overtime_days`` answers the
+calendar's per-day overtime question from the columns of a single month.
+"""
+
+import calendar
+import functools
+import threading
+from datetime import date, datetime
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from modules.columnar import MISSING_TIME, load_columns
+from modules.partitions import month_key
+from modules.repository import DATA_FOLDER, get_repository
+
+SOURCE_COLLECTIONS = ("time_entries", "employees", "sick_leaves", "vacation_requests")
+
+
+def _day_number(value) -> int:
+    """Days since 1970-01-01 of a date, datetime or "YYYY-MM-DD" string."""
+    if isinstance(value, datetime):
+        value = value.date()
+    if isinstance(value, date):
+        return int(np.datetime64(value, "D").astype(np.int64))
+    return int(np.datetime64(str(value)[:10], "D").astype(np.int64))
+
+
+def _absence_user_ids(records: List[Dict], name_to_id: Dict[str, str]) -> pd.Series:
+    """User id of each record, falling back to the employee name."""
+    user_ids = [r.get("user_id") if "user_id" in r else name_to_id.get(r.get("employee")) for r in records]
+    return pd.Series(user_ids, dtype=object)
+
+
+def _absence_days(records: List[Dict]) -> np.ndarray:
+    """
+    Inclusive number of days per record: 0 if start or end key is missing,
+    1 if a date cannot be parsed (same rules as before the engine existed).
+    """
+    starts = [r.get("start_date") if "start_date" in r else r.get("date") for r in records]
+    ends = [r.get("end_date") if "end_date" in r else r.get("end") for r in records]
+    has_keys = np.array([("start_date" in r or "date" in r) and ("end_date" in r or "end" in r) for r in records],
+                        dtype=bool)
+    start = pd.to_datetime(pd.Series(starts, dtype=object), format="%Y-%m-%d", errors="coerce")
+    end = pd.to_datetime(pd.Series(ends, dtype=object), format="%Y-%m-%d", errors="coerce")
+    days = ((end - start).dt.days + 1).to_numpy(dtype=float)
+    days = np.where(np.isnan(days), 1, days)
+    return np.where(has_keys, days, 0).astype(np.int64)
+
+
+class StatsEngine:
+    """Per-employee aggregates of one data version."""
+
+    def __init__(self, employees: List[Dict], sick_leaves: List[Dict], vacation_requests: List[Dict],
+                 columns):
+        self.employee_ids = [str(emp["id"]) for emp in employees]
+        self.names = [emp["name"] for emp in employees]
+        self.roles = [emp.get("role", "Mitarbeiter") for emp in employees]
+        position = {emp_id: i for i, emp_id in enumerate(self.employee_ids)}
+        name_to_id = {emp["name"]: str(emp["id"]) for emp in employees}
+
+        # Zeiteinträge: Benutzer-Code -> Mitarbeiterposition (-1 = unbekannt)
+        code_to_position = np.array([position.get(u, -1) for u in columns.users] + [-1], dtype=np.int32)
+        user = np.asarray(columns.user)
+        self.position = code_to_position[np.where(user >= 0, user, len(columns.users))]
+        check_in = np.asarray(columns.check_in)
+        self.day = np.where(check_in != MISSING_TIME, np.floor_divide(check_in, 86400), np.iinfo(np.int64).min)
+        self.hours = np.nan_to_num(np.asarray(columns.duration, dtype=np.float64), nan=0.0)
+        self.overtime = np.asarray(columns.overtime, dtype=bool)
+
+        # Abwesenheiten: eine Zeile je Krankmeldung bzw. Urlaubsantrag
+        frames = []
+        for kind, records in (("sick", sick_leaves), ("vacation", vacation_requests)):
+            if not records:
+                continue
+            frame = pd.DataFrame({
+                "user_id": _absence_user_ids(records, name_to_id).map(lambda v: None if v is None else str(v)),
+                "kind": kind,
+                "days": _absence_days(records),
+                "approved": [r.get("status", "approved") == "approved" for r in records],
+            })
+            frames.append(frame)
+        absences = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(
+            {"user_id": pd.Series(dtype=object), "kind": pd.Series(dtype=object),
+             "days": pd.Series(dtype=np.int64), "approved": pd.Series(dtype=bool)})
+        self.absences = absences[absences["user_id"].isin(position.keys())]
+
+    # --- Aggregation ---
+    def _window(self, start=None, end=None) -> np.ndarray:
+        mask = self.position >= 0
+        if start is not None:
+            mask &= self.day >= _day_number(start)
+        if end is not None:
+            mask &= self.day <= _day_number(end)
+        return mask
+
+    def _per_employee(self, mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        size = len(self.employee_ids)
+        position = self.position[mask]
+        counts = np.bincount(position, minlength=size)
+        hours = np.bincount(position, weights=self.hours[mask], minlength=size)
+        overtime = np.bincount(position, weights=self.overtime[mask], minlength=size).astype(np.int64)
+        return counts, hours, overtime
+
+    def entries_in_window(self, start=None, end=None) -> int:
+        """Number of time entries with a check-in day in [start, end]."""
+        mask = self.day != np.iinfo(np.int64).min
+        if start is not None:
+            mask &= self.day >= _day_number(start)
+        if end is not None:
+            mask &= self.day <= _day_number(end)
+        return int(mask.sum())
+
+    def work_time(self, start=None, end=None) -> pd.DataFrame:
+        counts, hours, _ = self._per_employee(self._window(start, end))
+        active = np.flatnonzero(counts)
+        return pd.DataFrame({
+            "Mitarbeiter": [self.names[i] for i in active],
+            "Gesamtarbeitszeit (Std)": np.round(hours[active], 2),
+            "Anzahl Einträge": counts[active],
+            "Durchschnitt pro Eintrag (Std)": np.round(hours[active] / counts[active], 2),
+        })
+
+    def overtime_table(self, start=None, end=None) -> pd.DataFrame:
+        counts, _, overtime = self._per_employee(self._window(start, end))
+        active = np.flatnonzero(counts)
+        return pd.DataFrame({
+            "Mitarbeiter": [self.names[i] for i in active],
+            "Überstunden (Tage)": overtime[active],
+            "Reguläre Tage": counts[active] - overtime[active],
+            "Gesamt Einträge": counts[active],
+            "Überstunden (%)": np.round(overtime[active] / counts[active] * 100, 1),
+        })
+
+    def _absence_days_per_user(self) -> Tuple[pd.Series, pd.Series]:
+        sick = self.absences[self.absences["kind"] == "sick"].groupby("user_id")["days"].sum()
+        vacation = self.absences[(self.absences["kind"] == "vacation") & self.absences["approved"]]
+        return sick, vacation.groupby("user_id")["days"].sum()
+
+    def absence_table(self) -> pd.DataFrame:
+        """Employees with at least one sick leave or vacation request."""
+        sick, vacation = self._absence_days_per_user()
+        present = set(self.absences["user_id"])
+        user_ids = [u for u in self.employee_ids if u in present]
+        sick_days = sick.reindex(user_ids, fill_value=0).to_numpy()
+        vacation_days = vacation.reindex(user_ids, fill_value=0).to_numpy()
+        names = dict(zip(self.employee_ids, self.names))
+        return pd.DataFrame({
+            "Mitarbeiter": [names[u] for u in user_ids],
+            "Krankheitstage": sick_days,
+            "Urlaubstage": vacation_days,
+            "Gesamte Abwesenheit": sick_days + vacation_days,
+        })
+
+    def overview(self) -> pd.DataFrame:
+        """All employees with all-time hours, overtime, absences and entry counts."""
+        counts, hours, overtime = self._per_employee(self._window())
+        sick, vacation = self._absence_days_per_user()
+        return pd.DataFrame({
+            "Mitarbeiter": self.names,
+            "Rolle": self.roles,
+            "Gesamtarbeitszeit (Std)": np.round(hours, 2),
+            "Überstunden (Tage)": overtime,
+            "Krankheitstage": sick.reindex(self.employee_ids, fill_value=0).to_numpy(),
+            "Urlaubstage": vacation.reindex(self.employee_ids, fill_value=0).to_numpy(),
+            "Einträge": counts,
+        })
+
+
+_engines: Dict[str, Tuple[tuple, StatsEngine]] = {}
+_engines_lock = threading.Lock()
+
+
+def get_stats_engine(data_folder: Optional[str] = None) -> StatsEngine:
+    """Returns the engine for the current data version, building it if needed."""
+    repository = get_repository(data_folder or DATA_FOLDER)
+    version = tuple(repository.version(name) for name in SOURCE_COLLECTIONS)
+    key = repository.data_folder
+    cached = _engines.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    engine = StatsEngine(
+        repository.load("employees"),
+        repository.load("sick_leaves"),
+        repository.load("vacation_requests"),
+        load_columns(data_folder=repository.data_folder),
+    )
+    with _engines_lock:
+        _engines[key] = (version, engine)
+    return engine
+
+
+@functools.lru_cache(maxsize=4)
+def _overtime_by_month(data_folder: str, version: int) -> Dict[Tuple[int, int, str], float]:
+    columns = load_columns(data_folder=data_folder)
+    user = np.asarray(columns.user)
+    check_in = np.asarray(columns.check_in)
+    overtime_hours = np.asarray(columns.overtime_hours, dtype=np.float64)
+    valid = (check_in != MISSING_TIME) & (user >= 0) & (overtime_hours != 0)
+    # Monate seit 1970 als gemeinsamer Gruppenschlüssel mit dem Benutzer-Code
+    months = check_in[valid].astype("datetime64[s]").astype("datetime64[M]").astype(np.int64)
+    hours = overtime_hours[valid]
+    users = len(columns.users)
+    keys, inverse = np.unique(months * users + user[valid], return_inverse=True)
+    sums = np.bincount(inverse, weights=hours, minlength=len(keys))
+    return {
+        (int(key // users) // 12 + 1970, int(key // users) % 12 + 1, columns.users[int(key % users)]): float(total)
+        for key, total in zip(keys, sums)
+    }
+
+
+def overtime_by_month(data_folder: Optional[str] = None) -> Dict[Tuple[int, int, str], float]:
+    """
+    Overtime hours of all stored entries grouped by (year, month, user id).
+
+    Like ``utils.aggregate_overtime_hours`` only entries explicitly flagged
+    ``overtime`` count, with their ``duration_hours``.
+
+    Computed in one vectorized pass over the column store and cached per
+    version of the time entries.
+    """
+    repository = get_repository(data_folder or DATA_FOLDER)
+    return _overtime_by_month(repository.data_folder, repository.version("time_entries"))
+
+
+@functools.lru_cache(maxsize=16)
+def _overtime_days(data_folder: str, signature: tuple, year: int, month: int) -> Tuple[np.ndarray, Dict[int, FrozenSet[str]]]:
+    days_in_month = calendar.monthrange(year, month)[1]
+    first = date(year, month, 1)
+    columns = load_columns(first, date(year, month, days_in_month), data_folder=data_folder)
+    user = np.asarray(columns.user)
+    valid = user >= 0
+    day = (columns.days()[valid] - _day_number(first)).astype(np.int64)
+    user = user[valid].astype(np.int64)
+    overtime = np.asarray(columns.overtime, dtype=bool)[valid]
+    # Wie bisher zählt je (Mitarbeiter, Tag) der letzte Eintrag: erstes Vorkommen im umgekehrten Array
+    keys = day * len(columns.users) + user
+    _, last = np.unique(keys[::-1], return_index=True)
+    last = len(keys) - 1 - last
+    last = last[overtime[last]]
+    bitmap = np.zeros(days_in_month, dtype=bool)
+    bitmap[day[last]] = True
+    users: Dict[int, set] = {}
+    for d, u in zip(day[last].tolist(), user[last].tolist()):
+        users.setdefault(d + 1, set()).add(columns.users[u])
+    return bitmap, {d: frozenset(u) for d, u in users.items()}
+
+
+def overtime_days(year: int, month: int, data_folder: Optional[str] = None
+                  ) -> Tuple[np.ndarray, Dict[int, FrozenSet[str]]]:
+    """
+    Overtime days of one month: a bitmap (index = day - 1) telling whether
+    anybody had overtime that day, and day -> user ids with overtime.
+
+    Only the month's partition of the column store is read; per employee and
+    day the last entry decides. Cached per signature of that partition, so
+    other months are never loaded.
+    """
+    repository = get_repository(data_folder or DATA_FOLDER)
+    signature = repository.partition_store("time_entries").partition_signature(month_key(date(year, month, 1)))
+    return _overtime_days(repository.data_folder, signature, year, month)
@@ -1,17 +1,22 @@
 # modules/utils.py
 import streamlit as st
 import os
-import json
-from datetime import datetime
-import pandas as pd  # Import pandas
-import bcrypt  # Import bcrypt for password hashing
+import calendar
+import functools
+from datetime import datetime, timedelta
+import locale
 import logging  # Import logging
+from modules.journal import journal_path_for
+from modules.metrics import instrumented
+from modules.repository import get_repository
 
 # Configure logging (optional)
 logging.basicConfig(filename='app.log', level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 DATA_FOLDER = "data"
-TIME_ENTRIES_FILE = os.path.join(DATA_FOLDER, "time_entries.json")
+TIME_ENTRIES_FILE = os.path.join(DATA_FOLDER, "time_entries.json")  # Altbestand, wird importiert
+TIME_ENTRIES_JOURNAL = journal_path_for(TIME_ENTRIES_FILE)
+TIME_ENTRIES_DIR = os.path.join(DATA_FOLDER, "time_entries")  # Monatspartitionen
 VACATION_FILE = os.path.join(DATA_FOLDER, "vacation_requests.json")
 SICK_FILE = os.path.join(DATA_FOLDER, "sick_leaves.json")
 EMPLOYEE_FILE = os.path.join(DATA_FOLDER, "employees.json")  # Define the employee file path
@@ -21,6 +26,17 @@ LOCATION_CODES = {
     "Home Office": "HOME"
 }
 
+@functools.lru_cache(maxsize=None)
+def use_german_time_locale():
+    """Deutsche Monatsnamen für strftime; einmal pro Prozess, erst wenn eine Seite sie braucht."""
+    try:
+        locale.setlocale(locale.LC_TIME, 'de_DE.UTF-8')  # für Linux/mac
+    except locale.Error:
+        try:
+            locale.setlocale(locale.LC_TIME, 'deu')  # für Windows, fallback
+        except locale.Error:
+            pass  # Wenn beide fehlschlagen, Standard-Locale verwenden
+
 # --- SESSION STATE ---
 def init_session_state():
     if "user" not in st.session_state:
@@ -47,152 +63,193 @@ def init_session_state():
         st.session_state.location = None
 
 # --- DATABASE (JSON FILE) UTILS ---
-def load_time_entries():
-    if not os.path.exists(TIME_ENTRIES_FILE):
-        return []
-    try:
-        with open(TIME_ENTRIES_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return []
-    except json.JSONDecodeError:
-        print(f"Error decoding JSON from {TIME_ENTRIES_FILE}. Returning empty list.")
-        return []
+def _to_date_str(value):
+    if value is None:
+        return None
+    if hasattr(value, "strftime"):
+        return value.strftime("%Y-%m-%d")
+    return str(value)[:10]
+
+def entry_date(entry):
+    """Returns the check-in day of a time entry as "YYYY-MM-DD" (or None)."""
+    check_in = entry.get("check_in") or entry.get("check_in_time")
+    return check_in[:10] if isinstance(check_in, str) else None
+
+@instrumented
+def load_time_entries(start_date=None, end_date=None):
+    """
+    Loads time entries. With ``start_date``/``end_date`` (date or "YYYY-MM-DD",
+    inclusive) only the monthly partitions of that window are read and
+    entries outside the window are dropped.
+    """
+    repository = get_repository(DATA_FOLDER)
+    if start_date is None and end_date is None:
+        return repository.load("time_entries")
+    start, end = _to_date_str(start_date), _to_date_str(end_date)
+    entries = []
+    for entry in repository.load_range("time_entries", start, end):
+        day = entry_date(entry)
+        if day is None or (start is not None and day < start) or (end is not None and day > end):
+            continue
+        entries.append(entry)
+    return entries
 
+@instrumented
 def save_time_entries(entries):
-    if not os.path.exists(DATA_FOLDER):
-        os.makedirs(DATA_FOLDER)
-
-    with open(TIME_ENTRIES_FILE, "w", encoding="utf-8") as f:
-        json.dump(entries, f, indent=4, ensure_ascii=False)
+    """Rewrites all time entries (only months that changed are written)."""
+    get_repository(DATA_FOLDER).save("time_entries", entries)
 
+@instrumented
 def save_time_entry(entry):
-    entries = load_time_entries()
-    entries.append(entry)
-    save_time_entries(entries)
+    """Appends a single time entry to its month partition without rewriting the history."""
+    get_repository(DATA_FOLDER).append("time_entries", entry)
 
 #Employee loader
+@instrumented
 def load_employees():
     """Loads employee data from the JSON file."""
-    if os.path.exists(EMPLOYEE_FILE):
-        try:
-            with open(EMPLOYEE_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except json.JSONDecodeError:
-            print(f"Warning: Could not decode JSON from {EMPLOYEE_FILE}. Returning an empty list.")
-            return []
-    else:
-        print(f"Warning: Employee file not found at {EMPLOYEE_FILE}. Returning an empty list.")
-        return []
+    return get_repository(DATA_FOLDER).load("employees")
+
+@instrumented
+def save_employees(employees):
+    """Saves employee data to the JSON file."""
+    get_repository(DATA_FOLDER).save("employees", employees)
+
+def update_employees(mutate):
+    """Applies ``mutate`` to the current employee list under the write lock."""
+    return get_repository(DATA_FOLDER).update("employees", mutate)
+
+def _update_record(records, record_id, changes):
+    """Replaces the record with ``record_id`` by a changed copy (cached dicts stay untouched)."""
+    for i, record in enumerate(records):
+        if record.get("id") == record_id:
+            records[i] = {**record, **changes}
+            break
 
 # --- EMPLOYEE MANAGEMENT ---
+# Einzelne Mitarbeiter werden als eine Journalzeile geschrieben, nicht als komplette Datei
 def add_employee(employee):
-    employees = load_employees()
-    employees.append(employee)
-    with open(EMPLOYEE_FILE, "w", encoding="utf-8") as f:
-        json.dump(employees, f, indent=4, ensure_ascii=False)
+    get_repository(DATA_FOLDER).append("employees", employee)
     logging.info(f"Added employee: {employee['name']} ({employee['id']})")
 
+def update_employee(user_id, changes):
+    updated = get_repository(DATA_FOLDER).update_record("employees", user_id, changes)
+    logging.info(f"Updated employee {user_id}: {', '.join(changes)}")
+    return updated
+
 def update_employee_password(user_id, new_password):
-    employees = load_employees()
-    for emp in employees:
-        if emp["id"] == user_id:
-            hashed_pw = bcrypt.hashpw(new_password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
-            emp["password"] = hashed_pw
-            logging.info(f"Updated password for user: {user_id}")
-            break
-    with open(EMPLOYEE_FILE, "w", encoding="utf-8") as f:
-        json.dump(employees, f, indent=4, ensure_ascii=False)
+    import bcrypt  # erst beim Ändern laden, nicht schon beim Import der Login-Seite
+    hashed_pw = bcrypt.hashpw(new_password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    get_repository(DATA_FOLDER).update_record("employees", user_id, {"password": hashed_pw})
+    logging.info(f"Updated password for user: {user_id}")
 
 def check_password(user_id, input_password):
+    import bcrypt
     employees = load_employees()
     for emp in employees:
         if emp["id"] == user_id:
-            return bcrypt.checkpw(input_password.encode("utf-8"), emp["password"].encode("utf-8"))
+            stored_hash = emp.get("password")
+            # Ohne gespeicherten Hash schlägt die Anmeldung fehl
+            return bool(stored_hash) and bcrypt.checkpw(input_password.encode("utf-8"), stored_hash.encode("utf-8"))
     return False
 
 def delete_employee(user_id):
-    employees = load_employees()
-    updated = [emp for emp in employees if emp["id"] != user_id]
-    with open(EMPLOYEE_FILE, "w", encoding="utf-8") as f:
-        json.dump(updated, f, indent=4, ensure_ascii=False)
+    deleted = get_repository(DATA_FOLDER).delete_record("employees", user_id)
     logging.info(f"Deleted employee with ID: {user_id}")
+    return deleted
 
 def update_employee_info(user_id, field, new_value):
-    employees = load_employees()
-    for emp in employees:
-        if emp["id"] == user_id:
-            emp[field] = new_value
-            logging.info(f"Updated {field} for user {user_id} to {new_value}")
-            break
-    with open(EMPLOYEE_FILE, "w", encoding="utf-8") as f:
-        json.dump(employees, f, indent=4, ensure_ascii=False)
+    get_repository(DATA_FOLDER).update_record("employees", user_id, {field: new_value})
+    logging.info(f"Updated {field} for user {user_id} to {new_value}")
 
 # --- VACATION REQUEST UTILS ---
+@instrumented
 def load_vacation_requests():
-    if not os.path.exists(VACATION_FILE):
-        return []
-    try:
-        with open(VACATION_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return []
-    except json.JSONDecodeError:
-        print(f"Error decoding JSON from {VACATION_FILE}. Returning empty list.")
-        return []
+    return get_repository(DATA_FOLDER).load("vacation_requests")
 
+@instrumented
 def save_vacation_requests(requests):
-    if not os.path.exists(DATA_FOLDER):
-        os.makedirs(DATA_FOLDER)
-    with open(VACATION_FILE, "w", encoding="utf-8") as f:
-        json.dump(requests, f, indent=4, ensure_ascii=False)
-
-def calculate_vacation_days(start_date, end_date):
-    """Berechne die Anzahl der Urlaubstage (inklusive Start- und Enddatum)"""
-    return (end_date - start_date).days + 1
+    get_repository(DATA_FOLDER).save("vacation_requests", requests)
 
-def calculate_remaining_vacation(user_id: str, vacation_days_entitled: int = 30) -> int:
-    """Berechnet verbleibenden Urlaub basierend auf gespeicherten Anträgen"""
+def update_vacation_requests(mutate):
+    """Applies ``mutate`` to the current vacation requests under the write lock."""
+    return get_repository(DATA_FOLDER).update("vacation_requests", mutate)
 
-    entries = load_vacation_requests() #To avoid code changes.
-    total_days_taken = 0
+def calculate_vacation_days(start_date, end_date):
+    """Berechne die Anzahl der Urlaubstage (Arbeitstage inklusive Start- und Enddatum, ohne Wochenenden und Feiertage)"""
+    from modules.holidays import working_days  # NumPy erst bei Bedarf laden
+    return int(working_days([start_date], [end_date])[0])
 
+def _approved_vacation_ranges(entries, user_id):
+    """Start- und Enddaten der genehmigten Anträge eines Mitarbeiters (ungültige werden übersprungen)."""
+    starts, ends = [], []
     for entry in entries:
         if entry.get("user_id") == user_id and entry.get("status") == "approved":
             try:
                 start = datetime.strptime(entry["start_date"], "%Y-%m-%d").date()
                 end = datetime.strptime(entry["end_date"], "%Y-%m-%d").date()
-                days = calculate_vacation_days(start, end)
-                total_days_taken += days
             except Exception as e:
                 print(f"Error processing vacation entry: {e}")
                 continue
+            starts.append(start)
+            ends.append(end)
+    return starts, ends
+
+def calculate_remaining_vacation(user_id: str, vacation_days_entitled: int = 30) -> int:
+    """Berechnet verbleibenden Urlaub basierend auf gespeicherten Anträgen"""
+
+    entries = load_vacation_requests() #To avoid code changes.
+    # Arbeitstage aller Anträge in einem Aufruf zählen
+    from modules.holidays import working_days
+    starts, ends = _approved_vacation_ranges(entries, user_id)
+    total_days_taken = int(working_days(starts, ends).sum())
 
     remaining = vacation_days_entitled - total_days_taken
     return max(0, remaining)
 
+@instrumented
 def save_vacation(entry):
-    requests = load_vacation_requests()
-    requests.append(entry)
-    save_vacation_requests(requests)
+    get_repository(DATA_FOLDER).append("vacation_requests", entry)
 
 # --- VACATION STATUS ---
 def update_vacation_status(request_id, new_status):
-    requests = load_vacation_requests()
-    for request in requests:
-        if request.get("id") == request_id:
-            request["status"] = new_status
-            logging.info(f"Updated vacation status for request {request_id} to {new_status} for vacation id: {request_id}")
-            break
-    save_vacation_requests(requests)
+    update_vacation_requests(lambda requests: _update_record(requests, request_id, {"status": new_status}))
+    logging.info(f"Updated vacation status for request {request_id} to {new_status} for vacation id: {request_id}")
+
+def update_vacation_statuses(request_ids, new_status):
+    """
+    Sets the status of several pending vacation requests in one write and
+    returns the updated requests. Ids that do not exist or were already
+    decided in the meantime (e.g. by another admin) are left unchanged and
+    are not returned.
+    """
+    wanted = set(request_ids)
+    timestamp_field = "approved_at" if new_status == "approved" else "rejected_at"
+    changes = {"status": new_status, timestamp_field: datetime.now().isoformat()}
+    updated = []
+
+    def _update(requests):
+        for i, req in enumerate(requests):
+            if req.get("id") in wanted and req.get("status") == "pending":
+                requests[i] = {**req, **changes}
+                updated.append(requests[i])
+
+    if wanted:
+        update_vacation_requests(_update)
+    logging.info(f"Updated vacation status of {len(updated)} requests to {new_status}")
+    return updated
 
 def delete_vacation_request(request_id):
     """Deletes a vacation request based on its unique request ID."""
-    requests = load_vacation_requests()
-    initial_length = len(requests)  # For checking if deletion occurred
-    requests = [req for req in requests if req.get("id") != request_id]
-    if len(requests) < initial_length:
-        save_vacation_requests(requests)
+    deleted = []
+
+    def _delete(requests):
+        remaining = [req for req in requests if req.get("id") != request_id]
+        deleted.append(len(remaining) < len(requests))
+        return remaining
+
+    update_vacation_requests(_delete)
+    if deleted[0]:
         logging.info(f"Deleted vacation request with ID: {request_id}")
         return True  # Indicate success
     else:
@@ -201,81 +258,83 @@ def delete_vacation_request(request_id):
 
 def update_vacation_status_by_data(user_id, start_date, end_date, new_status):
     """Updates vacation status based on user_id, start_date, and end_date."""
-    requests = load_vacation_requests()
-    updated = False
-    for req in requests:
-        if (req.get("user_id") == user_id and
-            req.get("start_date") == start_date and
-            req.get("end_date") == end_date):
-            req["status"] = new_status
-            logging.info(f"Updated vacation status for user {user_id} from {start_date} to {end_date} to {new_status}")
-            updated = True
-            break
-    if updated:
-        save_vacation_requests(requests)
-    return updated
+    updated = []
+
+    def _update(requests):
+        for i, req in enumerate(requests):
+            if (req.get("user_id") == user_id and
+                req.get("start_date") == start_date and
+                req.get("end_date") == end_date):
+                requests[i] = {**req, "status": new_status}
+                logging.info(f"Updated vacation status for user {user_id} from {start_date} to {end_date} to {new_status}")
+                updated.append(True)
+                break
+
+    update_vacation_requests(_update)
+    return bool(updated)
 
 # --- SICK LEAVE UTILS --- # ADD THIS SECTION
 
+@instrumented
 def load_sick_leaves():
-    if not os.path.exists(SICK_FILE):
-        return []
-    try:
-        with open(SICK_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return []
-    except json.JSONDecodeError:
-        print(f"Error decoding JSON from {SICK_FILE}. Returning empty list.")
-        return []
+    return get_repository(DATA_FOLDER).load("sick_leaves")
 
+@instrumented
 def save_sick_leaves(sick_leaves):
-    if not os.path.exists(DATA_FOLDER):
-        os.makedirs(DATA_FOLDER)
-    with open(SICK_FILE, "w", encoding="utf-8") as f:
-        json.dump(sick_leaves, f, indent=4, ensure_ascii=False)
-
+    get_repository(DATA_FOLDER).save("sick_leaves", sick_leaves)
+
+@instrumented
+def save_sick_leave(entry):
+    get_repository(DATA_FOLDER).append("sick_leaves", entry)
+
+
+def _month_segments(start, end):
+    """Splits the inclusive range [start, end] at month boundaries: yields (month, days)."""
+    current = start
+    while current <= end:
+        _, last_day = calendar.monthrange(current.year, current.month)
+        segment_end = min(end, current.replace(day=last_day))
+        yield current.month, (segment_end - current).days + 1
+        current = segment_end + timedelta(days=1)
+
+def _accumulate_absences(records, counts, kind, user_ids, label):
+    for record in records:
+        user_id = record.get("user_id")
+        if user_id not in user_ids:
+            continue
+        try:
+            start = datetime.strptime(record.get("start_date") or record["date"], "%Y-%m-%d").date()
+            end = datetime.strptime(record.get("end_date") or record["end"], "%Y-%m-%d").date()
+        except (KeyError, TypeError, ValueError):
+            print(f"Skipping invalid date in {label}: {record}")
+            continue
+        for month, days in _month_segments(start, end):
+            counts[(user_id, month, kind)] = counts.get((user_id, month, kind), 0) + days
 
 def calculate_absence_statistics(employees, vacation_requests, sick_leaves):
-    """Aggregiert Urlaubs- und Kranktage pro Monat & Mitarbeiter"""
-    data = []
+    """
+    Aggregiert Urlaubs- und Kranktage pro Monat & Mitarbeiter.
+
+    Jeder genehmigte Urlaub und jede Krankmeldung wird einmal an den
+    Monatsgrenzen zerlegt; die Tage werden pro (Mitarbeiter, Monat) summiert.
+    Wie bisher zählen Tage nach Kalendermonat, unabhängig vom Jahr.
+    """
+    user_ids = {emp["id"] for emp in employees}
+    counts = {}
+    _accumulate_absences(
+        (r for r in vacation_requests if r.get("status") == "approved"),
+        counts, "Urlaub", user_ids, "vacation request")
+    _accumulate_absences(sick_leaves, counts, "Krank", user_ids, "sick leave")
 
+    data = []
     for emp in employees:
-        user_id = emp["id"]
-        name = emp["name"]
-        stats = {"Name": name}
-
+        stats = {"Name": emp["name"]}
         for month in range(1, 13):
-            urlaubstage = 0
-            kranktage = 0
-
-            for urlaub in vacation_requests:
-                if urlaub["user_id"] == user_id and urlaub.get("status") == "approved":
-                    try:
-                        start = datetime.strptime(urlaub["start_date"], "%Y-%m-%d").date()
-                        end = datetime.strptime(urlaub["end_date"], "%Y-%m-%d").date()
-                        for d in pd.date_range(start, end):
-                            if d.month == month:
-                                urlaubstage += 1
-                    except ValueError:
-                        print(f"Skipping invalid date in vacation request: {urlaub}")
-
-            for krank in sick_leaves:
-                if krank["user_id"] == user_id:
-                    try:
-                        start = datetime.strptime(krank["start_date"], "%Y-%m-%d").date()
-                        end = datetime.strptime(krank["end_date"], "%Y-%m-%d").date()
-                        for d in pd.date_range(start, end):
-                            if d.month == month:
-                                kranktage += 1
-                    except ValueError:
-                        print(f"Skipping invalid date in sick leave: {krank}")
-
-            stats[f"{month:02d}_Urlaub"] = urlaubstage
-            stats[f"{month:02d}_Krank"] = kranktage
-
+            stats[f"{month:02d}_Urlaub"] = counts.get((emp["id"], month, "Urlaub"), 0)
+            stats[f"{month:02d}_Krank"] = counts.get((emp["id"], month, "Krank"), 0)
         data.append(stats)
 
+    import pandas as pd  # pandas erst für die Auswertungen laden
     return pd.DataFrame(data)
 
 # --- OVERTIME STATISTICS ---
@@ -299,30 +358,68 @@ def calculate_overtime_hours(time_entries, employee_id, year, month):
     return round(total_overtime, 2)
 
 
-def display_overtime_statistics(time_entries, employees):
-    """Displays overtime statistics per employee and month in a table."""
-    st.header("📊 Überstunden Statistik")
+def aggregate_overtime_hours(time_entries):
+    """One pass over all entries: {(year, month, user_id): overtime hours}."""
+    totals = {}
+    for entry in time_entries:
+        if not entry.get("overtime", False):
+            continue
+        try:
+            entry_date = datetime.strptime(entry["check_in"], "%Y-%m-%d %H:%M:%S")
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"Error processing time entry: {e}.  Skipping.")
+            continue
+        key = (entry_date.year, entry_date.month, entry.get("user_id"))
+        totals[key] = totals.get(key, 0) + (entry.get("duration_hours") or 0)
+    return totals
 
-    # Year selection
-    current_year = datetime.now().year
-    year = st.selectbox("Jahr auswählen", list(range(2023, current_year + 2)), index=current_year - 2023)
 
-    # Prepare data for DataFrame
+def overtime_matrix(totals, employees, year):
+    """Employee × month table of overtime hours for one year."""
+    use_german_time_locale()
+    months = [datetime(year, month, 1).strftime("%B") for month in range(1, 13)]  # Month name as key
     data = []
     for employee in employees:
-        employee_id = employee["id"]
-        employee_name = employee["name"]
-        monthly_overtime = {}
-        for month in range(1, 13):
-            overtime_hours = calculate_overtime_hours(time_entries, employee_id, year, month)
-            monthly_overtime[datetime(year, month, 1).strftime("%B")] = overtime_hours  # Month name as key
+        row = {"Employee Name": employee["name"]}
+        for month, month_name in enumerate(months, start=1):
+            row[month_name] = round(totals.get((year, month, str(employee["id"])),
+                                               totals.get((year, month, employee["id"]), 0)), 2)
+        data.append(row)
+    import pandas as pd
+    return pd.DataFrame(data)
+
 
-        # Include the year in the data
-        employee_data = {"Employee Name": employee_name, **monthly_overtime}
-        data.append(employee_data)
+@functools.lru_cache(maxsize=16)
+def _stored_overtime_matrix(data_folder, time_entries_version, employees_version, year):
+    from modules.stats_engine import overtime_by_month
+    employees = get_repository(data_folder).load("employees")
+    return overtime_matrix(overtime_by_month(data_folder), employees, year)
 
-    # Create Pandas DataFrame
-    df = pd.DataFrame(data)
+
+def display_overtime_statistics(time_entries=None, employees=None):
+    """
+    Displays overtime statistics per employee and month in a table.
+
+    Without arguments the table comes from the stored data and is cached per
+    (year, data version), so switching the year does not re-scan the history.
+    Explicitly passed lists are aggregated in a single pass.
+    """
+    st.header("📊 Überstunden Statistik")
+
+    # Year selection
+    current_year = datetime.now().year
+    year = st.selectbox("Jahr auswählen", list(range(2023, current_year + 2)), index=current_year - 2023)
+
+    if time_entries is None and employees is None:
+        repository = get_repository(DATA_FOLDER)
+        df = _stored_overtime_matrix(repository.data_folder, repository.version("time_entries"),
+                                     repository.version("employees"), year)
+    else:
+        if time_entries is None:
+            time_entries = load_time_entries()
+        if employees is None:
+            employees = load_employees()
+        df = overtime_matrix(aggregate_overtime_hours(time_entries), employees, year)
 
     # Display the DataFrame
     st.dataframe(df)
@@ -360,21 +457,47 @@ def get_sick_leave_stats(year=datetime.now().year):
             continue
     return stats
 
+def _entry_timestamp(date_str, value):
+    """Vollständiger Zeitstempel "YYYY-MM-DD HH:MM:SS"; eine bloße Uhrzeit ("09:00") gilt für date_str."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    value = str(value).strip()
+    for fmt in ("%H:%M", "%H:%M:%S"):
+        try:
+            time_of_day = datetime.strptime(value, fmt).time()
+        except ValueError:
+            continue
+        day = datetime.strptime(date_str[:10], "%Y-%m-%d").date()
+        return datetime.combine(day, time_of_day).strftime("%Y-%m-%d %H:%M:%S")
+    return value
+
 def update_time_entry(user_id, date_str, new_checkin, new_checkout):
-    """Updates an existing time entry"""
-    entries = load_time_entries()
-    updated = False
-    for e in entries:
-        if e["user_id"] == user_id and e["check_in"].startswith(date_str):
-            e["check_in"] = new_checkin
-            e["check_out"] = new_checkout
-            logging.info(f"Updated checkin/checkout times for user: {user_id} on date {date_str} to {new_checkin}/{new_checkout}")
-            updated = True
-            break
-    if updated:
-        save_time_entries(entries)
-        return True
-    return False
+    """Updates an existing time entry (bare times like "09:00" refer to ``date_str``)"""
+    new_checkin = _entry_timestamp(date_str, new_checkin)
+    new_checkout = _entry_timestamp(date_str, new_checkout)
+    repository = get_repository(DATA_FOLDER)
+
+    def _matches(e):
+        check_in = e.get("check_in") or e.get("check_in_time")
+        return e.get("user_id") == user_id and isinstance(check_in, str) and check_in.startswith(date_str)
+
+    # Nur die Partition des Tages prüfen; ohne Treffer wird nichts geschrieben
+    if not any(_matches(e) for e in repository.load_range("time_entries", date_str, date_str)):
+        return False
+    updated = []
+
+    def _update(entries):
+        for i, e in enumerate(entries):
+            if _matches(e):
+                entries[i] = {**e, "check_in": new_checkin, "check_out": new_checkout}
+                logging.info(f"Updated checkin/checkout times for user: {user_id} on date {date_str} to {new_checkin}/{new_checkout}")
+                updated.append(True)
+                break
+
+    repository.update("time_entries", _update)
+    return bool(updated)
 
 # --- LOGOUT ---
 def logout():
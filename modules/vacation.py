@@ -5,6 +5,7 @@ import os
 from modules.utils import calculate_remaining_vacation
 from modules.utils import load_vacation_requests
 from modules.utils import load_employees
+from modules.utils import save_vacation as _append_vacation
 from modules.notifications import create_vacation_notification
 
 # Datei für Urlaubsanträge
@@ -12,17 +13,7 @@ VACATION_FILE = "data/vacation_requests.json"
 
 def save_vacation(entry):
     """Speichert einen Urlaubsantrag in der Datei."""
-    if not os.path.exists(VACATION_FILE):
-        with open(VACATION_FILE, "w", encoding="utf-8") as f:
-            json.dump([], f)
-
-    with open(VACATION_FILE, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    data.append(entry)
-
-    with open(VACATION_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+    _append_vacation(entry)
 
 def display_vacation_page():
     st.title("🟡 Urlaubsantrag")
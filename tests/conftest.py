@@ -0,0 +1,6 @@
+import logging
+
+# modules/utils.py ruft beim Import logging.basicConfig(filename="app.log") auf;
+# mit einem Handler am Root-Logger bleibt das wirkungslos und die Tests
+# schreiben nicht in die app.log des Arbeitsverzeichnisses.
+logging.getLogger().addHandler(logging.NullHandler())
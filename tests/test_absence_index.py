@@ -0,0 +1,97 @@
+"""
+Absence index of the calendar: the per-month day -> kind -> user ids map
+must match checking every record for every day of the month (absences over
+month and year ends, overlapping requests, name-only sick leaves and
+unparsable records included).
+"""
+
+import calendar
+import random
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from modules.absence_index import SICK, VACATION, AbsenceIndex, get_absence_index
+from modules.repository import get_repository
+
+EMPLOYEES = [{"id": f"e{i}", "name": f"Mitarbeiter {i}"} for i in range(6)]
+
+
+def _absences(count, seed=4):
+    rng = random.Random(seed)
+    vacations, sick_leaves = [], []
+    for i in range(count):
+        start = date(2024, 10, 1) + timedelta(days=rng.randrange(150))
+        end = start + timedelta(days=rng.randrange(0, 40))
+        user_id = rng.choice(EMPLOYEES)["id"]
+        if i % 2:
+            vacations.append({"id": f"v{i}", "user_id": user_id, "start_date": start.isoformat(),
+                              "end_date": end.isoformat(), "status": rng.choice(["approved", "pending"])})
+        elif i % 3:
+            # Schreibweise der Krankmeldungsseite, teils nur mit Namen
+            record = {"id": f"s{i}", "date": start.isoformat(), "end": end.isoformat()}
+            if rng.random() < 0.5:
+                record["user_id"] = user_id
+            else:
+                record["employee"] = EMPLOYEES[int(user_id[1:])]["name"]
+            sick_leaves.append(record)
+        else:
+            sick_leaves.append({"id": f"s{i}", "user_id": user_id, "start_date": start.isoformat(),
+                                "end_date": end.isoformat()})
+    vacations += [
+        {"id": "bad", "user_id": "e1", "start_date": "2025-01-05", "end_date": "kaputt"},
+        {"id": "reversed", "user_id": "e2", "start_date": "2025-01-10", "end_date": "2025-01-01"},
+        {"id": "no_end", "user_id": "e3", "start_date": "2025-01-10"},
+    ]
+    return vacations, sick_leaves
+
+
+def _naive_month(year, month, vacations, sick_leaves):
+    """Referenz: jeder Tag prüft jeden Datensatz wie früher ist_urlaub/ist_krank."""
+    name_to_id = {emp["name"]: emp["id"] for emp in EMPLOYEES}
+    occupancy = {}
+    for day in range(1, calendar.monthrange(year, month)[1] + 1):
+        current = date(year, month, day)
+        found = {VACATION: set(), SICK: set()}
+        for kind, records in ((VACATION, vacations), (SICK, sick_leaves)):
+            for record in records:
+                start_key = "start_date" if "start_date" in record else "date"
+                end_key = "end_date" if "end_date" in record else "end"
+                try:
+                    start = datetime.strptime(record[start_key], "%Y-%m-%d").date()
+                    end = datetime.strptime(record[end_key], "%Y-%m-%d").date()
+                except (KeyError, ValueError):
+                    continue
+                if start <= current <= end:
+                    user_id = record.get("user_id")
+                    if user_id is None:
+                        user_id = name_to_id.get(record.get("employee"))
+                    found[kind].add(user_id)
+        if found[VACATION] or found[SICK]:
+            occupancy[day] = {kind: frozenset(users) for kind, users in found.items()}
+    return occupancy
+
+
+@pytest.mark.parametrize("year, month", [(2024, 10), (2024, 12), (2025, 1), (2025, 2), (2025, 4), (2025, 6)])
+def test_month_matches_checking_every_day(year, month):
+    vacations, sick_leaves = _absences(120)
+    index = AbsenceIndex(vacations, sick_leaves, EMPLOYEES)
+    expected = _naive_month(year, month, vacations, sick_leaves)
+    assert index.month(year, month) == expected
+
+
+def test_index_follows_the_data_version(tmp_path):
+    folder = str(tmp_path / "data")
+    repository = get_repository(folder)
+    repository.save("employees", EMPLOYEES)
+    repository.save("vacation_requests", [])
+    repository.save("sick_leaves", [{"id": "s1", "employee": "Mitarbeiter 2", "date": "2025-03-30",
+                                     "end": "2025-04-02"}])
+    assert get_absence_index(folder).month(2025, 4) == {
+        day: {VACATION: frozenset(), SICK: frozenset({"e2"})} for day in (1, 2)}
+
+    repository.append("vacation_requests", {"id": "v1", "user_id": "e4", "start_date": "2025-04-02",
+                                            "end_date": "2025-04-03", "status": "approved"})
+    april = get_absence_index(folder).month(2025, 4)
+    assert april[2] == {VACATION: frozenset({"e4"}), SICK: frozenset({"e2"})}
+    assert april[3] == {VACATION: frozenset({"e4"}), SICK: frozenset()}
@@ -0,0 +1,52 @@
+"""
+Absence statistics: the interval sweep of calculate_absence_statistics must
+give the same days per employee and calendar month as the old loop over
+every day of every request (spans over month and year ends, leap years,
+unapproved requests and unknown employees included).
+"""
+
+import pandas as pd
+
+from benchmarks.bench_absence_statistics import absences, legacy_calculate_absence_statistics
+from modules.utils import calculate_absence_statistics
+
+EMPLOYEES = [{"id": "a", "name": "Anna"}, {"id": "b", "name": "Ben"}, {"id": "c", "name": "Cem"}]
+VACATIONS = [
+    {"user_id": "a", "start_date": "2023-12-27", "end_date": "2024-01-03", "status": "approved"},
+    {"user_id": "a", "start_date": "2024-02-26", "end_date": "2024-03-02", "status": "approved"},
+    {"user_id": "a", "start_date": "2025-02-26", "end_date": "2025-03-02", "status": "approved"},
+    {"user_id": "b", "start_date": "2024-05-10", "end_date": "2024-08-20", "status": "approved"},
+    {"user_id": "b", "start_date": "2024-06-01", "end_date": "2024-06-10", "status": "pending"},
+    {"user_id": "b", "start_date": "2024-07-01", "end_date": "2024-07-10", "status": "rejected"},
+    {"user_id": "x", "start_date": "2024-01-01", "end_date": "2024-01-31", "status": "approved"},
+]
+SICK_LEAVES = [
+    {"user_id": "a", "start_date": "2024-01-31", "end_date": "2024-02-01"},
+    {"user_id": "c", "start_date": "2024-12-30", "end_date": "2025-01-02"},
+    {"user_id": "c", "start_date": "2025-04-07", "end_date": "2025-04-07"},
+    {"user_id": "x", "start_date": "2024-03-01", "end_date": "2024-03-05"},
+]
+
+
+def test_sweep_matches_the_day_loop():
+    expected = legacy_calculate_absence_statistics(EMPLOYEES, VACATIONS, SICK_LEAVES)
+    pd.testing.assert_frame_equal(calculate_absence_statistics(EMPLOYEES, VACATIONS, SICK_LEAVES), expected)
+    # Tage zählen nach Kalendermonat: 2023-12-27..31 im Dezember, 2024-01-01..03 im Januar
+    assert expected.loc[0, "12_Urlaub"] == 5 and expected.loc[0, "01_Urlaub"] == 3
+
+
+def test_sweep_matches_the_day_loop_on_generated_data():
+    employees, vacations, sick_leaves = absences(8, 3, seed=5)
+    pd.testing.assert_frame_equal(calculate_absence_statistics(employees, vacations, sick_leaves),
+                                  legacy_calculate_absence_statistics(employees, vacations, sick_leaves))
+
+
+def test_sick_page_keys_and_invalid_records():
+    sick_leaves = [
+        {"user_id": "a", "date": "2024-03-30", "end": "2024-04-02"},  # Schreibweise der Krankmeldungsseite
+        {"user_id": "a", "start_date": "2024-05-01", "end_date": "kaputt"},
+        {"user_id": "b", "start_date": "2024-05-01"},
+    ]
+    result = calculate_absence_statistics(EMPLOYEES, [], sick_leaves)
+    assert result.loc[0, "03_Krank"] == 2 and result.loc[0, "04_Krank"] == 2
+    assert result.drop(columns="Name").to_numpy().sum() == 4
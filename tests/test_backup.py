@@ -0,0 +1,160 @@
+"""
+ZIP backup: backup -> changes -> restore must give back every collection
+as it was (masked passwords keep the current hash), and an archive that
+does not match its manifest must not change anything.
+"""
+
+import os
+import zipfile
+
+import pytest
+
+from modules import backup
+from modules.repository import COLLECTIONS, Repository, get_repository
+
+DATA = {
+    "employees": [
+        {"id": "e1", "name": "Anna", "username": "anna", "password": "$2b$12$anna", "role": "Admin"},
+        {"id": "e2", "name": "Bärbel", "username": "baerbel", "password": "$2b$12$baerbel"},
+        {"id": "e3", "name": "Cem", "username": "cem", "password": ""},
+    ],
+    "users": [{"id": "u1", "user_id": "anna", "name": "Anna", "password_hash": "$2b$12$u1", "role": "Admin"}],
+    "time_entries": [
+        {"id": f"t{i}", "user_id": "e1" if i % 2 else "e2",
+         "check_in": f"2025-{i % 4 + 1:02d}-0{i % 9 + 1} 08:00:00",
+         "check_out": f"2025-{i % 4 + 1:02d}-0{i % 9 + 1} 16:30:00", "note": "Überstunden – Kunde"}
+        for i in range(40)
+    ] + [{"id": "undated", "user_id": "e3"}],
+    "vacation_requests": [{"id": "v1", "user_id": "e1", "start_date": "2025-07-01", "end_date": "2025-07-04",
+                           "status": "approved"}],
+    "sick_leaves": [{"id": "s1", "user_id": "e2", "date": "2025-02-03", "end": "2025-02-05"}],
+    "notifications": [{"id": "n1", "user_id": "e1", "message": "Urlaub genehmigt", "read": False}],
+}
+
+
+@pytest.fixture
+def data_folder(tmp_path):
+    folder = str(tmp_path / "data")
+    repository = get_repository(folder)
+    for name, records in DATA.items():
+        repository.save(name, [dict(r) for r in records])
+    return folder
+
+
+def _state(folder):
+    # Frisch von der Platte gelesen
+    repository = Repository(folder)
+    return {name: sorted(repository.load(name), key=lambda r: r["id"]) for name in COLLECTIONS}
+
+
+def _mtimes(folder):
+    return {os.path.join(root, f): os.stat(os.path.join(root, f)).st_mtime_ns
+            for root, _, files in os.walk(folder) for f in files}
+
+
+def _change_everything(folder):
+    repository = get_repository(folder)
+    repository.update_record("employees", "e1", {"password": "$2b$12$neu", "role": "Mitarbeiter"})
+    repository.delete_record("employees", "e2")
+    repository.append("time_entries", {"id": "t99", "user_id": "e1", "check_in": "2025-05-02 08:00:00"})
+    repository.update("time_entries", lambda records: [r for r in records if r["id"] != "t3"])
+    repository.save("vacation_requests", [])
+    repository.save("notifications", [{"id": "n2", "message": "Neu"}])
+
+
+@pytest.mark.parametrize("compression_level", [0, 9])
+def test_round_trip_restores_every_collection(data_folder, tmp_path, compression_level):
+    before = _state(data_folder)
+    target = str(tmp_path / "backup.zip")
+    _, manifest = backup.write_backup(target, data_folder, compression_level=compression_level,
+                                      include_passwords=True)
+    assert {name: entry["records"] for name, entry in manifest["collections"].items()} == {
+        name: len(records) for name, records in DATA.items()}
+
+    _change_everything(data_folder)
+    restored = backup.restore_backup(target, data_folder)
+
+    assert restored == {name: len(records) for name, records in DATA.items()}
+    assert _state(data_folder) == before
+
+
+def test_masked_passwords_keep_the_current_hash(data_folder, tmp_path):
+    target = str(tmp_path / "backup.zip")
+    backup.write_backup(target, data_folder)
+    with zipfile.ZipFile(target) as archive:
+        assert b"$2b$12$" not in archive.read("employees.jsonl") + archive.read("users.jsonl")
+
+    repository = get_repository(data_folder)
+    repository.update_record("employees", "e1", {"password": "$2b$12$neu", "role": "Mitarbeiter"})
+    repository.save("time_entries", [])
+    backup.restore_backup(target, data_folder)
+    employees = {r["id"]: r for r in Repository(data_folder).load("employees")}
+    assert employees["e1"]["password"] == "$2b$12$neu"  # aktueller Hash bleibt
+    assert employees["e1"]["role"] == "Admin"
+    assert employees["e2"]["password"] == "$2b$12$baerbel"
+    assert employees["e3"]["password"] == ""
+    assert Repository(data_folder).load("users")[0]["password_hash"] == "$2b$12$u1"
+    assert len(Repository(data_folder).load("time_entries")) == len(DATA["time_entries"])
+
+
+def test_masked_passwords_without_a_current_hash_are_refused(data_folder, tmp_path):
+    target = str(tmp_path / "backup.zip")
+    backup.write_backup(target, data_folder)
+
+    # Gelöschter Mitarbeiter: kein Hash zum Übernehmen, nichts wird geschrieben
+    _change_everything(data_folder)
+    changed = _state(data_folder)
+    mtimes = _mtimes(data_folder)
+    with pytest.raises(backup.BackupError, match="e2"):
+        backup.restore_backup(target, data_folder)
+    assert _state(data_folder) == changed
+    assert _mtimes(data_folder) == mtimes
+
+    # Leerer Ordner (z. B. neuer Server): Anmeldung wäre nicht mehr möglich
+    empty = str(tmp_path / "neu")
+    with pytest.raises(backup.BackupError):
+        backup.restore_backup(target, empty)
+    assert all(Repository(empty).load(name) == [] for name in COLLECTIONS)
+
+
+def test_restore_into_an_empty_folder_and_log_in(data_folder, tmp_path, monkeypatch):
+    from modules import utils
+    from modules.data_loader import hash_password
+
+    get_repository(data_folder).update_record("employees", "e1", {"password": hash_password("geheim")})
+    target = str(tmp_path / "backup.zip")
+    backup.write_backup(target, data_folder, include_passwords=True)
+
+    empty = str(tmp_path / "neu")
+    backup.restore_backup(target, empty)
+    monkeypatch.setattr(utils, "DATA_FOLDER", empty)
+    assert utils.check_password("e1", "geheim")
+    assert not utils.check_password("e1", "falsch")
+    # Ohne Passwort-Hash (leer oder fehlend) schlägt die Anmeldung fehl, ohne Ausnahme
+    assert not utils.check_password("e3", "")
+    get_repository(empty).update("employees", lambda records: [
+        {k: v for k, v in r.items() if k != "password"} if r["id"] == "e3" else r for r in records])
+    assert not utils.check_password("e3", "geheim")
+
+
+def test_tampered_archive_changes_nothing(data_folder, tmp_path):
+    target = str(tmp_path / "backup.zip")
+    backup.write_backup(target, data_folder, include_passwords=True)
+    tampered = str(tmp_path / "tampered.zip")
+    with zipfile.ZipFile(target) as source, zipfile.ZipFile(tampered, "w") as archive:
+        for item in source.infolist():
+            content = source.read(item)
+            if item.filename == "time_entries.jsonl":
+                content = content.replace(b"16:30:00", b"18:30:00", 1)
+            archive.writestr(item, content)
+
+    _change_everything(data_folder)
+    changed = _state(data_folder)
+    mtimes = _mtimes(data_folder)
+
+    with pytest.raises(backup.BackupError):
+        backup.restore_backup(tampered, data_folder)
+    with pytest.raises(backup.BackupError):
+        backup.restore_backup(__file__, data_folder)  # keine ZIP-Datei
+    assert _state(data_folder) == changed
+    assert _mtimes(data_folder) == mtimes
@@ -0,0 +1,63 @@
+"""
+Calendar cache: rendering a month and computing its cache key must read only
+that month's partition of the time entries; writes to other months keep the
+cached table, writes to the month itself replace it.
+"""
+
+from datetime import date
+
+import pytest
+
+from modules import calendar as calendar_page
+from modules.repository import Repository, get_repository
+
+EMPLOYEES = [{"id": "e1", "name": "Anna"}, {"id": "e2", "name": "Ben"}]
+
+
+def _entry(entry_id, user_id, day, hours):
+    return {"id": entry_id, "user_id": user_id, "check_in": f"{day} 08:00:00",
+            "check_out": f"{day} {8 + hours:02d}:00:00", "overtime": hours > 8}
+
+
+@pytest.fixture
+def data_folder(tmp_path):
+    folder = str(tmp_path / "data")
+    # Geschrieben über ein eigenes Repository, damit get_repository kalt startet
+    writer = Repository(folder)
+    writer.save("employees", EMPLOYEES)
+    writer.save("vacation_requests", [{"id": "v1", "user_id": "e2", "start_date": "2025-03-10",
+                                       "end_date": "2025-03-11", "status": "approved"}])
+    writer.save("sick_leaves", [])
+    writer.save("time_entries", [_entry(f"t{m}", "e1", f"2025-{m:02d}-04", 9) for m in range(1, 7)])
+    return folder
+
+
+def _render(folder, month):
+    repository = get_repository(folder)
+    version = calendar_page._calendar_version(repository, 2025, month)
+    return version, calendar_page._calendar_html(repository.data_folder, version, 2025, month, True, True, True,
+                                                 None, date(2025, 1, 1))
+
+
+def test_month_reads_only_its_partition(data_folder):
+    _, html = _render(data_folder, 3)
+    assert "Ü1" in html and "U1" in html
+    store = get_repository(data_folder).partition_store("time_entries")
+    assert set(store._partitions) == {"2025-03"}
+
+
+def test_cache_key_follows_the_visible_month(data_folder):
+    version, html = _render(data_folder, 3)
+    repository = get_repository(data_folder)
+
+    repository.append("time_entries", _entry("j", "e2", "2025-01-20", 10))
+    assert _render(data_folder, 3) == (version, html)
+
+    repository.append("time_entries", _entry("m", "e2", "2025-03-04", 10))
+    new_version, new_html = _render(data_folder, 3)
+    assert new_version != version
+    assert "Ü2" in new_html
+
+    repository.append("vacation_requests", {"id": "v2", "user_id": "e1", "start_date": "2025-03-20",
+                                            "end_date": "2025-03-20", "status": "approved"})
+    assert _render(data_folder, 3)[0] != new_version
@@ -0,0 +1,84 @@
+"""
+Column store of the time entries: the arrays must hold the same values as
+the JSON records, and an append must rebuild the columns of its month only.
+"""
+
+import os
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from modules import columnar
+from modules.repository import get_repository
+
+RECORDS = [
+    {"id": "a", "user_id": "u1", "check_in": "2025-01-06 08:00:00", "check_out": "2025-01-06 17:30:00",
+     "duration_hours": 9.5, "location": "Home Office", "overtime": True},
+    {"id": "b", "user_id": "u2", "check_in": "2025-01-07 07:00:00", "check_out": "2025-01-07 12:00:00",
+     "location": "WS107"},
+    {"id": "c", "user_id": "u1", "check_in_time": "2025-02-03T09:00:00", "check_out_time": "2025-02-03T18:15:00"},
+    {"id": "d", "user_id": "u3", "check_in": "2025-02-04 08:00:00", "check_out": None,
+     "duration_hours": 7.25, "overtime": False},
+]
+
+
+def _epoch(value):
+    if not value:
+        return columnar.MISSING_TIME
+    return int((datetime.fromisoformat(value) - datetime(1970, 1, 1)).total_seconds())
+
+
+def _expected(records, columns):
+    """Referenz: die Spalten Zeile für Zeile aus den Datensätzen berechnet."""
+    rows = []
+    for r in records:
+        check_in = _epoch(r.get("check_in") or r.get("check_in_time"))
+        check_out = _epoch(r.get("check_out") or r.get("check_out_time"))
+        duration = r.get("duration_hours")
+        if duration is None and columnar.MISSING_TIME not in (check_in, check_out):
+            duration = (check_out - check_in) / 3600
+        overtime = r["overtime"] if "overtime" in r else (duration or 0) > columnar.OVERTIME_HOURS
+        rows.append((r["user_id"], r.get("location"), check_in, check_out,
+                     np.nan if duration is None else duration, bool(overtime)))
+    return rows
+
+
+def _actual(columns):
+    return [(columns.users[columns.user[i]], columns.locations[columns.location[i]] if columns.location[i] >= 0
+             else None, int(columns.check_in[i]), int(columns.check_out[i]), columns.duration[i],
+             bool(columns.overtime[i])) for i in range(len(columns))]
+
+
+@pytest.fixture
+def data_folder(tmp_path):
+    folder = str(tmp_path / "data")
+    get_repository(folder).save("time_entries", [dict(r) for r in RECORDS])
+    return folder
+
+
+def test_columns_hold_the_record_values(data_folder):
+    columns = columnar.load_columns(data_folder=data_folder)
+    np.testing.assert_equal(_actual(columns), _expected(RECORDS, columns))
+
+    february = columnar.load_columns("2025-02-01", "2025-02-28", data_folder=data_folder)
+    np.testing.assert_equal(_actual(february), _expected(RECORDS[2:], february))
+
+
+def test_append_rebuilds_only_its_month(data_folder):
+    columnar.load_columns(data_folder=data_folder)
+    store = columnar._stores[os.path.abspath(data_folder)]
+    meta = {key: os.stat(os.path.join(store.directory, key, columnar.META_FILE)).st_mtime_ns
+            for key in ("2025-01", "2025-02")}
+    codes = list(store.dictionaries()["users"])
+
+    new = {"id": "e", "user_id": "u4", "check_in": "2025-02-05 08:00:00", "check_out": "2025-02-05 16:00:00",
+           "duration_hours": 8.0, "location": "WS39"}
+    get_repository(data_folder).append("time_entries", dict(new))
+    columns = columnar.load_columns(data_folder=data_folder)
+
+    np.testing.assert_equal(_actual(columns), _expected(RECORDS + [new], columns))
+    assert os.stat(os.path.join(store.directory, "2025-01", columnar.META_FILE)).st_mtime_ns == meta["2025-01"]
+    assert os.stat(os.path.join(store.directory, "2025-02", columnar.META_FILE)).st_mtime_ns != meta["2025-02"]
+    # Vergebene Codes bleiben gültig, der neue Mitarbeiter wird angehängt
+    assert store.dictionaries()["users"] == codes + ["u4"]
@@ -0,0 +1,121 @@
+"""
+Stress tests for concurrent writers: many sessions punching, approving and
+reading at the same time must neither lose records nor observe a truncated
+file.
+"""
+
+import json
+import os
+import threading
+
+import pytest
+
+from modules import utils
+from modules.repository import Repository
+
+THREADS = 16
+PUNCHES_PER_THREAD = 25
+JOIN_TIMEOUT = 60
+
+
+@pytest.fixture
+def data_folder(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils, "DATA_FOLDER", str(tmp_path))
+    return tmp_path
+
+
+def _run_threads(target, count=THREADS, stop=None):
+    """Runs ``target(index)`` in ``count`` threads; every thread that ends (also by failing) sets ``stop``."""
+    errors = []
+    barrier = threading.Barrier(count)
+
+    def runner(index):
+        try:
+            barrier.wait()
+            target(index)
+        except Exception as e:  # pragma: no cover - nur zur Diagnose
+            errors.append(e)
+        finally:
+            if stop is not None:
+                stop.set()
+
+    threads = [threading.Thread(target=runner, args=(i,), daemon=True) for i in range(count)]
+    try:
+        for t in threads:
+            t.start()
+    finally:
+        for t in threads:
+            if t.ident is not None:
+                t.join(JOIN_TIMEOUT)
+    assert not errors, errors
+    assert not any(t.is_alive() for t in threads), f"Threads nach {JOIN_TIMEOUT} s nicht beendet"
+
+
+def test_concurrent_punches_are_all_persisted(data_folder):
+    def punch(index):
+        for n in range(PUNCHES_PER_THREAD):
+            utils.save_time_entry({
+                "user_id": f"user-{index}",
+                "check_in": "2025-04-01 08:00:00",
+                "check_out": "2025-04-01 16:00:00",
+                "duration_hours": 8.0,
+                "seq": n,
+            })
+
+    _run_threads(punch)
+
+    # Ein frisches Repository liest nur von der Platte
+    entries = Repository(str(data_folder)).load("time_entries")
+    assert len(entries) == THREADS * PUNCHES_PER_THREAD
+    assert len({e["id"] for e in entries}) == len(entries)
+
+
+def test_concurrent_status_updates_and_appends_do_not_lose_data(data_folder):
+    utils.save_vacation_requests([
+        {"id": f"req-{i}", "user_id": f"user-{i}", "start_date": "2025-07-01",
+         "end_date": "2025-07-05", "status": "pending"}
+        for i in range(THREADS)
+    ])
+
+    def work(index):
+        utils.update_vacation_status(f"req-{index}", "approved")
+        utils.save_vacation({"id": f"new-{index}", "user_id": f"user-{index}", "status": "pending"})
+
+    _run_threads(work)
+
+    requests = Repository(str(data_folder)).load("vacation_requests")
+    by_id = {r["id"]: r for r in requests}
+    assert len(requests) == 2 * THREADS
+    assert all(by_id[f"req-{i}"]["status"] == "approved" for i in range(THREADS))
+    assert all(f"new-{i}" in by_id for i in range(THREADS))
+
+
+def test_readers_never_see_a_truncated_file(data_folder):
+    records = [{"id": f"sick-{i}", "user_id": "u", "note": "x" * 200} for i in range(500)]
+    utils.save_sick_leaves(records)
+    path = os.path.join(str(data_folder), "sick_leaves.json")
+    stop = threading.Event()
+
+    def write(index):
+        while not stop.is_set():
+            utils.save_sick_leaves(records)
+
+    def read(index):
+        for _ in range(200):
+            with open(path, "r", encoding="utf-8") as f:
+                assert len(json.load(f)) == len(records)
+
+    # Jeder beendete Leser (auch nach einem Fehlschlag) hält die Schreiber an
+    _run_threads(lambda i: write(i) if i % 2 else read(i), count=4, stop=stop)
+
+
+def test_corrupt_file_is_not_overwritten(data_folder):
+    path = os.path.join(str(data_folder), "vacation_requests.json")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('[{"id": "req-1", "status": "pend')
+
+    assert utils.load_vacation_requests() == []
+    with pytest.raises(ValueError):
+        utils.update_vacation_status("req-1", "approved")
+    with open(path, "r", encoding="utf-8") as f:
+        assert f.read().startswith('[{"id": "req-1"')
@@ -0,0 +1,146 @@
+"""
+Streaming CSV export: unfiltered files must be byte-identical to the former
+pandas export of the admin page; date and employee filters must select the
+same rows as filtering the records directly.
+"""
+
+import csv
+import io
+import os
+import random
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from modules import export
+from modules.repository import Repository, get_repository
+
+EMPLOYEES = [
+    {"id": "e1", "name": "Anna", "username": "anna", "password": "hash1", "role": "Admin"},
+    {"id": "e2", "name": "Ben", "username": "ben", "password": "hash2"},
+    {"id": "e3", "name": "Cem, Jr.", "username": "cem", "email": "cem@example.com"},
+]
+
+
+def _time_entries(count, seed=12):
+    rng = random.Random(seed)
+    entries = []
+    for i in range(count):
+        check_in = datetime(2025, 1, 1, 7) + timedelta(days=rng.randrange(120), minutes=rng.randrange(300))
+        entry = {"id": f"t{i}", "user_id": rng.choice(["e1", "e2", "e3", "x"]),
+                 "check_in": check_in.strftime("%Y-%m-%d %H:%M:%S")}
+        if rng.random() < 0.8:
+            hours = rng.randrange(12, 44) / 4
+            entry["check_out"] = (check_in + timedelta(hours=hours)).strftime("%Y-%m-%d %H:%M:%S")
+            entry["duration_hours"] = hours
+            entry["overtime"] = hours > 8
+        if rng.random() < 0.5:
+            entry["location"] = rng.choice(["Home Office", "WS107", "WS39"])
+        if rng.random() < 0.2:
+            entry["note"] = rng.choice(["Kundentermin", 'Notiz mit "Anführungszeichen"', "Zeile\nzwei"])
+        entries.append(entry)
+    return entries
+
+
+VACATIONS = [
+    {"id": "v1", "user_id": "e1", "start_date": "2025-01-30", "end_date": "2025-02-03", "status": "approved"},
+    {"id": "v2", "user_id": "e2", "start_date": "2025-03-01", "end_date": "2025-03-05"},
+    {"id": "v3", "user_id": "x", "start_date": "2025-04-01", "end_date": "2025-04-01", "status": "rejected"},
+]
+SICK_LEAVES = [
+    {"id": "s1", "user_id": "e3", "start_date": "2025-02-10", "end_date": "2025-02-12", "reason": "Grippe"},
+    {"id": "s2", "user_id": "e1", "date": "2025-03-03", "end": "2025-03-04"},
+]
+
+
+# --- Referenz: der frühere pandas-Export der Admin-Seite ---
+def _pandas_csv(rows):
+    return pd.DataFrame(rows).to_csv(index=False).encode("utf-8")
+
+
+def _legacy_export(export_type, employees, entries, vacations, sick_leaves):
+    employee_map = {emp["id"]: emp["name"] for emp in employees}
+    if export_type == "Mitarbeiterdaten":
+        return _pandas_csv([{**emp, "password": "********"} if "password" in emp else emp for emp in employees])
+    if export_type == "Urlaubsanträge":
+        return _pandas_csv([{
+            "Mitarbeiter": employee_map.get(r.get("user_id"), "Unbekannt"), "Von": r.get("start_date", "N/A"),
+            "Bis": r.get("end_date", "N/A"), "Status": r.get("status", "pending"), "ID": r.get("id", "N/A"),
+        } for r in vacations])
+    if export_type == "Krankmeldungen":
+        return _pandas_csv([{
+            "Mitarbeiter": employee_map.get(r.get("user_id"), "Unbekannt"), "Von": r.get("start_date", "N/A"),
+            "Bis": r.get("end_date", "N/A"), "Grund": r.get("reason", "Nicht angegeben"), "ID": r.get("id", "N/A"),
+        } for r in sick_leaves])
+    return _pandas_csv([{
+        "Mitarbeiter": employee_map.get(e.get("user_id"), "Unbekannt"), "Check-in": e.get("check_in", "N/A"),
+        "Check-out": e.get("check_out", "N/A"), "Dauer (Stunden)": e.get("duration_hours", "N/A"),
+        "Standort": e.get("location", "N/A"), "Überstunden": "Ja" if e.get("overtime", False) else "Nein",
+        "Notiz": e.get("note", ""),
+    } for e in entries])
+
+
+@pytest.fixture
+def data_folder(tmp_path):
+    folder = str(tmp_path / "data")
+    repository = get_repository(folder)
+    repository.save("employees", EMPLOYEES)
+    repository.save("time_entries", _time_entries(300))
+    repository.save("vacation_requests", VACATIONS)
+    repository.save("sick_leaves", SICK_LEAVES)
+    return folder
+
+
+def _read(path):
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    finally:
+        export.remove_export(path)
+
+
+@pytest.mark.parametrize("export_type", ["Mitarbeiterdaten", "Urlaubsanträge", "Krankmeldungen",
+                                         "Arbeitszeiterfassung"])
+def test_unfiltered_export_matches_the_pandas_export(data_folder, export_type):
+    # Frisch gelesen wie beim früheren load_time_entries: Partitionsreihenfolge (nach Monat)
+    entries = Repository(data_folder).load("time_entries")
+    expected = _legacy_export(export_type, EMPLOYEES, entries, VACATIONS, SICK_LEAVES)
+
+    path, count = export.export_csv(export_type, data_folder=data_folder)
+    assert _read(path) == expected
+    assert not os.path.exists(path)
+    assert count == len(pd.read_csv(io.BytesIO(expected)))
+
+
+def test_filters_select_the_matching_rows(data_folder):
+    entries = Repository(data_folder).load("time_entries")
+
+    path, count = export.export_csv("Arbeitszeiterfassung", "2025-02-01", "2025-02-28", ["e1", "x"],
+                                    data_folder=data_folder)
+    content = _read(path)
+    rows = list(csv.reader(io.StringIO(content.decode("utf-8"))))
+    expected = [e for e in entries
+                if e["user_id"] in ("e1", "x") and "2025-02-01" <= e["check_in"][:10] <= "2025-02-28"]
+    assert rows[0] == export.TIME_ENTRY_COLUMNS
+    assert count == len(rows) - 1 == len(expected) > 0
+    assert [row[1] for row in rows[1:]] == [e["check_in"] for e in expected]
+    assert {row[0] for row in rows[1:]} == {"Anna", "Unbekannt"}
+    # Kleinere Blöcke ändern die Datei nicht
+    path, _ = export.write_csv(iter(rows[1:]), rows[0], chunk_rows=3)
+    assert _read(path) == content
+
+    # Abwesenheiten: Überschneidung mit dem Zeitraum, auch mit date/end-Schlüsseln
+    path, count = export.export_csv("Krankmeldungen", "2025-03-04", "2025-03-31", data_folder=data_folder)
+    rows = list(csv.reader(io.StringIO(_read(path).decode("utf-8"))))
+    assert count == 1 and rows[1][0] == "Anna" and rows[1][-1] == "s2"
+    path, count = export.export_csv("Urlaubsanträge", "2025-02-03", "2025-03-01", ["e1", "e2"],
+                                    data_folder=data_folder)
+    assert [row[-1] for row in list(csv.reader(io.StringIO(_read(path).decode("utf-8"))))[1:]] == ["v1", "v2"]
+
+    path, count = export.export_csv("Mitarbeiterdaten", user_ids=["e2"], data_folder=data_folder)
+    rows = list(csv.reader(io.StringIO(_read(path).decode("utf-8"))))
+    assert count == 1 and rows[1][rows[0].index("password")] == "********"
+
+    with pytest.raises(ValueError):
+        export.export_csv("Unbekannt", data_folder=data_folder)
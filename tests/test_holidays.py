@@ -0,0 +1,83 @@
+"""
+Holiday engine: Easter and the movable feasts derived from it, the Hamburg
+holidays of a whole year, and working_days over ranges that cross year
+boundaries (compared with counting day by day).
+"""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from modules.holidays import easter_sunday, holidays, is_holiday, working_days
+
+
+@pytest.mark.parametrize("year, expected", [
+    (1943, date(1943, 4, 25)),  # spätestmöglicher Ostersonntag
+    (1961, date(1961, 4, 2)),
+    (2008, date(2008, 3, 23)),
+    (2019, date(2019, 4, 21)),
+    (2024, date(2024, 3, 31)),
+    (2025, date(2025, 4, 20)),
+    (2026, date(2026, 4, 5)),
+    (2038, date(2038, 4, 25)),
+    (2285, date(2285, 3, 22)),  # frühestmöglicher Ostersonntag
+])
+def test_easter_sunday(year, expected):
+    assert easter_sunday(year) == expected
+
+
+def test_hamburg_holidays_2025():
+    assert holidays(2025, "HH") == {
+        "2025-01-01": "Neujahr",
+        "2025-04-18": "Karfreitag",
+        "2025-04-21": "Ostermontag",
+        "2025-05-01": "Tag der Arbeit",
+        "2025-05-29": "Himmelfahrt",
+        "2025-06-09": "Pfingstmontag",
+        "2025-10-03": "Tag der Deutschen Einheit",
+        "2025-10-31": "Reformationstag",
+        "2025-12-25": "Weihnachten",
+        "2025-12-26": "2. Weihnachtstag",
+    }
+
+
+def test_movable_and_state_holidays():
+    # Ostern 2024 im März: Karfreitag und Ostermontag um den Monatswechsel
+    assert holidays(2024, "HH")["2024-03-29"] == "Karfreitag"
+    assert holidays(2024, "HH")["2024-04-01"] == "Ostermontag"
+    assert holidays(2025, "BY")["2025-06-19"] == "Fronleichnam"
+    assert holidays(2025, "SN")["2025-11-19"] == "Buß- und Bettag"
+    assert holidays(2025, "BB")["2025-06-08"] == "Pfingstsonntag"
+    # Reformationstag in Hamburg erst seit 2018, 2017 einmalig bundesweit
+    assert not is_holiday(date(2016, 10, 31), "HH")
+    assert is_holiday(date(2017, 10, 31), "BY")
+    assert not is_holiday(date(2018, 10, 31), "BY")
+    with pytest.raises(ValueError):
+        holidays(2025, "XX")
+
+
+def _count_working_days(start, end, state):
+    """Referenz: Tag für Tag Montag bis Freitag ohne Feiertage."""
+    count = 0
+    day = start
+    while day <= end:
+        if day.weekday() < 5 and not is_holiday(day, state):
+            count += 1
+        day += timedelta(days=1)
+    return count
+
+
+def test_working_days_across_year_boundaries():
+    # 2024-12-23 .. 2025-01-03: zwei Weihnachtstage und Neujahr fallen weg
+    assert working_days(["2024-12-23"], ["2025-01-03"]).tolist() == [7]
+    # Rückwärts liegende Bereiche zählen 0, ein leerer Aufruf ergibt ein leeres Array
+    assert working_days([date(2025, 1, 10)], [date(2025, 1, 6)]).tolist() == [0]
+    assert working_days([], []).size == 0
+
+    rng = random.Random(6)
+    for state in ("HH", "BY", "SN"):
+        starts = [date(2023, 11, 1) + timedelta(days=rng.randrange(500)) for _ in range(60)]
+        ends = [start + timedelta(days=rng.randrange(-3, 120)) for start in starts]
+        expected = [_count_working_days(s, e, state) for s, e in zip(starts, ends)]
+        assert working_days(starts, ends, state).tolist() == expected
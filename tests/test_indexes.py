@@ -0,0 +1,125 @@
+"""
+Indexed query evaluation: hash and sorted index lookups (also after the
+index was extended by appends) must return the same records in the same
+order as a linear scan over the records. The employee search index must
+find the same records as a substring test on every record.
+"""
+
+import random
+import re
+from datetime import datetime, timedelta
+
+import pytest
+
+from modules.indexes import FIELD_ALIASES, SEARCH_FIELDS, CollectionIndex, SearchIndex
+from modules.models_json import BaseQuery, CheckIn
+from modules.query import Predicate
+
+ALIASES = FIELD_ALIASES["time_entries"]
+
+
+def _entries(count, seed=7):
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1, 7)
+    entries = []
+    for i in range(count):
+        check_in = start + timedelta(days=rng.randrange(90), minutes=rng.randrange(600))
+        # Beide Schreibweisen der Check-in-Seite und des Modells, teils ohne Check-out
+        key = "check_in" if i % 3 else "check_in_time"
+        entry = {"id": f"t{i}", "user_id": f"u{rng.randrange(8)}", key: check_in.strftime("%Y-%m-%d %H:%M:%S")}
+        if rng.random() < 0.8:
+            entry["check_out"] = (check_in + timedelta(hours=8)).isoformat()
+        if rng.random() < 0.3:
+            entry["status"] = rng.choice(["open", "closed"])
+        entries.append(entry)
+    return entries
+
+
+PREDICATES = [
+    [CheckIn.user_id == "u3"],
+    [CheckIn.user_id.in_(["u1", "u5", "fehlt"])],
+    [CheckIn.check_in_time.between(datetime(2025, 2, 1), datetime(2025, 2, 28, 23, 59))],
+    [CheckIn.check_in_time < datetime(2025, 1, 15)],
+    [CheckIn.check_in_time >= "2025-03-10"],
+    [CheckIn.user_id == "u2", CheckIn.check_in_time > datetime(2025, 2, 1)],
+    [CheckIn.check_out_time.is_(None)],
+    [CheckIn.check_out_time.isnot(None), CheckIn.user_id != "u0"],
+    [Predicate("status", "==", "open")],
+    [Predicate("id", "==", "t17")],
+]
+
+
+def _results(records, predicates, index=None, order=None):
+    query = BaseQuery(records, index=index, aliases=ALIASES).filter(*predicates)
+    if order is not None:
+        query = query.order_by(order)
+    return [r["id"] for r in query.all()], query.count()
+
+
+@pytest.mark.parametrize("predicates", PREDICATES)
+def test_index_lookups_match_a_linear_scan(predicates):
+    records = _entries(400)
+    index = CollectionIndex(records, ALIASES)
+    for order in (None, CheckIn.check_in_time.desc()):
+        assert _results(records, predicates, index, order) == _results(records, predicates, None, order)
+
+
+@pytest.mark.parametrize("predicates", PREDICATES)
+def test_extended_index_matches_a_linear_scan(predicates):
+    records = _entries(300)
+    index = CollectionIndex(records, ALIASES)
+    # Indizes aufbauen, dann anhängen wie beim Journal
+    for field in ("id", "user_id", "status"):
+        index.hash_index(field)
+    for field in ("check_in_time", "check_out_time"):
+        index.sorted_index(field)
+    records.extend(_entries(120, seed=11))
+    for i, record in enumerate(records[300:]):
+        record["id"] = f"n{i}"
+    index.extend()
+
+    assert _results(records, predicates, index) == _results(records, predicates)
+
+
+def test_range_lookup_returns_positions_in_value_order():
+    records = _entries(50)
+    index = CollectionIndex(records, ALIASES)
+    positions = index.range("check_in_time", "2025-02-01", "2025-03-01")
+    values = [index.value(p, "check_in_time") for p in positions]
+    assert values == sorted(values)
+    assert set(positions) == {p for p in range(len(records))
+                              if "2025-02-01" <= index.value(p, "check_in_time") <= "2025-03-01"}
+
+
+def _employees(count, seed=5):
+    rng = random.Random(seed)
+    first = ["Anna", "Jörg", "Hans-Peter", "Maria", "Ömer", "Lisa", "Hoffmann"]
+    last = ["Hoffmann", "Neumann", "Schmidt", "Meier", "Mann", "Ăžič"]
+    employees = []
+    for i in range(count):
+        name = f"{rng.choice(first)} {rng.choice(last)}"
+        employee = {"id": f"e{i}", "name": name, "username": name.split()[0].lower() + str(i)}
+        if rng.random() < 0.7:
+            employee["email"] = f"{employee['username']}@firma-{rng.choice(['nord', 'sued'])}.de"
+        if rng.random() < 0.5:
+            employee["team"] = rng.choice(["Support", "Entwicklung", None])
+        employees.append(employee)
+    return employees
+
+
+@pytest.mark.parametrize("query", ["", "  ", "a", "ö", "an", "mann", "MANN", "hoff", "offm", "ann nE",
+                                   "@firma-s", "e1", "nord.de", "peter h", "xyz", "entwicklungen", "-"])
+def test_search_matches_a_substring_scan(query):
+    employees = _employees(300)
+    index = SearchIndex(employees, SEARCH_FIELDS["employees"])
+    texts = ["\n".join(str(e.get(f) or "") for f in SEARCH_FIELDS["employees"]).lower() for e in employees]
+    needle = query.strip().lower()
+
+    positions = index.search(query)
+    assert len(positions) == len(set(positions))
+    assert sorted(positions) == [i for i, text in enumerate(texts) if needle in text]
+    # Wortanfänge zuerst, danach die übrigen Treffer in Datensatzreihenfolge
+    starts_word = [any(word.startswith(needle) for word in re.findall(r"\w+", texts[i])) for i in positions]
+    assert starts_word == sorted(starts_word, reverse=True)
+    rest = [p for p, prefix in zip(positions, starts_word) if not prefix]
+    assert rest == sorted(rest)
@@ -0,0 +1,101 @@
+"""
+Replay of the JSONL journal: appends, single-record upserts and deletes and
+torn last lines must give the same collection as rewriting the whole array.
+"""
+
+import json
+import os
+
+from modules import journal
+from modules.repository import Repository
+
+
+def _apply(records, ops):
+    """Referenz: dieselben Änderungen direkt auf die Liste angewendet (wie beim Umschreiben)."""
+    records = [dict(r) for r in records]
+    for op, record in ops:
+        position = next((i for i, r in enumerate(records) if r["id"] == record["id"]), None)
+        if op == journal.DELETE:
+            if position is not None:
+                del records[position]
+        elif position is None:
+            records.append(record)
+        else:
+            records[position] = record
+    return records
+
+
+def _write_journal(path, lines):
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(json.dumps(line) + "\n" for line in lines)
+
+
+def test_replay_matches_rewriting_the_array(tmp_path):
+    array_path = str(tmp_path / "employees.json")
+    base = [{"id": f"e{i}", "name": f"Name {i}"} for i in range(5)]
+    journal.write_json_atomic(array_path, base)
+    ops = [
+        (journal.UPSERT, {"id": "e1", "name": "Neu 1"}),
+        (journal.UPSERT, {"id": "e9", "name": "Neu 9"}),
+        (journal.DELETE, {"id": "e0"}),
+        (journal.UPSERT, {"id": "e9", "name": "Neu 9b"}),
+        (journal.DELETE, {"id": "e9"}),
+        (journal.UPSERT, {"id": "e7", "name": "Neu 7"}),
+        (journal.DELETE, {"id": "fehlt"}),
+    ]
+    journal_path = journal.journal_path_for(array_path)
+    for op, record in ops:
+        journal.append_record(journal_path, journal.journal_op(op, record))
+    # Einfaches Anhängen ohne _op
+    journal.append_record(journal_path, {"id": "e8", "name": "Angehängt"})
+
+    expected = _apply(base, ops) + [{"id": "e8", "name": "Angehängt"}]
+    assert journal.load_journaled(array_path) == expected
+
+
+def test_torn_last_line_is_skipped(tmp_path):
+    array_path = str(tmp_path / "time_entries.json")
+    journal.write_json_atomic(array_path, [{"id": "a"}])
+    journal_path = journal.journal_path_for(array_path)
+    journal.append_record(journal_path, {"id": "b"})
+    with open(journal_path, "a", encoding="utf-8") as f:
+        f.write('{"id": "c", "check_in": "2025-')  # Absturz mitten im Schreiben
+
+    assert journal.load_journaled(array_path) == [{"id": "a"}, {"id": "b"}]
+
+
+def test_replay_after_interrupted_compaction_is_idempotent(tmp_path):
+    array_path = str(tmp_path / "employees.json")
+    records = [{"id": "a", "v": 1}, {"id": "b", "v": 2}]
+    journal.write_json_atomic(array_path, records)
+    # Das Journal wurde nach dem Umbenennen nicht mehr gelöscht
+    _write_journal(journal.journal_path_for(array_path), [
+        {"id": "b", "v": 2},
+        journal.journal_op(journal.UPSERT, {"id": "a", "v": 1}),
+    ])
+
+    assert journal.load_journaled(array_path) == records
+
+
+def test_repository_record_edits_survive_a_fresh_read(tmp_path):
+    folder = str(tmp_path)
+    base = [{"id": f"e{i}", "name": f"Name {i}", "role": "Mitarbeiter"} for i in range(4)]
+    repository = Repository(folder)
+    repository.save("employees", base)
+
+    repository.update_record("employees", "e2", {"role": "Admin"})
+    repository.delete_record("employees", "e0")
+    repository.append("employees", {"id": "e4", "name": "Name 4", "role": "Mitarbeiter"})
+    assert repository.update_record("employees", "fehlt", {"role": "Admin"}) is None
+
+    expected = [base[1], {**base[2], "role": "Admin"}, base[3],
+                {"id": "e4", "name": "Name 4", "role": "Mitarbeiter"}]
+    assert repository.load("employees") == expected
+    # Einzelne Zeilen im Journal statt Umschreiben der Datei
+    assert os.path.exists(os.path.join(folder, "employees.jsonl"))
+    assert Repository(folder).load("employees") == expected
+
+    # Kompaktieren schreibt denselben Stand zurück ins Array
+    repository.save("employees", repository.load("employees"))
+    assert not os.path.exists(os.path.join(folder, "employees.jsonl"))
+    assert Repository(folder).load("employees") == expected
@@ -0,0 +1,177 @@
+"""
+Login helpers: failed attempts lock an account after MAX_LOGIN_ATTEMPTS
+until a success or reset, verify_password only accepts the matching bcrypt
+hash, and the password change and admin pages check their inputs and the
+role of the logged-in user.
+"""
+
+import json
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("streamlit.testing.v1")
+from streamlit.testing.v1 import AppTest
+
+from modules import login, utils
+from modules.data_loader import hash_password
+from modules.repository import get_repository
+
+
+@pytest.fixture
+def attempts_file(tmp_path, monkeypatch):
+    path = str(tmp_path / "login_attempts.json")
+    monkeypatch.setattr(login, "LOGIN_ATTEMPTS_FILE", path)
+    return path
+
+
+def test_failed_attempts_lock_the_account(attempts_file):
+    assert login.get_login_attempts("anna") == {"attempts": 0, "lockout_until": None}
+    for _ in range(login.MAX_LOGIN_ATTEMPTS - 1):
+        login.update_login_attempts("anna")
+    assert login.get_login_attempts("anna") == {"attempts": login.MAX_LOGIN_ATTEMPTS - 1, "lockout_until": None}
+
+    before = datetime.now()
+    login.update_login_attempts("anna")
+    attempts = login.get_login_attempts("anna")
+    assert attempts["attempts"] == login.MAX_LOGIN_ATTEMPTS
+    lockout_until = datetime.fromisoformat(attempts["lockout_until"])
+    assert before + timedelta(minutes=login.LOCKOUT_MINUTES) <= lockout_until
+    assert lockout_until <= datetime.now() + timedelta(minutes=login.LOCKOUT_MINUTES)
+    # Andere Benutzer bleiben unberührt
+    assert login.get_login_attempts("ben")["attempts"] == 0
+
+    login.update_login_attempts("anna", success=True)
+    assert login.get_login_attempts("anna") == {"attempts": 0, "lockout_until": None}
+    login.update_login_attempts("anna")
+    assert login.reset_login_attempts("anna")
+    assert login.get_login_attempts("anna") == {"attempts": 0, "lockout_until": None}
+
+    # Ohne Benutzernamen wird nichts gespeichert
+    login.update_login_attempts("")
+    assert not login.reset_login_attempts("")
+    with open(attempts_file, encoding="utf-8") as f:
+        assert set(json.load(f)) == {"anna"}
+
+
+def test_unreadable_attempts_file_counts_as_empty(attempts_file):
+    with open(attempts_file, "w", encoding="utf-8") as f:
+        f.write("{kaputt")
+    assert login.get_login_attempts("anna") == {"attempts": 0, "lockout_until": None}
+    login.update_login_attempts("anna")
+    assert login.get_login_attempts("anna")["attempts"] == 1
+
+
+def test_concurrent_failed_attempts_are_all_counted(attempts_file):
+    threads = [threading.Thread(target=lambda: [login.update_login_attempts("anna") for _ in range(5)])
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(60)
+    assert login.get_login_attempts("anna")["attempts"] == 40
+
+
+def test_verify_password():
+    stored_hash = hash_password("geheim")
+    assert login.verify_password("geheim", stored_hash)
+    assert not login.verify_password("falsch", stored_hash)
+    assert not login.verify_password("", stored_hash)
+    assert not login.verify_password("geheim", "")
+    assert not login.verify_password("geheim", "kein-bcrypt-hash")
+
+
+# --- Seiten ---
+def _change_password_page():
+    from modules.login import show_change_password
+    show_change_password()
+
+
+def _admin_page():
+    from modules.login import show_admin_dashboard
+    show_admin_dashboard()
+
+
+@pytest.fixture
+def data_folder(tmp_path, monkeypatch):
+    folder = str(tmp_path / "data")
+    get_repository(folder).save("employees", [
+        {"id": "e1", "name": "Anna", "username": "anna", "password": hash_password("altes-pw"), "role": "Admin"},
+    ])
+    monkeypatch.setattr(utils, "DATA_FOLDER", folder)
+    return folder
+
+
+def _change_password(current, new, confirm):
+    at = AppTest.from_function(_change_password_page)
+    at.session_state["user"] = {"id": "e1", "name": "Anna", "role": "Admin"}
+    at.run()
+    at.text_input(key="current_password").input(current)
+    at.text_input(key="new_password").input(new)
+    at.text_input(key="confirm_new_password").input(confirm)
+    at.button(key="change_password_button").click().run()
+    assert not at.exception
+    return at
+
+
+@pytest.mark.parametrize("current, new, confirm, message", [
+    ("", "neues-pw", "neues-pw", "Bitte füllen Sie alle Felder aus."),
+    ("altes-pw", "kurz", "kurz", "Passwort muss mindestens 6 Zeichen lang sein."),
+    ("altes-pw", "neues-pw", "anderes-pw", "Passwörter stimmen nicht überein."),
+    ("falsch", "neues-pw", "neues-pw", "Das aktuelle Passwort ist falsch."),
+])
+def test_change_password_rejects_invalid_input(data_folder, current, new, confirm, message):
+    at = _change_password(current, new, confirm)
+    assert [e.value for e in at.error] == [message]
+    assert utils.check_password("e1", "altes-pw")
+
+
+def test_change_password(data_folder):
+    at = _change_password("altes-pw", "neues-pw", "neues-pw")
+    assert [e.value for e in at.success] == ["Passwort wurde geändert."]
+    assert utils.check_password("e1", "neues-pw")
+    assert not utils.check_password("e1", "altes-pw")
+
+
+def test_change_password_needs_a_login():
+    at = AppTest.from_function(_change_password_page)
+    at.run()
+    assert [e.value for e in at.warning] == ["Bitte melden Sie sich an."]
+    assert not at.text_input
+
+
+@pytest.mark.parametrize("user", [None, {"id": "e2", "name": "Ben", "role": "Mitarbeiter"}])
+def test_admin_dashboard_needs_the_admin_role(user):
+    at = AppTest.from_function(_admin_page)
+    at.session_state["user"] = user
+    at.run()
+    assert not at.exception
+    assert [e.value for e in at.error] == ["Keine Berechtigung für den Administrationsbereich."]
+    assert not at.title
+
+
+def _login_page():
+    from modules.login import show_login
+    show_login()
+
+
+@pytest.mark.parametrize("employee", [
+    {"id": "e1", "name": "Anna", "username": "anna", "role": "Admin"},
+    {"id": "e1", "name": "Anna", "username": "anna", "password": "", "role": "Admin"},
+])
+def test_login_without_a_stored_password_fails_cleanly(tmp_path, monkeypatch, attempts_file, employee):
+    from modules import data_loader
+
+    folder = str(tmp_path / "data")
+    get_repository(folder).save("employees", [employee])
+    monkeypatch.setattr(data_loader, "DATA_FOLDER", folder)
+    at = AppTest.from_function(_login_page)
+    at.run()
+    at.text_input(key="login_username").input("anna")
+    at.text_input(key="login_password").input("geheim")
+    at.button(key="login_button").click().run()
+    assert not at.exception
+    assert [e.value for e in at.error] == ["Ungültige Anmeldedaten."]
+    assert "user" not in at.session_state or at.session_state["user"] is None
+    assert login.get_login_attempts("anna")["attempts"] == 1
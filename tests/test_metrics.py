@@ -0,0 +1,111 @@
+"""
+Rerun metrics: the cause of a rerun is derived from navigation and widget
+changes, the page summary reports nearest-rank p50/p95 wall times, writes
+of the pages are counted once, and without WORKTIME_METRICS nothing is
+measured or written.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from modules import metrics
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_rerun_cause():
+    state = {"auswahl": "A", "knopf": False, "tabelle": object()}
+    assert metrics._rerun_cause(state) == metrics.FIRST_RUN_CAUSE
+    assert metrics._rerun_cause(state) == metrics.UNKNOWN_CAUSE
+
+    # Navigation über set_page() geht vor und wird nur einmal gemeldet
+    state[metrics.CAUSE_KEY] = "page:Stats"
+    state["auswahl"] = "B"
+    assert metrics._rerun_cause(state) == "page:Stats"
+    assert metrics.CAUSE_KEY not in state
+
+    state["auswahl"] = "C"
+    assert metrics._rerun_cause(state) == "widget:auswahl"
+
+    # Geklickter Button; im nächsten Lauf springt er zurück und zählt nicht
+    state["knopf"] = True
+    assert metrics._rerun_cause(state) == "widget:knopf"
+    state["knopf"] = False
+    state["auswahl"] = "D"
+    assert metrics._rerun_cause(state) == "widget:auswahl"
+
+    # Neu erschienene Widgets nur, wenn sie angeklickt sind
+    state["neu"] = "x"
+    state["haken"] = True
+    assert metrics._rerun_cause(state) == "widget:haken"
+    state["menge"] = [1, 2]
+    assert metrics._rerun_cause(state) == metrics.UNKNOWN_CAUSE
+    assert "tabelle" not in state[metrics.WIDGETS_KEY]
+
+
+def test_percentile():
+    values = list(range(100, 0, -1))
+    assert metrics.percentile(values, 50) == 50
+    assert metrics.percentile(values, 95) == 95
+    assert metrics.percentile(values, 100) == 100
+    assert metrics.percentile([4, 1, 3, 2], 50) == 2
+    assert metrics.percentile([4, 1, 3, 2], 95) == 4
+    assert metrics.percentile([7.5], 95) == 7.5
+
+
+def test_page_summary():
+    records = [{"page": "Home", "wall_ms": float(ms), "reads": 2, "read_bytes": 2048, "writes": 0}
+               for ms in range(1, 21)]
+    records += [
+        {"page": "Stats", "wall_ms": 100.0, "reads": 1, "read_bytes": 1024, "writes": 1,
+         "duplicate_loads": ["utils.load_time_entries"]},
+        {"page": "Stats", "wall_ms": 300.0, "reads": 3, "read_bytes": 3072, "writes": 0, "duplicate_loads": []},
+    ]
+    assert metrics.page_summary(records) == [
+        {"Seite": "Home", "Reruns": 20, "p50 (ms)": 10.0, "p95 (ms)": 19.0, "Lesezugriffe/Rerun": 2.0,
+         "Gelesen (KiB)/Rerun": 2.0, "Schreibzugriffe/Rerun": 0.0, "Reruns mit Mehrfachladen": 0},
+        {"Seite": "Stats", "Reruns": 2, "p50 (ms)": 100.0, "p95 (ms)": 300.0, "Lesezugriffe/Rerun": 2.0,
+         "Gelesen (KiB)/Rerun": 2.0, "Schreibzugriffe/Rerun": 0.5, "Reruns mit Mehrfachladen": 1},
+    ]
+    assert metrics.page_summary([]) == []
+
+
+def _run(script, tmp_path, **env):
+    environment = {k: v for k, v in os.environ.items() if k != metrics.METRICS_ENV}
+    environment.update(env, PYTHONPATH=REPO)
+    result = subprocess.run([sys.executable, "-c", script], cwd=str(tmp_path), env=environment,
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize("value", [None, "", "0", "false"])
+def test_disabled_without_the_environment_variable(tmp_path, value):
+    env = {} if value is None else {metrics.METRICS_ENV: value}
+    result = _run("""
+import json
+from modules import metrics, utils
+with metrics.rerun("Home") as current:
+    pass
+print(json.dumps({"enabled": metrics.ENABLED, "current": current is None,
+                  "plain": metrics.instrumented(utils.load_employees) is utils.load_employees}))
+""", tmp_path, **env)
+    assert result == {"enabled": False, "current": True, "plain": True}
+    assert not os.path.exists(tmp_path / metrics.METRICS_FILE)
+
+
+def test_page_writes_are_counted_once(tmp_path):
+    result = _run("""
+import json
+from modules import metrics, utils, sick_leave, vacation
+utils.DATA_FOLDER = "daten"
+metrics._local.rerun = current = metrics.RerunMetrics("Vacation", "test", "s1")
+vacation.save_vacation({"user_id": "e1", "start_date": "2025-07-01", "end_date": "2025-07-02"})
+sick_leave.save_sick_leave({"user_id": "e1", "date": "2025-03-03", "end": "2025-03-03"})
+print(json.dumps({name: call["count"] for name, call in current.to_record()["calls"].items()}))
+""", tmp_path, **{metrics.METRICS_ENV: "1"})
+    assert result == {"utils.save_vacation": 1, "utils.save_sick_leave": 1}
@@ -0,0 +1,46 @@
+"""
+JSONSession: lazily loaded collections, pending adds and dirty tracking.
+"""
+
+import pytest
+
+from modules import models_json
+from modules.models_json import JSONSession, User
+from modules.repository import Repository
+
+
+@pytest.fixture
+def data_folder(tmp_path, monkeypatch):
+    folder = str(tmp_path / "data")
+    Repository(folder).save("users", [{"id": "a", "name": "a"}, {"id": "b", "name": "b"}])
+    monkeypatch.setattr(models_json, "DATA_FOLDER", folder)
+    return folder
+
+
+def test_add_before_first_access_is_visible_to_queries(data_folder):
+    session = JSONSession()
+    session.add(User(id="c", name="c"))
+
+    names = [u.name for u in session.query(User).filter(User.name.in_(["a", "c"])).order_by(User.name).all()]
+    assert names == ["a", "c"]
+    assert [u["id"] for u in session.users] == ["a", "b", "c"]
+
+
+def test_commit_appends_pending_records_once(data_folder):
+    session = JSONSession()
+    session.add(User(id="c", name="c"))
+    assert len(session.users) == 3  # lädt die Collection nach dem add()
+    session.add(User(id="d", name="d"))
+    session.commit()
+
+    assert [u["id"] for u in Repository(data_folder).load("users")] == ["a", "b", "c", "d"]
+    assert not session.changes
+
+
+def test_mark_dirty_rewrites_the_collection(data_folder):
+    session = JSONSession()
+    session.users[0]["name"] = "geändert"
+    session.mark_dirty("users")
+    session.commit()
+
+    assert Repository(data_folder).load("users")[0]["name"] == "geändert"
@@ -0,0 +1,196 @@
+"""
+Render-time and memory budgets for the pages of app_improved.py.
+
+A data set from benchmarks/generator.py that reaches up to the current
+month is written into a temporary data folder (the generated admin becomes
+the demo user, so the logged-in user has data of their own). Every data
+path of the modules, including the absolute ones of the models, points to
+that folder; the data folder of the repository is left untouched. The app
+is logged in through the demo button of the login page and every page is
+rendered with ``streamlit.testing.v1.AppTest``; it has to show its content
+without errors or empty-state messages before the budgets count. Per page the
+wall time of the first render and the peak Python heap allocation
+(tracemalloc) of a second render are recorded; before the second render
+the repository is invalidated, so the derived caches (stats engine,
+calendar, indexes) are rebuilt as after a data change. A page that exceeds
+its budget fails the test.
+
+Konfiguration über Umgebungsvariablen:
+    PAGE_BUDGET_SCALE    Mitarbeiter x Jahre des Datensatzes (Standard: 50x1)
+    PAGE_BUDGETS         JSON-Datei {"Seite": {"seconds": .., "memory_mb": ..}},
+                         überschreibt die Standardbudgets einzelner Seiten
+    PAGE_BUDGET_FACTOR   Faktor für alle Budgets (z. B. 2 auf langsamen Rechnern)
+    PAGE_BUDGET_REPORT   Datei, in die die Messwerte als JSON geschrieben werden
+"""
+
+import json
+import os
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+import pytest
+
+pytest.importorskip("streamlit.testing.v1")
+from streamlit.testing.v1 import AppTest
+
+from benchmarks import generator
+from modules import home_page, metrics, models_json, models_sqlite, notifications
+from modules.repository import get_repository
+
+APP_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app_improved.py")
+DEFAULT_SCALE = "50x1"
+RENDER_TIMEOUT = 120
+REPO_DATA_FOLDER = os.path.join(os.path.dirname(APP_FILE), "data")
+# Der Demo-Zugang der Anmeldeseite übernimmt die Daten des Admins aus dem Generator
+DEMO_USER = {"id": "demo_user", "name": "Demo Benutzer"}
+# Leere Zustände der Seiten ("Keine Zeiteinträge ...", "Noch keine Messwerte ...")
+EMPTY_STATE = ("Keine ", "Noch keine ")
+
+# Seite -> Budget für den Standarddatensatz
+PAGE_BUDGETS = {
+    "Home": {"seconds": 2.0, "memory_mb": 32},
+    "Check-in/Check-out": {"seconds": 2.0, "memory_mb": 32},
+    "Calendar": {"seconds": 3.0, "memory_mb": 64},
+    "Stats": {"seconds": 5.0, "memory_mb": 128},
+    "Vacation": {"seconds": 2.0, "memory_mb": 32},
+    "Sick Leave": {"seconds": 2.0, "memory_mb": 32},
+    "Admin Dashboard": {"seconds": 5.0, "memory_mb": 128},
+}
+
+_measurements = {}
+
+
+def _budgets():
+    budgets = {page: dict(budget) for page, budget in PAGE_BUDGETS.items()}
+    path = os.environ.get("PAGE_BUDGETS")
+    if path:
+        with open(path, encoding="utf-8") as f:
+            for page, budget in json.load(f).items():
+                budgets.setdefault(page, {}).update(budget)
+    factor = float(os.environ.get("PAGE_BUDGET_FACTOR", "1"))
+    return {page: {key: value * factor for key, value in budget.items()} for page, budget in budgets.items()}
+
+
+def _dataset(employees, years):
+    """Generated data up to the end of the current year, so today - 30 days and the current month are covered."""
+    today = date.today()
+    first_year = min((today - timedelta(days=30)).year, today.year - years + 1)
+    dataset = generator.generate(employees, today.year - first_year + 1, first_year=first_year)
+    admin = dataset["employees"][0]
+    admin.update(DEMO_USER)
+    for name in ("time_entries", "vacation_requests", "sick_leaves"):
+        for record in dataset[name]:
+            if record["user_id"] == "admin-001":
+                record["user_id"] = DEMO_USER["id"]
+                if "employee" in record:
+                    record["employee"] = DEMO_USER["name"]
+    for record in dataset["notifications"]:
+        if record["recipient_id"] == "admin-001":
+            record["recipient_id"] = DEMO_USER["id"]
+    # Die Startseite liest die Benutzer über die Modelle (users.json)
+    dataset["users"] = [{"id": emp["id"], "user_id": emp["username"], "name": emp["name"], "role": emp["role"]}
+                        for emp in dataset["employees"]]
+    return dataset
+
+
+def _repo_data_files():
+    return {os.path.join(root, f) for root, _, files in os.walk(REPO_DATA_FOLDER) for f in files}
+
+
+@pytest.fixture(scope="module")
+def app(tmp_path_factory):
+    employees, _, years = os.environ.get("PAGE_BUDGET_SCALE", DEFAULT_SCALE).partition("x")
+    root = tmp_path_factory.mktemp("page_budgets")
+    data_folder = str(root / "data")
+    generator.write(data_folder, _dataset(int(employees), int(years or 1)))
+    repo_files = _repo_data_files()
+
+    with pytest.MonkeyPatch.context() as mp:
+        # Die meisten Module lesen aus dem relativen Ordner "data", die Modelle aus absoluten Pfaden
+        mp.chdir(root)
+        mp.setattr(models_json, "DATA_FOLDER", data_folder)
+        for name in ("USERS_FILE", "CHECKINS_FILE", "VACATION_REQUESTS_FILE", "SICK_LEAVES_FILE"):
+            mp.setattr(models_json, name, os.path.join(data_folder, os.path.basename(getattr(models_json, name))))
+        mp.setattr(models_sqlite, "DATA_FOLDER", data_folder)
+        mp.setattr(models_sqlite, "DATABASE_FILE", os.path.join(data_folder, "worktime.db"))
+        mp.setattr(home_page, "JSON_DATA_FOLDER", data_folder)
+        mp.setattr(notifications, "NOTIFICATIONS_FILE", os.path.join(data_folder, "notifications.json"))
+        mp.setattr(metrics, "METRICS_FILE", os.path.join(data_folder, "metrics", "reruns.jsonl"))
+        at = AppTest.from_file(APP_FILE, default_timeout=RENDER_TIMEOUT)
+        at.run()
+        at.button(key="demo_button").click().run()
+        assert not at.exception
+        assert at.session_state["current_page"] == "Home"
+        yield at
+
+    # Keine Datei im Datenordner des Repositorys angelegt
+    assert _repo_data_files() == repo_files
+    report = os.environ.get("PAGE_BUDGET_REPORT")
+    if report:
+        with open(report, "w", encoding="utf-8") as f:
+            json.dump({"scale": f"{employees}x{years or 1}", "pages": _measurements}, f, indent=4,
+                      ensure_ascii=False)
+
+
+def _home_inputs(at):
+    # Die Startseite zeigt standardmäßig 2023; stattdessen die letzten 30 Tage
+    today = date.today()
+    at.date_input[0].set_value(today - timedelta(days=30))
+    at.date_input[1].set_value(today)
+
+
+# Seite -> Eingaben, die vor der gemessenen Darstellung gesetzt werden
+PAGE_INPUTS = {"Home": _home_inputs}
+
+
+def _markdown(at):
+    return "\n".join(e.value for e in at.markdown)
+
+
+# Seite -> Prüfung, dass die Seite Inhalte aus dem Datensatz (bzw. ihr Formular) zeigt
+PAGE_CONTENT = {
+    "Home": lambda at: at.metric[0].value != "0 Std." and len(at.get("plotly_chart")) > 0,
+    "Check-in/Check-out": lambda at: any(b.label == "✅ Jetzt einchecken" for b in at.button),
+    "Calendar": lambda at: 'class="day-counts"' in _markdown(at),
+    "Stats": lambda at: len(at.dataframe) > 0 and len(at.get("plotly_chart")) > 0,
+    "Vacation": lambda at: "Verbleibende Urlaubstage:" in _markdown(at),
+    "Sick Leave": lambda at: any(b.label == "Krankmeldung einreichen" for b in at.button),
+    "Admin Dashboard": lambda at: len(at.dataframe) > 0,
+}
+
+
+def _assert_shows_data(at, page):
+    """The page rendered without errors or empty states and shows its content."""
+    assert not at.exception, [e.value for e in at.exception]
+    assert not at.error, [e.value for e in at.error]
+    empty = [e.value for e in list(at.info) + list(at.warning) if e.value.startswith(EMPTY_STATE)]
+    assert not empty, f"{page}: {empty}"
+    assert PAGE_CONTENT[page](at), f"{page}: keine Inhalte"
+
+
+@pytest.mark.parametrize("page", list(PAGE_BUDGETS))
+def test_page_within_budget(app, page):
+    budget = _budgets()[page]
+    app.session_state["current_page"] = page
+    if page in PAGE_INPUTS:
+        app.run()
+        PAGE_INPUTS[page](app)
+
+    started = time.perf_counter()
+    app.run()
+    seconds = time.perf_counter() - started
+    _assert_shows_data(app, page)
+
+    get_repository(models_json.DATA_FOLDER).invalidate()
+    tracemalloc.start()
+    try:
+        app.run()
+        peak_mb = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    finally:
+        tracemalloc.stop()
+    _assert_shows_data(app, page)
+
+    _measurements[page] = {"seconds": seconds, "memory_mb": peak_mb, "budget": budget}
+    assert seconds <= budget["seconds"], f"{page}: {seconds:.2f} s > {budget['seconds']:.2f} s"
+    assert peak_mb <= budget["memory_mb"], f"{page}: {peak_mb:.1f} MiB > {budget['memory_mb']:.1f} MiB"
@@ -0,0 +1,57 @@
+"""
+Page registry: a registered page whose module or render function is missing
+raises PageNotImplemented, while import errors of the page's dependencies
+and errors of the page itself reach the caller unchanged.
+"""
+
+import sys
+
+import pytest
+
+from modules import pages
+
+
+@pytest.fixture
+def page_modules(tmp_path, monkeypatch):
+    (tmp_path / "seite_ok.py").write_text("def show():\n    return 'ok'\n", encoding="utf-8")
+    (tmp_path / "seite_ohne_abhaengigkeit.py").write_text(
+        "import nicht_installiertes_paket\n\ndef show():\n    pass\n", encoding="utf-8")
+    (tmp_path / "seite_mit_fehler.py").write_text(
+        "def show():\n    import nicht_installiertes_paket\n", encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(pages, "PAGES", {
+        "Ok": ("seite_ok", "show"),
+        "Fehlendes Modul": ("seite_gibt_es_nicht", "show"),
+        "Fehlende Funktion": ("seite_ok", "gibt_es_nicht"),
+        "Fehlende Abhängigkeit": ("seite_ohne_abhaengigkeit", "show"),
+        "Fehler in der Seite": ("seite_mit_fehler", "show"),
+    })
+    yield
+    for name in ("seite_ok", "seite_ohne_abhaengigkeit", "seite_mit_fehler"):
+        sys.modules.pop(name, None)
+
+
+def test_registered_pages(page_modules):
+    assert pages.get_page("Ok")() == "ok"
+    assert pages.show_page("Ok")
+    assert pages.get_page("Unbekannt") is None
+    assert not pages.show_page("Unbekannt")
+
+
+@pytest.mark.parametrize("page", ["Fehlendes Modul", "Fehlende Funktion"])
+def test_missing_page_is_not_implemented(page_modules, page):
+    with pytest.raises(pages.PageNotImplemented):
+        pages.show_page(page)
+
+
+@pytest.mark.parametrize("page", ["Fehlende Abhängigkeit", "Fehler in der Seite"])
+def test_import_errors_of_the_page_propagate(page_modules, page):
+    with pytest.raises(ModuleNotFoundError) as excinfo:
+        pages.show_page(page)
+    assert not isinstance(excinfo.value, pages.PageNotImplemented)
+    assert excinfo.value.name == "nicht_installiertes_paket"
+
+
+def test_every_registered_page_exists():
+    for name in pages.PAGES:
+        assert callable(pages.get_page(name))
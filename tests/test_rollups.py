@@ -0,0 +1,82 @@
+"""
+Weekly rollup of the home page: after appends (extended in place) and after
+edits, deletes and check-outs (rebuilt) the hours per ISO week must equal
+summing the completed entries directly.
+"""
+
+import random
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from modules.repository import get_repository
+from modules.rollups import ALL_USERS, get_weekly_rollup, weekly_hours
+
+USERS = ["e1", "e2", "e3"]
+WINDOWS = [(None, None), (date(2024, 12, 25), date(2025, 1, 8)), (date(2025, 1, 15), date(2025, 1, 15)),
+           (date(2025, 1, 10), date(2025, 2, 20))]
+
+
+def _entry(entry_id, rng):
+    check_in = datetime(2024, 12, 16, 7) + timedelta(days=rng.randrange(70), minutes=rng.randrange(300))
+    check_out = check_in + timedelta(minutes=rng.randrange(60, 600))
+    if rng.random() < 0.3:
+        # Schreibweise des Modells (ISO mit "T")
+        return {"id": entry_id, "user_id": rng.choice(USERS), "check_in_time": check_in.isoformat(),
+                "check_out_time": check_out.isoformat()}
+    entry = {"id": entry_id, "user_id": rng.choice(USERS), "check_in": check_in.strftime("%Y-%m-%d %H:%M:%S")}
+    if rng.random() < 0.85:
+        entry["check_out"] = check_out.strftime("%Y-%m-%d %H:%M:%S")
+    return entry
+
+
+def _expected(records, user_id, start, end):
+    """Referenz: jeder abgeschlossene Eintrag direkt in seine ISO-Woche summiert."""
+    result = {}
+    for r in records:
+        check_in, check_out = r.get("check_in_time") or r.get("check_in"), r.get("check_out_time") or r.get("check_out")
+        if not check_in or not check_out or (user_id is not ALL_USERS and r["user_id"] != user_id):
+            continue
+        check_in, check_out = datetime.fromisoformat(check_in), datetime.fromisoformat(check_out)
+        if (start and check_in.date() < start) or (end and check_in.date() > end):
+            continue
+        week = tuple(check_in.isocalendar())[:2]
+        result[week] = result.get(week, 0.0) + (check_out - check_in).total_seconds() / 3600
+    return result
+
+
+def _assert_matches(folder):
+    records = get_repository(folder).load("time_entries")
+    for user_id in USERS + [ALL_USERS]:
+        for start, end in WINDOWS:
+            actual = weekly_hours(user_id, start, end, data_folder=folder)
+            expected = _expected(records, user_id, start, end)
+            assert actual.keys() == expected.keys()
+            for week, hours in expected.items():
+                assert actual[week] == pytest.approx(hours)
+
+
+def test_rollup_follows_writes(tmp_path):
+    folder = str(tmp_path / "data")
+    rng = random.Random(9)
+    repository = get_repository(folder)
+    repository.save("time_entries", [_entry(f"t{i}", rng) for i in range(200)])
+    _assert_matches(folder)
+
+    # Anhängen (Check-in-Seite): dieselbe Rollup-Instanz wird erweitert
+    rollup = get_weekly_rollup(folder)
+    for i in range(200, 230):
+        repository.append("time_entries", _entry(f"t{i}", rng))
+    _assert_matches(folder)
+    assert get_weekly_rollup(folder) is rollup
+
+    # Check-out eines offenen Eintrags, Bearbeiten und Löschen
+    open_entry = next(r for r in repository.load("time_entries") if r.get("check_in") and not r.get("check_out"))
+    check_out = datetime.fromisoformat(open_entry["check_in"]) + timedelta(hours=7, minutes=30)
+    repository.update_record("time_entries", open_entry["id"], {"check_out": check_out.strftime("%Y-%m-%d %H:%M:%S")})
+    _assert_matches(folder)
+
+    edited = next(r for r in repository.load("time_entries") if r.get("check_out"))
+    repository.update_record("time_entries", edited["id"], {"user_id": "e3" if edited["user_id"] != "e3" else "e1"})
+    repository.delete_record("time_entries", "t5")
+    _assert_matches(folder)
@@ -0,0 +1,163 @@
+"""
+SQLite backend: objects survive a round trip, queries return the same
+records as the JSON backend, the migration re-syncs the copy (deleted JSON
+records disappear, writes outside the app mark it stale), and with the
+SQLite backend selected every write of the app reaches the database.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from modules import migrate_to_sqlite, models_json, models_sqlite, repository as repository_module, utils
+from modules.models_json import CheckIn, SickLeave, User, VacationRequest
+from modules.repository import Repository
+
+
+@pytest.fixture
+def data_folder(tmp_path, monkeypatch):
+    folder = tmp_path / "data"
+    repository = Repository(str(folder))
+    repository.save("employees", [
+        {"id": "e1", "name": "Anna", "username": "anna", "role": "Admin"},
+        {"id": "e2", "name": "Ben", "username": "ben"},
+    ])
+    repository.save("users", [])
+    repository.save("time_entries", [
+        {"id": f"t{i}", "user_id": "e1" if i % 2 else "e2",
+         "check_in": f"2025-03-{i + 1:02d} 08:00:00", "check_out": f"2025-03-{i + 1:02d} 16:30:00",
+         "location": "Home Office"}
+        for i in range(10)
+    ])
+    repository.save("vacation_requests", [
+        {"id": "v1", "user_id": "e1", "start_date": "2025-07-01", "end_date": "2025-07-04", "status": "approved"},
+        {"id": "v2", "user_id": "e2", "start_date": "2025-08-01", "end_date": "2025-08-02", "status": "pending"},
+    ])
+    repository.save("sick_leaves", [
+        {"id": "s1", "user_id": "e2", "date": "2025-02-03", "end": "2025-02-05", "note": "Grippe"},
+    ])
+    monkeypatch.setattr(models_json, "DATA_FOLDER", str(folder))
+    return str(folder)
+
+
+@pytest.fixture
+def database(tmp_path):
+    return str(tmp_path / "worktime.db")
+
+
+def test_objects_round_trip(database):
+    objects = [
+        User(id="u1", user_id="anna", name="Anna", email="anna@example.com", password="x", role="Admin"),
+        CheckIn(id="c1", user_id="u1", check_in_time=datetime(2025, 3, 3, 8), check_out_time=datetime(2025, 3, 3, 16),
+                location="WS107", notes="Notiz"),
+        VacationRequest(id="r1", user_id="u1", start_date=datetime(2025, 7, 1), end_date=datetime(2025, 7, 4),
+                        reason="Urlaub", approved=True),
+        SickLeave(id="k1", user_id="u1", date=datetime(2025, 2, 3), end_date=datetime(2025, 2, 5), note="Grippe"),
+    ]
+    session = models_sqlite.SQLiteSession(database)
+    session.add_all(objects)
+    session.commit()
+    session.close()
+
+    session = models_sqlite.SQLiteSession(database)
+    try:
+        for obj in objects:
+            stored = session.query(type(obj)).filter_by(id=obj.id).first()
+            assert stored.to_dict() == obj.to_dict()
+    finally:
+        session.close()
+
+
+def test_queries_match_the_json_backend(data_folder, database):
+    migrate_to_sqlite.migrate(data_folder, database)
+    queries = [
+        lambda q: q(CheckIn).filter(CheckIn.user_id == "e1").order_by(CheckIn.check_in_time),
+        lambda q: q(CheckIn).filter(CheckIn.check_in_time.between(datetime(2025, 3, 3), datetime(2025, 3, 6)))
+                            .order_by(CheckIn.check_in_time.desc()),
+        lambda q: q(CheckIn).filter(CheckIn.check_in_time >= datetime(2025, 3, 5)).order_by(CheckIn.id).limit(3),
+        lambda q: q(VacationRequest).filter(VacationRequest.status == "approved"),
+        lambda q: q(SickLeave).filter(SickLeave.user_id.in_(["e2", "e3"])),
+    ]
+    json_session = models_json.JSONSession()
+    sqlite_session = models_sqlite.SQLiteSession(database)
+    try:
+        for build in queries:
+            expected = [obj.to_dict() for obj in build(json_session.query).all()]
+            assert expected
+            assert [obj.to_dict() for obj in build(sqlite_session.query).all()] == expected
+    finally:
+        sqlite_session.close()
+
+
+def test_migration_resyncs_the_read_copy(data_folder, database):
+    assert migrate_to_sqlite.is_stale(data_folder, database)
+    counts = migrate_to_sqlite.migrate(data_folder, database)
+    assert counts["users"] == 2 and counts["checkins"] == 10
+    assert not migrate_to_sqlite.is_stale(data_folder, database)
+
+    # Ohne SQLite-Backend (oder außerhalb der App) geschrieben: die Kopie ist danach veraltet
+    repository = Repository(data_folder)
+    repository.update("time_entries", lambda records: [r for r in records if r["id"] != "t0"])
+    repository.append("time_entries", {"id": "t99", "user_id": "e1", "check_in": "2025-04-01 08:00:00",
+                                       "check_out": "2025-04-01 12:00:00"})
+    assert migrate_to_sqlite.is_stale(data_folder, database)
+
+    migrate_to_sqlite.migrate(data_folder, database)
+    assert not migrate_to_sqlite.is_stale(data_folder, database)
+    session = models_sqlite.SQLiteSession(database)
+    try:
+        ids = {c.id for c in session.query(CheckIn).all()}
+    finally:
+        session.close()
+    assert ids == {f"t{i}" for i in range(1, 10)} | {"t99"}
+
+
+def _tables(database):
+    connection = models_sqlite.connect(database)
+    try:
+        return {table: sorted(tuple(row) for row in connection.execute(f"SELECT * FROM {table}"))
+                for table, _, _ in models_sqlite.TABLES.values()}
+    finally:
+        connection.close()
+
+
+def test_writes_reach_the_sqlite_backend(data_folder, database, tmp_path, monkeypatch):
+    monkeypatch.setattr(repository_module, "SQLITE_COPY", True)
+    monkeypatch.setattr(models_sqlite, "DATA_FOLDER", data_folder)
+    monkeypatch.setattr(models_sqlite, "DATABASE_FILE", database)
+    monkeypatch.setattr(utils, "DATA_FOLDER", data_folder)
+    migrate_to_sqlite.migrate(data_folder, database)
+
+    # Stempeln (ein Eintrag wird angehängt), Genehmigen, Mitarbeiter ändern und löschen, Krankmeldung
+    utils.save_time_entry({"id": "t99", "user_id": "e1", "check_in": "2025-04-01 08:00:00",
+                           "check_out": "2025-04-01 12:00:00"})
+    assert not migrate_to_sqlite.is_stale(data_folder, database)
+    utils.update_vacation_statuses(["v2"], "approved")
+    utils.add_employee({"id": "e3", "name": "Cem", "username": "cem"})
+    utils.update_employee("e1", {"name": "Anna Neu"})
+    utils.delete_employee("e2")
+    utils.save_sick_leave({"id": "s2", "user_id": "e1", "date": "2025-05-02", "end": "2025-05-02"})
+    Repository(data_folder).update("time_entries", lambda records: [r for r in records if r["id"] != "t0"])
+
+    assert not migrate_to_sqlite.is_stale(data_folder, database)
+    # Gleicher Stand wie ein vollständiger Abgleich
+    resynced = str(tmp_path / "resynced.db")
+    migrate_to_sqlite.migrate(data_folder, resynced)
+    assert _tables(database) == _tables(resynced)
+    with models_sqlite.get_db_session() as session:
+        assert session.query(VacationRequest).filter_by(id="v2").first().status == "approved"
+        assert session.query(User).filter_by(id="e1").first().name == "Anna Neu"
+        assert session.query(User).filter_by(id="e2").first() is None
+        assert session.query(CheckIn).filter_by(id="t99").first().check_out_time == datetime(2025, 4, 1, 12)
+
+
+def test_other_data_folders_are_not_mirrored(data_folder, database, tmp_path, monkeypatch):
+    monkeypatch.setattr(repository_module, "SQLITE_COPY", True)
+    monkeypatch.setattr(models_sqlite, "DATA_FOLDER", data_folder)
+    monkeypatch.setattr(models_sqlite, "DATABASE_FILE", database)
+    migrate_to_sqlite.migrate(data_folder, database)
+    before = _tables(database)
+
+    Repository(str(tmp_path / "anderer")).append("time_entries", {"id": "x1", "user_id": "e1",
+                                                                  "check_in": "2025-04-01 08:00:00"})
+    assert _tables(database) == before
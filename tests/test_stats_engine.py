@@ -0,0 +1,223 @@
+"""
+Stats engine: the work time, overtime and overview tables must hold the same
+numbers as the per-entry loops of the Stats page before the engine existed
+(entries with and without ``duration_hours``, overtime flags True, False,
+None and missing, open entries, unknown users and absences). The monthly
+overtime hours must match calculate_overtime_hours, which adds up the
+entries explicitly flagged ``overtime`` only.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from modules.repository import get_repository
+from modules.stats_engine import get_stats_engine, overtime_by_month
+from modules.utils import aggregate_overtime_hours, calculate_overtime_hours
+
+EMPLOYEES = [
+    {"id": f"e{i}", "name": f"Mitarbeiter {i}", "role": "Admin" if i == 0 else "Mitarbeiter"} for i in range(5)
+]
+
+
+def _time_entries(count, seed=3):
+    rng = random.Random(seed)
+    entries = []
+    for i in range(count):
+        check_in = datetime(2025, 1, 1, 6) + timedelta(days=rng.randrange(120), minutes=rng.randrange(240))
+        check_out = check_in + timedelta(minutes=rng.randrange(180, 660))
+        # e4 hat keine Einträge, "x" ist kein Mitarbeiter
+        entry = {"id": f"t{i}", "user_id": rng.choice(["e0", "e1", "e2", "e3", "x"]),
+                 "check_in": check_in.strftime("%Y-%m-%d %H:%M:%S")}
+        if rng.random() < 0.9:
+            entry["check_out"] = check_out.strftime("%Y-%m-%d %H:%M:%S")
+        elif rng.random() < 0.5:
+            entry["check_out"] = None
+        hours = (check_out - check_in).total_seconds() / 3600
+        choice = rng.random()
+        if choice < 0.3 and "check_out" in entry:
+            entry["duration_hours"] = round(hours, 2)
+        elif choice < 0.4:
+            entry["duration_hours"] = None
+        choice = rng.random()
+        if choice < 0.2:
+            entry["overtime"] = True
+        elif choice < 0.4:
+            entry["overtime"] = False
+        elif choice < 0.5:
+            entry["overtime"] = None
+        entries.append(entry)
+    return entries
+
+
+SICK_LEAVES = [
+    {"id": "s1", "user_id": "e1", "start_date": "2025-02-03", "end_date": "2025-02-05"},
+    {"id": "s2", "employee": "Mitarbeiter 2", "date": "2025-03-10", "end": "2025-03-10"},
+    {"id": "s3", "user_id": "e1", "start_date": "2025-04-01", "end_date": "kaputt"},
+    {"id": "s4", "user_id": "x", "start_date": "2025-04-01", "end_date": "2025-04-02"},
+]
+VACATIONS = [
+    {"id": "v1", "user_id": "e0", "start_date": "2025-07-01", "end_date": "2025-07-04", "status": "approved"},
+    {"id": "v2", "user_id": "e0", "start_date": "2025-08-01", "end_date": "2025-08-02", "status": "pending"},
+    {"id": "v3", "user_id": "e4", "start_date": "2025-05-05", "end_date": "2025-05-06"},
+]
+
+
+# --- Referenz: die Schleifen der Statistikseite vor der Engine ---
+def _hours(entry):
+    if "duration_hours" in entry and entry["duration_hours"] is not None:
+        return float(entry["duration_hours"])
+    if "check_in" in entry and "check_out" in entry:
+        try:
+            check_in = datetime.strptime(entry["check_in"], "%Y-%m-%d %H:%M:%S")
+            check_out = datetime.strptime(entry["check_out"], "%Y-%m-%d %H:%M:%S")
+            return (check_out - check_in).total_seconds() / 3600
+        except (ValueError, TypeError):
+            return 0
+    return 0
+
+
+def _in_window(entries, start, end):
+    return [e for e in entries if start <= e["check_in"][:10] <= end]
+
+
+def _work_time(entries, user_map):
+    data = {}
+    for entry in entries:
+        user_id = entry.get("user_id")
+        if user_id not in user_map:
+            continue
+        row = data.setdefault(user_id, {"name": user_map[user_id], "total_hours": 0, "entries_count": 0})
+        row["total_hours"] += _hours(entry)
+        row["entries_count"] += 1
+    return pd.DataFrame([{
+        "Mitarbeiter": row["name"],
+        "Gesamtarbeitszeit (Std)": round(row["total_hours"], 2),
+        "Anzahl Einträge": row["entries_count"],
+        "Durchschnitt pro Eintrag (Std)": round(row["total_hours"] / row["entries_count"], 2),
+    } for row in data.values()])
+
+
+def _overtime(entries, user_map):
+    data = {}
+    for entry in entries:
+        user_id = entry.get("user_id")
+        if user_id not in user_map:
+            continue
+        row = data.setdefault(user_id, {"name": user_map[user_id], "overtime": 0, "regular": 0, "total": 0})
+        if "overtime" in entry:
+            has_overtime = entry["overtime"]
+        else:
+            has_overtime = _hours(entry) > 8
+        row["overtime" if has_overtime else "regular"] += 1
+        row["total"] += 1
+    return pd.DataFrame([{
+        "Mitarbeiter": row["name"],
+        "Überstunden (Tage)": row["overtime"],
+        "Reguläre Tage": row["regular"],
+        "Gesamt Einträge": row["total"],
+        "Überstunden (%)": round(row["overtime"] / row["total"] * 100, 1),
+    } for row in data.values()])
+
+
+def _days(record):
+    try:
+        start_key = "start_date" if "start_date" in record else "date"
+        end_key = "end_date" if "end_date" in record else "end"
+        if start_key in record and end_key in record:
+            start = datetime.strptime(record[start_key], "%Y-%m-%d").date()
+            end = datetime.strptime(record[end_key], "%Y-%m-%d").date()
+            return (end - start).days + 1
+        return 0
+    except (ValueError, KeyError, TypeError):
+        return 1
+
+
+def _overview(employees, entries, sick_leaves, vacations):
+    user_map = {emp["id"]: emp["name"] for emp in employees}
+    names = {name: emp_id for emp_id, name in user_map.items()}
+    data = {emp["id"]: {"name": emp["name"], "role": emp.get("role", "Mitarbeiter"), "total_hours": 0,
+                        "overtime": 0, "sick": 0, "vacation": 0, "entries": 0} for emp in employees}
+    for entry in entries:
+        row = data.get(entry.get("user_id"))
+        if row is None:
+            continue
+        row["entries"] += 1
+        hours = _hours(entry)
+        row["total_hours"] += hours
+        if entry["overtime"] if "overtime" in entry else hours > 8:
+            row["overtime"] += 1
+    for key, records in (("sick", sick_leaves), ("vacation", vacations)):
+        for record in records:
+            row = data.get(record["user_id"] if "user_id" in record else names.get(record.get("employee")))
+            if row is None or record.get("status", "approved") != "approved":
+                continue
+            row[key] += _days(record)
+    return pd.DataFrame([{
+        "Mitarbeiter": row["name"],
+        "Rolle": row["role"],
+        "Gesamtarbeitszeit (Std)": round(row["total_hours"], 2),
+        "Überstunden (Tage)": row["overtime"],
+        "Krankheitstage": row["sick"],
+        "Urlaubstage": row["vacation"],
+        "Einträge": row["entries"],
+    } for row in data.values()])
+
+
+def _assert_same(actual, expected):
+    # Die Seite zeigt die Zeilen in Mitarbeiterreihenfolge, die Schleifen nach dem ersten Eintrag
+    actual = actual.sort_values("Mitarbeiter").reset_index(drop=True)
+    expected = expected.sort_values("Mitarbeiter").reset_index(drop=True)
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+
+@pytest.fixture
+def data(tmp_path):
+    folder = str(tmp_path / "data")
+    repository = get_repository(folder)
+    entries = _time_entries(600)
+    repository.save("employees", EMPLOYEES)
+    repository.save("time_entries", [dict(e) for e in entries])
+    repository.save("sick_leaves", SICK_LEAVES)
+    repository.save("vacation_requests", VACATIONS)
+    return folder, entries
+
+
+@pytest.mark.parametrize("start, end", [("2025-01-01", "2025-12-31"), ("2025-02-10", "2025-03-11")])
+def test_window_tables_match_the_entry_loops(data, start, end):
+    folder, entries = data
+    engine = get_stats_engine(folder)
+    user_map = {emp["id"]: emp["name"] for emp in EMPLOYEES}
+    window = _in_window(entries, start, end)
+
+    _assert_same(engine.work_time(start, end), _work_time(window, user_map))
+    _assert_same(engine.overtime_table(start, end), _overtime(window, user_map))
+
+
+def test_overview_matches_the_entry_loops(data):
+    folder, entries = data
+    expected = _overview(EMPLOYEES, entries, SICK_LEAVES, VACATIONS)
+    # Alle Mitarbeiter, auch ohne Einträge
+    assert len(expected) == len(EMPLOYEES)
+    _assert_same(get_stats_engine(folder).overview(), expected)
+
+
+def test_overtime_by_month_counts_flagged_entries_only(tmp_path):
+    folder = str(tmp_path / "data")
+    entries = _time_entries(400, seed=8)
+    for entry in entries:
+        # Die alte Funktion setzt bei markierten Einträgen duration_hours voraus
+        if entry.get("overtime") and entry.get("duration_hours") is None:
+            entry["duration_hours"] = 9.25
+    get_repository(folder).save("time_entries", [dict(e) for e in entries])
+    totals = overtime_by_month(folder)
+
+    for emp_id in ("e0", "e1", "e2", "e3", "x"):
+        for month in range(1, 6):
+            expected = calculate_overtime_hours(entries, emp_id, 2025, month)
+            assert round(totals.get((2025, month, emp_id), 0), 2) == expected
+    # Einträge über 8 Stunden ohne Markierung zählen nicht
+    assert any("overtime" not in e and _hours(e) > 8 for e in entries)
+    assert totals == pytest.approx(aggregate_overtime_hours(entries))
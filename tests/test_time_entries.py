@@ -0,0 +1,51 @@
+"""
+Time entries in monthly partitions: edits keep entries in their month and
+range reads see them; an edit without a matching entry writes nothing.
+"""
+
+import os
+
+import pytest
+
+from modules import utils
+from modules.partitions import UNDATED
+from modules.repository import get_repository
+
+
+@pytest.fixture
+def data_folder(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils, "DATA_FOLDER", str(tmp_path))
+    for day in ("2025-01-02", "2025-01-03", "2025-02-03"):
+        utils.save_time_entry({"user_id": "1", "check_in": f"{day} 08:00:00", "check_out": f"{day} 16:00:00",
+                               "duration_hours": 8.0})
+    return tmp_path
+
+
+def test_bare_times_are_stored_as_timestamps_of_the_entry_date(data_folder):
+    assert utils.update_time_entry("1", "2025-01-03", "09:00", "17:00")
+
+    [entry] = utils.load_time_entries("2025-01-03", "2025-01-03")
+    assert entry["check_in"] == "2025-01-03 09:00:00"
+    assert entry["check_out"] == "2025-01-03 17:00:00"
+    assert len(utils.load_time_entries("2025-01-01", "2025-01-31")) == 2
+    store = get_repository(str(data_folder)).partition_store("time_entries")
+    assert UNDATED not in store.keys()
+
+
+def test_full_timestamps_are_kept(data_folder):
+    assert utils.update_time_entry("1", "2025-02-03", "2025-02-03 07:30:00", "2025-02-03 15:45:00")
+    [entry] = utils.load_time_entries("2025-02-03", "2025-02-03")
+    assert (entry["check_in"], entry["check_out"]) == ("2025-02-03 07:30:00", "2025-02-03 15:45:00")
+
+
+def test_update_without_match_writes_nothing(data_folder):
+    repository = get_repository(str(data_folder))
+    store = repository.partition_store("time_entries")
+    before = {key: os.stat(store.partition_path(key)).st_mtime_ns for key in store.keys()}
+    version = repository.version("time_entries")
+
+    assert not utils.update_time_entry("1", "2025-03-01", "09:00", "17:00")
+    assert not utils.update_time_entry("2", "2025-01-03", "09:00", "17:00")
+
+    assert repository.version("time_entries") == version
+    assert {key: os.stat(store.partition_path(key)).st_mtime_ns for key in store.keys()} == before
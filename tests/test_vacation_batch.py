@@ -0,0 +1,104 @@
+"""
+Batch approval of vacation requests: all selected pending requests change
+in one write and their employees are notified together; requests that were
+decided in the meantime or no longer exist are skipped, and a failed write
+changes nothing.
+"""
+
+import json
+import os
+
+import pytest
+
+from modules import notifications, utils
+from modules.repository import Repository, get_repository
+
+REQUESTS = [
+    {"id": "p1", "user_id": "e1", "start_date": "2025-07-01", "end_date": "2025-07-04", "status": "pending"},
+    {"id": "p2", "user_id": "e2", "start_date": "2025-08-11", "end_date": "2025-08-15", "status": "pending"},
+    {"id": "p3", "user_id": "e2", "start_date": "2025-12-22", "end_date": "2025-12-23", "status": "pending"},
+    {"id": "a1", "user_id": "e1", "start_date": "2025-05-02", "end_date": "2025-05-02", "status": "approved"},
+]
+
+
+@pytest.fixture
+def data_folder(tmp_path, monkeypatch):
+    folder = str(tmp_path / "data")
+    get_repository(folder).save("vacation_requests", [dict(r) for r in REQUESTS])
+    get_repository(folder).save("notifications", [])
+    monkeypatch.setattr(utils, "DATA_FOLDER", folder)
+    monkeypatch.setattr(notifications, "NOTIFICATIONS_FILE", os.path.join(folder, "notifications.json"))
+    return folder
+
+
+@pytest.fixture
+def writes(monkeypatch):
+    """Zählt die Schreibvorgänge je Sammlung."""
+    counts = {}
+    write = Repository._write
+
+    def counting_write(self, name, records):
+        counts[name] = counts.get(name, 0) + 1
+        return write(self, name, records)
+
+    monkeypatch.setattr(Repository, "_write", counting_write)
+    return counts
+
+
+def _stored(folder, name="vacation_requests"):
+    with open(os.path.join(folder, f"{name}.json"), encoding="utf-8") as f:
+        return {r["id"]: r for r in json.load(f)}
+
+
+@pytest.mark.parametrize("status, field", [("approved", "approved_at"), ("rejected", "rejected_at")])
+def test_batch_changes_the_selection_in_one_write(data_folder, writes, status, field):
+    updated = utils.update_vacation_statuses(["p1", "p2"], status)
+    notifications.create_vacation_status_notifications(updated)
+
+    assert [r["id"] for r in updated] == ["p1", "p2"]
+    stored = _stored(data_folder)
+    assert {i: r["status"] for i, r in stored.items()} == {"p1": status, "p2": status, "p3": "pending",
+                                                          "a1": "approved"}
+    assert field in stored["p1"] and field in stored["p2"] and field not in stored["p3"]
+    assert writes == {"vacation_requests": 1, "notifications": 1}
+
+    sent = list(_stored(data_folder, "notifications").values())
+    assert [n["recipient_id"] for n in sent] == ["e1", "e2"]
+    assert all(n["type"] == "vacation_status" and not n["read"] for n in sent)
+
+
+def test_decided_and_missing_requests_are_skipped(data_folder, writes):
+    # Ein anderer Admin hat p1 inzwischen genehmigt, "weg" wurde gelöscht
+    utils.update_vacation_statuses(["p1"], "approved")
+    approved_at = _stored(data_folder)["p1"]["approved_at"]
+
+    updated = utils.update_vacation_statuses(["p1", "p3", "a1", "weg"], "rejected")
+
+    assert [r["id"] for r in updated] == ["p3"]
+    stored = _stored(data_folder)
+    assert stored["p1"]["status"] == "approved" and stored["p1"]["approved_at"] == approved_at
+    assert "rejected_at" not in stored["p1"] and stored["a1"] == REQUESTS[3]
+    assert stored["p3"]["status"] == "rejected"
+    assert stored["p2"] == REQUESTS[1]
+
+    # Nichts mehr offen: kein Eintrag geändert, keine Benachrichtigung
+    assert utils.update_vacation_statuses(["p1", "p3"], "approved") == []
+    notifications.create_vacation_status_notifications([])
+    assert "notifications" not in writes
+
+
+def test_failed_write_changes_nothing(data_folder, monkeypatch):
+    before = _stored(data_folder)
+    write = Repository._write
+
+    def failing_write(self, name, records):
+        if name == "vacation_requests":
+            raise OSError("Datenträger voll")
+        return write(self, name, records)
+
+    monkeypatch.setattr(Repository, "_write", failing_write)
+    with pytest.raises(OSError):
+        utils.update_vacation_statuses(["p1", "p2"], "approved")
+
+    assert _stored(data_folder) == before
+    assert {r["id"]: r for r in get_repository(data_folder).load("vacation_requests")} == before